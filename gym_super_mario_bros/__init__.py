@@ -1,14 +1,76 @@
 """Registration code of Gymnasium environments in this package."""
-from .smb_env import SuperMarioBrosEnv
-from .smb2_env import SuperMarioBros2Env
-from .smb3_env import SuperMarioBros3Env
-from .smb3_stages import SMB3Stage
-from .smb3_stages import smb3_stage_matrix
-from .tasks import MarioTask
-from .tasks import all_tasks
-from .tasks import task_for_env_id
-from .tasks import task_ids
+from importlib import import_module
+
 from ._registration import make
+from ._registration import register_env
+from ._registration import register_envs
+
+
+# the submodule of each public name, imported on first access so that
+# importing the package does not load the emulator or build the task tables
+_LAZY_ATTRIBUTES = {
+    'SuperMarioBrosEnv': '.smb_env',
+    'SuperMarioBros2Env': '.smb2_env',
+    'SuperMarioBros3Env': '.smb3_env',
+    'SMB3Stage': '.smb3_stages',
+    'smb3_stage_matrix': '.smb3_stages',
+    'MarioTask': '.tasks',
+    'all_tasks': '.tasks',
+    'task_for_env_id': '.tasks',
+    'task_ids': '.tasks',
+    'clear_snapshot_cache': '._snapshots',
+    'MarioVectorEnv': '.vector_env',
+    'MarioSharedMemoryVectorEnv': '.shared_vector_env',
+    'decode_features': '._features',
+    'decode_tile_grid': '._tile_grid',
+    'EpisodeRecorder': '.recorder',
+    'EpisodeReplay': '.recorder',
+    'replay': '.recorder',
+    'export_dataset': '.dataset',
+    'MarioDataset': '.dataset',
+    'CurriculumSampler': '.curriculum',
+    'Curriculum': '.curriculum',
+    'CellArchive': '.archive',
+    'TraceCodec': '.codec',
+}
+
+
+# the submodules that importing the package used to load eagerly
+_LAZY_SUBMODULES = (
+    'smb_env',
+    'smb2_env',
+    'smb3_env',
+    'smb3_stages',
+    'tasks',
+    'vector_env',
+    'shared_vector_env',
+)
+
+
+def __getattr__(name):
+    """
+    Import a public name or submodule of the package on first access.
+
+    Args:
+        name (str): the name of the attribute to look up
+
+    Returns:
+        the class, function, or module bound to the name
+
+    """
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name in _LAZY_SUBMODULES:
+        value = import_module('.' + name, __name__)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the names of the package, including lazily imported ones."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
 
 
 # define the outward facing API of this package
@@ -23,4 +85,20 @@ __all__ = [
     'all_tasks',
     'task_for_env_id',
     'task_ids',
+    'clear_snapshot_cache',
+    'MarioVectorEnv',
+    'MarioSharedMemoryVectorEnv',
+    'register_env',
+    'register_envs',
+    'decode_features',
+    'decode_tile_grid',
+    'EpisodeRecorder',
+    'EpisodeReplay',
+    'replay',
+    'export_dataset',
+    'MarioDataset',
+    'CurriculumSampler',
+    'Curriculum',
+    'CellArchive',
+    'TraceCodec',
 ]
@@ -0,0 +1,109 @@
+"""Run the Mario environment benchmark suite and print JSON results."""
+import argparse
+import json
+import sys
+
+from ..benchmark import RESET_LATENCY_TARGET_US
+from ..benchmark import SUITE_ENV_IDS
+from ..benchmark import benchmark_suite
+from ..benchmark import find_regressions
+
+
+def _parser():
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--env', '-e',
+        action='append',
+        dest='env_ids',
+        help='an environment to benchmark; repeat for several (default: the suite)',
+    )
+    parser.add_argument('--steps', '-s',
+        type=int,
+        default=500,
+        help='the number of steps to time per environment',
+    )
+    parser.add_argument('--repeats', '-r',
+        type=int,
+        default=3,
+        help='the number of constructions to time per environment',
+    )
+    parser.add_argument('--seed',
+        type=int,
+        default=0,
+        help='the seed for the random actions',
+    )
+    parser.add_argument('--output', '-o',
+        type=str,
+        help='the path to write the JSON results to (default: standard output)',
+    )
+    parser.add_argument('--baseline', '-b',
+        type=str,
+        help='a previous JSON result to check for regressions against',
+    )
+    parser.add_argument('--tolerance',
+        type=float,
+        default=0.2,
+        help='the allowed relative growth of each cost over the baseline',
+    )
+    parser.add_argument('--reset-budget-us',
+        type=float,
+        default=RESET_LATENCY_TARGET_US,
+        help='the most microseconds a reset may take (default: %(default)s)',
+    )
+    return parser
+
+
+def _get_args(argv=None):
+    """Parse command line arguments and return them."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.steps <= 0:
+        parser.error('--steps must be positive')
+    if args.repeats <= 0:
+        parser.error('--repeats must be positive')
+    if args.tolerance < 0:
+        parser.error('--tolerance must be non-negative')
+    if args.reset_budget_us <= 0:
+        parser.error('--reset-budget-us must be positive')
+    return args
+
+
+def main(argv=None):
+    """
+    Run the benchmark suite, write its JSON results, and check regressions.
+
+    Args:
+        argv (list): the command line arguments, sys.argv if None
+
+    Returns (int):
+        1 if any cost regressed past the baseline tolerance or any reset
+        exceeded the reset budget, otherwise 0
+
+    """
+    args = _get_args(argv)
+    results = benchmark_suite(
+        env_ids=args.env_ids or SUITE_ENV_IDS,
+        steps=args.steps,
+        repeats=args.repeats,
+        seed=args.seed,
+    )
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    results['regressions'] = find_regressions(baseline, results, args.tolerance, args.reset_budget_us)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    return 1 if results.get('regressions') else 0
+
+
+# explicitly define the outward facing API of this module
+__all__ = [main.__name__]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
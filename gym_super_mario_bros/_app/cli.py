@@ -7,6 +7,7 @@ from nes_py.play import play_human
 from nes_py.play import play_random
 from nes_py.wrappers import JoypadSpace
 
+from .._registration import register_env
 from ..actions import RIGHT_ONLY, SIMPLE_MOVEMENT, COMPLEX_MOVEMENT
 
 
@@ -101,6 +102,8 @@ def _render_mode(args):
 def _make_env(args):
     """Build and wrap the environment described by args."""
     kwargs = {'render_mode': _render_mode(args)}
+    # resolve stage IDs that lazy registration mode has not registered yet
+    register_env(args.env)
     env = gym.make(args.env, **kwargs)
     # wrap the environment with an action space if specified
     if args.actionspace != 'nes':
@@ -0,0 +1,52 @@
+"""Cheap clones of environment states for tree search."""
+from ._snapshots import capture_snapshot
+from ._snapshots import restore_snapshot
+
+
+def _handle_key(env):
+    """Return the class, ROM, and target a handle restores into."""
+    return type(env), env._rom_path, env._snapshot_target
+
+
+def clone_state(env):
+    """
+    Return a handle of the emulator state and reward baselines.
+
+    Unlike ``_backup``, which holds a single state, handles are plain
+    values, so tree search can keep one per node and restore any of them
+    with ``restore_state``.
+
+    Args:
+        env (NESEnv): a Mario environment that defines ``_SNAPSHOT_ATTRIBUTES``
+
+    Returns (tuple):
+        a snapshot from ``capture_snapshot``, the class, ROM, and target of
+        the environment, and its done flag
+
+    """
+    return capture_snapshot(env), _handle_key(env), env.done
+
+
+def restore_state(env, handle):
+    """
+    Restore a handle from ``clone_state``.
+
+    Args:
+        env (NESEnv): the environment to restore the handle into
+        handle (tuple): a handle cloned from an environment of the same
+            class, ROM, and target
+
+    Returns:
+        None
+
+    """
+    snapshot, key, done = handle
+    if key != _handle_key(env):
+        raise ValueError('handle was cloned from an environment with another class, ROM, or target')
+    restore_snapshot(env, snapshot)
+    env.done = done
+    env._ram_snapshot = None
+
+
+# explicitly define the outward facing API of this module
+__all__ = [clone_state.__name__, restore_state.__name__]
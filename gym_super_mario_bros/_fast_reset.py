@@ -0,0 +1,86 @@
+"""Resets that restore a captured post-reset state instead of recomputing it."""
+import gymnasium as gym
+from nes_py import NESEnv
+
+from ._snapshots import capture_snapshot
+from ._snapshots import restore_snapshot
+
+
+def _copy_info(info):
+    """Return a copy of an info dictionary that shares no mutable values."""
+    return {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in info.items()
+    }
+
+
+def capture_reset(env, noops=0):
+    """
+    Run a full reset and return it as a reset template.
+
+    Every reset restores the same backup state, so the reward baselines and
+    the info that ``_did_reset`` and ``_get_info`` compute from RAM are the
+    same after each one.
+
+    Args:
+        env (NESEnv): a Mario environment with a backup state
+        noops (int): the number of no-op frames to advance after the reset
+            before taking the reward baselines and info
+
+    Returns (tuple):
+        the snapshot of the environment and a copy of its reset info, or of
+        its info record values in array mode
+
+    """
+    _, info = NESEnv.reset(env)
+    if noops:
+        for _ in range(noops):
+            env._frame_advance(0)
+        env._did_reset()
+        info = env._get_info()
+    if env._info_record is not None:
+        info = env._info_record.copy()
+    else:
+        info = _copy_info(info)
+    return capture_snapshot(env), info
+
+
+def restore_reset(env, templates, seed=None, index=None):
+    """
+    Reset an environment by restoring one of its reset templates.
+
+    Args:
+        env (NESEnv): the Mario environment to reset
+        templates (tuple): templates of the environment's reset states from
+            ``capture_reset``
+        seed (int): an optional random number seed for the next episode
+        index (int): the template to restore, or None to draw one from the
+            environment's random number generator
+
+    Returns (dict):
+        the info of the initial frame
+
+    """
+    if index is not None:
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError('start_index must be of type: int')
+        if not 0 <= index < len(templates):
+            raise ValueError('start_index must be in [0, {})'.format(len(templates)))
+    gym.Env.reset(env, seed=seed)
+    if index is None:
+        index = int(env.np_random.integers(len(templates))) if len(templates) > 1 else 0
+    snapshot, info = templates[index]
+    restore_snapshot(env, snapshot)
+    env.start_index = index
+    env._reset_reward_components()
+    env.hidden_frames.start_episode()
+    env._ram_snapshot = None
+    env.done = False
+    if env._info_record is None:
+        return _copy_info(info)
+    env._info_record[()] = info
+    return dict(record=env._info_record)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [capture_reset.__name__, restore_reset.__name__]
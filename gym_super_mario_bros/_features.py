@@ -0,0 +1,124 @@
+"""A compact float32 feature vector decoded from Super Mario Bros. RAM."""
+from gymnasium.spaces import Box
+import numpy as np
+
+from ._ram import decode_digits
+
+
+# the number of enemy slots in Super Mario Bros. RAM
+_ENEMY_SLOTS = 5
+
+
+# the names of Mario's features, in vector order
+_MARIO_FEATURES = (
+    'x_pos',
+    'y_pos',
+    'left_x_pos',
+    'x_speed',
+    'y_speed',
+    'player_state',
+    'status',
+    'float_state',
+    'star_timer',
+    'injury_timer',
+    'life',
+    'time',
+)
+
+
+# the names of each enemy slot's features, in vector order
+_ENEMY_FEATURES = ('active', 'type', 'dx', 'dy')
+
+
+# the names of the features, in vector order
+FEATURE_NAMES = _MARIO_FEATURES + tuple(
+    'enemy{}_{}'.format(slot, name)
+    for slot in range(_ENEMY_SLOTS)
+    for name in _ENEMY_FEATURES
+)
+
+
+# the RAM addresses gathered for the features, in the order decoded below
+_ADDRESSES = np.array([
+    0x006d,  # 0: x page
+    0x0086,  # 1: x pixel
+    0x03b8,  # 2: y pixel
+    0x00b5,  # 3: y viewport
+    0x071c,  # 4: screen left x
+    0x0057,  # 5: x speed (signed)
+    0x009f,  # 6: y speed (signed)
+    0x000e,  # 7: player state
+    0x0756,  # 8: status
+    0x001d,  # 9: float state
+    0x079f,  # 10: star timer
+    0x079e,  # 11: injury timer
+    0x075a,  # 12: life
+    0x07f8, 0x07f9, 0x07fa,  # 13-15: time digits
+    *range(0x000f, 0x000f + _ENEMY_SLOTS),  # 16-20: enemy active flags
+    *range(0x0016, 0x0016 + _ENEMY_SLOTS),  # 21-25: enemy types
+    *range(0x006e, 0x006e + _ENEMY_SLOTS),  # 26-30: enemy x pages
+    *range(0x0087, 0x0087 + _ENEMY_SLOTS),  # 31-35: enemy x pixels
+    *range(0x00cf, 0x00cf + _ENEMY_SLOTS),  # 36-40: enemy y pixels
+], dtype=np.intp)
+
+
+def features_space():
+    """
+    Return the observation space of the feature vector.
+
+    Returns (gymnasium.spaces.Box):
+        the unbounded float32 space with one entry per feature name
+
+    """
+    shape = (len(FEATURE_NAMES),)
+    return Box(low=-np.inf, high=np.inf, shape=shape, dtype=np.float32)
+
+
+def decode_features(ram, output=None):
+    """
+    Decode the feature vector of one or more Super Mario Bros. RAM buffers.
+
+    Enemy positions are relative to Mario, and the features of inactive
+    enemy slots are zero.
+
+    Args:
+        ram (np.ndarray): a 2 KB RAM buffer, or a batch of them stacked
+            along the leading axes
+        output (np.ndarray): an optional float32 array to write into, with
+            the leading axes of ram and one entry per feature name
+
+    Returns (np.ndarray):
+        the float32 features, in the order of ``FEATURE_NAMES``
+
+    """
+    values = np.asarray(ram)[..., _ADDRESSES].astype(np.int64)
+    if output is None:
+        output = np.empty(values.shape[:-1] + (len(FEATURE_NAMES),), dtype=np.float32)
+    x_pos = values[..., 0] * 0x100 + values[..., 1]
+    y_pixel = values[..., 2]
+    output[..., 0] = x_pos
+    # Mario's height above the bottom of the screen, or above the viewport
+    output[..., 1] = np.where(values[..., 3] < 1, 510 - y_pixel, 255 - y_pixel)
+    output[..., 2] = (values[..., 1] - values[..., 4]) % 256
+    # speeds are signed bytes
+    output[..., 3:5] = (values[..., 5:7] + 128) % 256 - 128
+    output[..., 5:11] = values[..., 7:13]
+    output[..., 11] = decode_digits(values[..., 13:16])
+    # each enemy slot's features are interleaved after Mario's features
+    first = len(_MARIO_FEATURES)
+    step = len(_ENEMY_FEATURES)
+    active = values[..., 16:21] != 0
+    enemy_x = values[..., 26:31] * 0x100 + values[..., 31:36]
+    output[..., first::step] = active
+    output[..., first + 1::step] = values[..., 21:26] * active
+    output[..., first + 2::step] = (enemy_x - x_pos[..., None]) * active
+    output[..., first + 3::step] = (values[..., 36:41] - y_pixel[..., None]) * active
+    return output
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    decode_features.__name__,
+    features_space.__name__,
+    'FEATURE_NAMES',
+]
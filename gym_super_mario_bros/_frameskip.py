@@ -0,0 +1,129 @@
+"""
+Native frame skipping with an optional max-pool of the last two frames.
+
+Skipped frames keep the per-frame reward, terminal checks, and after-step
+RAM hacks on purpose: rewards are clipped per frame and episodes end on the
+exact frame they end, so a step matches a frame-skip wrapper bit for bit.
+The saving over a wrapper is the info dictionary and observation, which
+only the final frame builds, and the Python wrapper and step overhead of
+the skipped frames. Summing rewards from RAM deltas over a whole step would
+be cheaper but would clip the step's sum instead of each frame's reward.
+
+"""
+import numpy as np
+
+
+def validate_frameskip(frameskip, max_pool):
+    """
+    Raise an error if frameskip or max_pool are not valid options.
+
+    Args:
+        frameskip (int): the number of frames to advance per step
+        max_pool (bool): whether to max-pool the last two screens of a step
+
+    Returns:
+        None
+
+    """
+    if not isinstance(frameskip, int) or isinstance(frameskip, bool):
+        raise TypeError('frameskip must be of type: int')
+    if frameskip < 1:
+        raise ValueError('frameskip must be positive')
+    if not isinstance(max_pool, bool):
+        raise TypeError('max_pool must be of type: bool')
+    if max_pool and frameskip < 2:
+        raise ValueError('max_pool requires a frameskip of at least 2')
+
+
+def new_max_pool_screen(env, max_pool):
+    """
+    Return the reusable max-pooled observation for an environment.
+
+    Args:
+        env (NESEnv): the environment whose observations are pooled
+        max_pool (bool): whether the environment max-pools its observations
+
+    Returns (np.ndarray, None):
+        a zeroed array of the observation space if max_pool is set,
+        otherwise None
+
+    """
+    if max_pool:
+        space = env.observation_space
+        return np.zeros(space.shape, dtype=space.dtype)
+    return None
+
+
+def step_frames(env, action):
+    """
+    Advance an environment several frames with one action as a single step.
+
+    Every frame runs the reward and terminal checks on the RAM snapshot and
+    the after-step RAM hacks, but only the final frame builds the info. The
+    step stops early on the frame the episode ends. Rewards are clipped per
+    frame and summed, like a frame-skip wrapper; the reward components of
+    the info hold the per-frame components summed over the step.
+
+    Args:
+        env (NESEnv): a Mario environment that defines ``_frameskip``,
+            ``_max_pool_screen``, and the ``_observer`` of its observations
+        action (int): the controller byte to hold for every frame
+
+    Returns:
+        a tuple of:
+        - (np.ndarray) the final observation, or the max-pool of the last
+          two observations if enabled and the step ran every frame
+        - (float) the summed clipped reward of the frames
+        - (bool) whether the episode terminated
+        - (bool) whether the episode was truncated
+        - (dict) the info of the final frame
+
+    """
+    if env.done:
+        raise ValueError('cannot step in a done environment! call `reset`')
+    pool = env._max_pool_screen
+    last = env._frameskip - 1
+    components = None
+    reward = 0.0
+    unclipped = 0.0
+    for frame in range(env._frameskip):
+        if pool is not None and frame == last:
+            np.copyto(pool, env._observer())
+        env._frame_advance(action)
+        frame_reward = float(env._get_reward())
+        terminated = bool(env._get_terminated())
+        truncated = bool(env._get_truncated())
+        unclipped += frame_reward
+        reward += env._clip_reward_value(frame_reward)
+        if components is None:
+            components = dict(env._last_reward_components)
+        else:
+            for key, value in env._last_reward_components.items():
+                components[key] += value
+        if terminated or truncated or frame == last:
+            break
+        # intermediate frames skip the info but keep the RAM hacks
+        env._ram_snapshot = None
+        env._did_step(False)
+    env.done = terminated or truncated
+    env._last_reward_components = components
+    env._last_reward_unclipped = unclipped
+    env._last_reward_clipped = reward
+    info = env._get_info()
+    env._did_step(env.done)
+    observation = env._observer()
+    if pool is None:
+        return observation, reward, terminated, truncated, info
+    if frame == last:
+        np.maximum(pool, observation, out=pool)
+    else:
+        np.copyto(pool, observation)
+    return pool, reward, terminated, truncated, info
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    new_max_pool_screen.__name__,
+    step_frames.__name__,
+    validate_frameskip.__name__,
+]
@@ -0,0 +1,92 @@
+"""Counts of the hidden frames that skip loops advance inside a step."""
+
+
+class HiddenFrameCounter:
+    """Hidden frames per step, per episode, and in total for each skip loop."""
+
+    def __init__(self, phases):
+        """
+        Initialize a new counter with no frames.
+
+        Args:
+            phases (tuple): the names of the skip loops that advance hidden
+                frames inside ``_did_step``
+
+        Returns:
+            None
+
+        """
+        self.phases = tuple(phases)
+        self.step = 0
+        self.episode = dict.fromkeys(self.phases, 0)
+        self.total = dict.fromkeys(self.phases, 0)
+
+    def add(self, phase, frames):
+        """
+        Count the hidden frames a skip loop advanced.
+
+        Args:
+            phase (str): the name of the skip loop
+            frames (int): the number of frames it advanced
+
+        Returns:
+            None
+
+        """
+        self.step += frames
+        self.episode[phase] += frames
+        self.total[phase] += frames
+
+    def start_step(self):
+        """Start counting the hidden frames of a new step."""
+        self.step = 0
+
+    def start_episode(self):
+        """Start counting the hidden frames of a new episode."""
+        self.step = 0
+        for phase in self.episode:
+            self.episode[phase] = 0
+
+    def summary(self):
+        """
+        Return the hidden frame counts.
+
+        Returns (dict):
+            the frames of the last step, the frames of the current episode
+            and of the environment's lifetime for each skip loop, and the
+            sums of both
+
+        """
+        return dict(
+            step=self.step,
+            episode=dict(self.episode),
+            episode_frames=sum(self.episode.values()),
+            total=dict(self.total),
+            total_frames=sum(self.total.values()),
+        )
+
+
+def write_hidden_frames(info, frames):
+    """
+    Write the hidden frames of a step into its info.
+
+    The info is built before ``_did_step`` runs the skip loops, so steps
+    overwrite the field once the loops have finished.
+
+    Args:
+        info (dict): an info dictionary, or a dictionary with a 'record'
+        frames (int): the hidden frames of the step
+
+    Returns:
+        None
+
+    """
+    record = info.get('record')
+    if record is None:
+        info['hidden_frames'] = frames
+    else:
+        record['hidden_frames'] = frames
+
+
+# explicitly define the outward facing API of this module
+__all__ = [HiddenFrameCounter.__name__, write_hidden_frames.__name__]
@@ -0,0 +1,93 @@
+"""Fixed NumPy records that hold the per-step info of an environment."""
+import numpy as np
+
+
+# the valid values of the info_mode constructor argument
+INFO_MODES = ('dict', 'array')
+
+
+def validate_info_mode(info_mode):
+    """
+    Raise an error if info_mode is not a valid info mode.
+
+    Args:
+        info_mode (str): the info mode passed to an environment constructor
+
+    Returns:
+        None
+
+    """
+    if not isinstance(info_mode, str):
+        raise TypeError('info_mode must be of type: str')
+    if info_mode not in INFO_MODES:
+        msg = 'info_mode must be one of: {}'.format(', '.join(INFO_MODES))
+        raise ValueError(msg)
+
+
+def record_dtype(fields, reward_components):
+    """
+    Return the structured dtype of an environment's info record.
+
+    Args:
+        fields (list): (name, dtype) or (name, dtype, shape) tuples for the
+            per-step fields of the info dictionary, in record order
+        reward_components (tuple): the names of the reward components
+
+    Returns (np.dtype):
+        the fields followed by the nested reward components and totals
+
+    """
+    return np.dtype(list(fields) + [
+        ('reward_components', [(name, np.float64) for name in reward_components]),
+        ('reward_total_unclipped', np.float64),
+        ('reward_total_clipped', np.float64),
+    ])
+
+
+def new_info_record(info_mode, dtype):
+    """
+    Return the reusable info record for an info mode.
+
+    Args:
+        info_mode (str): the info mode of the environment
+        dtype (np.dtype): the structured dtype of the environment's record
+
+    Returns (np.ndarray, None):
+        a zeroed 0-d structured array in array mode, otherwise None
+
+    """
+    if info_mode == 'array':
+        return np.zeros((), dtype=dtype)
+    return None
+
+
+def bind_info_record(env, record):
+    """
+    Make an array mode environment write its info into the given record.
+
+    Vector environments bind each sub-environment to one row of a stacked
+    record array so that stepping writes info without any copy.
+
+    Args:
+        env (NESEnv): a Mario environment created with info_mode='array'
+        record (np.ndarray): a 0-d view with the environment's info dtype
+
+    Returns:
+        None
+
+    """
+    if env._info_record is None:
+        raise ValueError('env must be created with info_mode=\'array\'')
+    if record.shape != () or record.dtype != env.info_dtype:
+        raise ValueError('record must be a 0-d array of the env info_dtype')
+    record[()] = env._info_record
+    env._info_record = record
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    bind_info_record.__name__,
+    new_info_record.__name__,
+    record_dtype.__name__,
+    validate_info_mode.__name__,
+]
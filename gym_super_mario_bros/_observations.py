@@ -0,0 +1,176 @@
+"""Observation types that convert the emulator state into reusable buffers."""
+from gymnasium.spaces import Box
+import numpy as np
+
+from ._features import FEATURE_NAMES
+from ._features import decode_features
+from ._features import features_space
+from ._tile_grid import TILE_GRID_SHAPE
+from ._tile_grid import decode_tile_grid
+from ._tile_grid import tile_grid_space
+
+
+# the valid values of the obs_type constructor argument
+OBS_TYPES = ('rgb', 'gray', 'gray84', 'ram')
+
+
+# the observation types of Super Mario Bros., which adds RAM features and
+# the semantic tile grid
+SMB1_OBS_TYPES = OBS_TYPES + ('features', 'tiles')
+
+
+# the observation types derived from the screen, which can be max-pooled
+SCREEN_OBS_TYPES = ('rgb', 'gray', 'gray84')
+
+
+# the shape of each observation type
+_OBS_SHAPES = {
+    'rgb': (240, 256, 3),
+    'gray': (240, 256),
+    'gray84': (84, 84),
+    'ram': (0x800,),
+}
+
+
+def validate_obs_type(obs_type, max_pool, obs_types=OBS_TYPES):
+    """
+    Raise an error if obs_type is not a valid observation type.
+
+    Args:
+        obs_type (str): the observation type passed to an env constructor
+        max_pool (bool): whether the environment max-pools its observations
+        obs_types (tuple): the observation types the environment supports
+
+    Returns:
+        None
+
+    """
+    if not isinstance(obs_type, str):
+        raise TypeError('obs_type must be of type: str')
+    if obs_type not in obs_types:
+        raise ValueError('obs_type must be one of: {}'.format(', '.join(obs_types)))
+    if max_pool and obs_type not in SCREEN_OBS_TYPES:
+        raise ValueError('max_pool requires a screen obs_type')
+
+
+def observation_space(obs_type):
+    """
+    Return the observation space of an observation type.
+
+    Args:
+        obs_type (str): a screen, RAM, feature, or tile grid observation type
+
+    Returns (gymnasium.spaces.Box):
+        the space of the observations
+
+    """
+    if obs_type == 'features':
+        return features_space()
+    if obs_type == 'tiles':
+        return tile_grid_space()
+    return Box(low=0, high=255, shape=_OBS_SHAPES[obs_type], dtype=np.uint8)
+
+
+def area_weights(source, target):
+    """
+    Return the matrix that area-averages ``source`` pixels into ``target``.
+
+    Each target pixel averages the source pixels it covers, weighting the
+    partially covered ones by their overlap, like OpenCV's INTER_AREA.
+
+    Args:
+        source (int): the number of source pixels along the axis
+        target (int): the number of target pixels along the axis
+
+    Returns (np.ndarray):
+        a float32 (target, source) matrix whose rows sum to one
+
+    """
+    scale = source / target
+    edges = np.arange(target + 1) * scale
+    pixels = np.arange(source)
+    overlap = (
+        np.minimum(edges[1:, None], pixels + 1) -
+        np.maximum(edges[:-1, None], pixels)
+    )
+    return (np.clip(overlap, 0, None) / scale).astype(np.float32)
+
+
+class Observer:
+    """Write an environment's observations into preallocated buffers."""
+
+    def __init__(self, env, obs_type):
+        """
+        Initialize a new observer.
+
+        Args:
+            env (NESEnv): the environment to observe
+            obs_type (str): the observation type to produce
+
+        Returns:
+            None
+
+        """
+        self._env = env
+        self._observe = getattr(self, '_' + obs_type)
+        # the RGB observation is a view of the screen and needs no buffer
+        if obs_type == 'features':
+            self._output = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+            return
+        if obs_type == 'tiles':
+            self._output = np.zeros(TILE_GRID_SHAPE, dtype=np.uint8)
+            return
+        shape = _OBS_SHAPES[obs_type]
+        if obs_type != 'rgb':
+            self._output = np.zeros(shape, dtype=np.uint8)
+        if obs_type == 'gray84':
+            self._gray_screen = np.zeros(_OBS_SHAPES['gray'], dtype=np.uint8)
+            self._gray_float = np.zeros(_OBS_SHAPES['gray'], dtype=np.float32)
+            self._rows = area_weights(_OBS_SHAPES['gray'][0], shape[0])
+            self._columns = area_weights(_OBS_SHAPES['gray'][1], shape[1]).T.copy()
+            self._partial = np.zeros((shape[0], _OBS_SHAPES['gray'][1]), dtype=np.float32)
+            self._small = np.zeros(shape, dtype=np.float32)
+
+    def __call__(self):
+        """Return the observation of the current frame."""
+        return self._observe()
+
+    def _rgb(self):
+        """Return the zero-copy view of the RGB screen."""
+        return self._env.screen
+
+    def _gray(self):
+        """Return the grayscale screen."""
+        return self._env.observation('grayscale', self._output)
+
+    def _gray84(self):
+        """Return the grayscale screen area-averaged to 84x84."""
+        self._env.observation('grayscale', self._gray_screen)
+        np.copyto(self._gray_float, self._gray_screen)
+        np.matmul(self._rows, self._gray_float, out=self._partial)
+        np.matmul(self._partial, self._columns, out=self._small)
+        np.rint(self._small, out=self._small)
+        np.copyto(self._output, self._small, casting='unsafe')
+        return self._output
+
+    def _ram(self):
+        """Return a copy of the 2 KB work RAM."""
+        np.copyto(self._output, self._env.ram)
+        return self._output
+
+    def _features(self):
+        """Return the feature vector decoded from RAM without the screen."""
+        return decode_features(self._env.ram, self._output)
+
+    def _tiles(self):
+        """Return the semantic tile grid decoded from RAM without the screen."""
+        return decode_tile_grid(self._env.ram, self._output)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    area_weights.__name__,
+    observation_space.__name__,
+    Observer.__name__,
+    validate_obs_type.__name__,
+]
@@ -0,0 +1,128 @@
+"""Declarative RAM field tables decoded with a single NumPy gather."""
+import numpy as np
+
+
+# powers of ten for counters stored as one decimal digit per byte, ordered
+# from the most significant digit that fits in a 64-bit integer
+_POWERS_OF_TEN = 10 ** np.arange(18, -1, -1, dtype=np.int64)
+# the trailing powers of ten for each counter length
+_POWERS_BY_LENGTH = [
+    _POWERS_OF_TEN[len(_POWERS_OF_TEN) - length:]
+    for length in range(len(_POWERS_OF_TEN) + 1)
+]
+
+
+def decode_digits(digits):
+    """
+    Return the value of decimal counters stored as one digit per byte.
+
+    Args:
+        digits (np.ndarray): digit values ordered from the most significant
+            digit along the last axis; any leading axes are decoded as a batch
+
+    Returns (np.int64, np.ndarray):
+        the decoded value, or an array of values for batched input
+
+    """
+    digits = np.asarray(digits)
+    try:
+        powers = _POWERS_BY_LENGTH[digits.shape[-1]]
+    except IndexError:
+        raise ValueError('cannot decode more than 19 digits') from None
+    return digits.dot(powers)
+
+
+class RamTable:
+    """A named set of RAM fields that are read together once per step."""
+
+    def __init__(self, **fields):
+        """
+        Initialize a new RAM field table.
+
+        Args:
+            fields (dict): a mapping of field names to a single RAM address,
+                an (address, length) tuple for multi-byte fields, or an
+                (address, length, 'digits') tuple for decimal counters
+
+        Returns:
+            None
+
+        """
+        self.fields = {}
+        addresses = set()
+        digit_fields = []
+        for name, spec in fields.items():
+            if not isinstance(spec, tuple):
+                spec = (spec, 1)
+            if len(spec) == 2:
+                spec = spec + ('bytes',)
+            address, length, encoding = spec
+            if length < 1:
+                raise ValueError('field {} must have a positive length'.format(name))
+            if encoding not in {'bytes', 'digits'}:
+                raise ValueError('field {} has unknown encoding {}'.format(name, encoding))
+            if encoding == 'digits':
+                digit_fields.append((address, length))
+            self.fields[name] = (address, length)
+            addresses.update(range(address, address + length))
+        # the sorted unique addresses to gather with one fancy index
+        self.addresses = np.array(sorted(addresses), dtype=np.intp)
+        self._address_list = self.addresses.tolist()
+        self._address_set = frozenset(self._address_list)
+        # decimal counters decode together as one product of the gathered
+        # values with a matrix holding each counter's powers of ten
+        self._digit_keys = digit_fields
+        self._digit_weights = np.zeros(
+            (len(self._address_list), len(digit_fields)),
+            dtype=np.int64,
+        )
+        slots = {address: slot for slot, address in enumerate(self._address_list)}
+        for column, (address, length) in enumerate(digit_fields):
+            powers = _POWERS_BY_LENGTH[length]
+            for digit, power in zip(range(address, address + length), powers):
+                self._digit_weights[slots[digit], column] = power
+
+    def __len__(self):
+        """Return the number of unique addresses in the table."""
+        return len(self._address_list)
+
+    def __contains__(self, address):
+        """Return True if the table gathers the given address."""
+        return address in self._address_set
+
+    def field_addresses(self, name):
+        """
+        Return the addresses that back a named field.
+
+        Args:
+            name (str): the name of the field to look up
+
+        Returns (range):
+            the contiguous addresses of the field
+
+        """
+        address, length = self.fields[name]
+        return range(address, address + length)
+
+    def gather(self, ram):
+        """
+        Read every address in the table from RAM at once.
+
+        Args:
+            ram (np.ndarray): the 2 KB RAM buffer of an emulator
+
+        Returns (dict):
+            a mapping of RAM address to its value as a Python integer, plus a
+            mapping of (address, length) to the value of each decimal counter
+
+        """
+        values = ram[self.addresses]
+        snapshot = dict(zip(self._address_list, values.tolist()))
+        if self._digit_keys:
+            counters = values.dot(self._digit_weights).tolist()
+            snapshot.update(zip(self._digit_keys, counters))
+        return snapshot
+
+
+# explicitly define the outward facing API of this module
+__all__ = [RamTable.__name__, decode_digits.__name__]
@@ -1,4 +1,7 @@
 """Registration code of Gymnasium environments in this package."""
+from functools import lru_cache
+import os
+
 import gymnasium as gym
 
 from .smb3_stages import smb3_stage_matrix
@@ -146,47 +149,125 @@ def _lost_levels_world_label(world):
     return chr(ord('A') + world - 10)
 
 
-# iterate over Super Mario Bros. worlds (1-8) and stages (1-4)
-for world in range(1, 9):
-    for stage in range(1, 5):
-        target = (world, stage)
-        env_id = _ID_TEMPLATE.format('', world, stage, 0)
-        _register_mario_stage_env(env_id, target=target)
-        env_id = _ID_ALIAS_TEMPLATE.format(world, stage, 0)
-        _register_mario_stage_env(env_id, target=target)
+@lru_cache(maxsize=None)
+def _stage_registrations():
+    """
+    Return the registration function and kwargs of every stage environment.
+
+    Returns (dict):
+        a mapping of stage environment IDs to (register, kwargs) tuples, in
+        registration order
+
+    """
+    registrations = {}
+    # iterate over Super Mario Bros. worlds (1-8) and stages (1-4)
+    for world in range(1, 9):
+        for stage in range(1, 5):
+            kwargs = dict(target=(world, stage))
+            env_id = _ID_TEMPLATE.format('', world, stage, 0)
+            registrations[env_id] = (_register_mario_stage_env, kwargs)
+            env_id = _ID_ALIAS_TEMPLATE.format(world, stage, 0)
+            registrations[env_id] = (_register_mario_stage_env, kwargs)
+    # iterate over Lost Levels worlds (1-9, A-D) and stages (1-4)
+    for world in range(1, 14):
+        for stage in range(1, 5):
+            env_id = _ID_TEMPLATE.format(
+                '2',
+                _lost_levels_world_label(world),
+                stage,
+                0,
+            )
+            kwargs = dict(lost_levels=True, target=(world, stage))
+            registrations[env_id] = (_register_mario_stage_env, kwargs)
+    # iterate over Super Mario Bros. 2 (USA) worlds (1-7) and stages
+    for world, stage_count in enumerate(_SMB2_USA_STAGES_PER_WORLD, start=1):
+        for stage in range(1, stage_count + 1):
+            env_id = 'SuperMarioBros2USA-{}-{}-v0'.format(world, stage)
+            registrations[env_id] = (_register_smb2_usa_env, dict(target=(world, stage)))
+    # Super Mario Bros. 3 exposes validated vanilla World 1 entry points.
+    for stage in smb3_stage_matrix(validated=True):
+        registrations[stage.env_id] = (_register_smb3_env, dict(target=stage.target))
+    return registrations
+
+
+def register_env(env_id):
+    """
+    Register a single Mario stage environment ID with Gymnasium on demand.
+
+    Args:
+        env_id (str): the environment ID to resolve, optionally prefixed by a
+            "module:" import path as accepted by gymnasium.make
+
+    Returns (bool):
+        True if the ID names a Mario stage environment, which is registered
+        afterward, otherwise False
+
+    """
+    if not isinstance(env_id, str):
+        raise TypeError('env_id must be of type: str')
+    env_id = env_id.rpartition(':')[2]
+    registration = _stage_registrations().get(env_id)
+    if registration is None:
+        return False
+    if env_id not in gym.envs.registration.registry:
+        register, kwargs = registration
+        register(env_id, **kwargs)
+    return True
+
+
+def register_envs():
+    """
+    Register every Mario stage environment ID with Gymnasium.
 
+    Lazy registration mode calls this to make the full set of IDs visible to
+    gymnasium.make and the Gymnasium registry, e.g., before listing them.
 
-# iterate over Lost Levels worlds (1-9, A-D) and stages (1-4)
-for world in range(1, 14):
-    for stage in range(1, 5):
-        target = (world, stage)
-        env_id = _ID_TEMPLATE.format(
-            '2',
-            _lost_levels_world_label(world),
-            stage,
-            0,
-        )
-        _register_mario_stage_env(
-            env_id,
-            lost_levels=True,
-            target=target,
-        )
+    Returns:
+        None
 
+    """
+    registry = gym.envs.registration.registry
+    for env_id, (register, kwargs) in _stage_registrations().items():
+        if env_id not in registry:
+            register(env_id, **kwargs)
 
-# iterate over Super Mario Bros. 2 (USA) worlds (1-7) and stages
-for world, stage_count in enumerate(_SMB2_USA_STAGES_PER_WORLD, start=1):
-    for stage in range(1, stage_count + 1):
-        env_id = 'SuperMarioBros2USA-{}-{}-v0'.format(world, stage)
-        _register_smb2_usa_env(env_id, target=(world, stage))
 
+def _make_lazily(id, **kwargs):
+    """
+    Resolve a Mario environment ID on demand and make it with Gymnasium.
 
-# Super Mario Bros. 3 exposes validated vanilla World 1 entry points.
-for stage in smb3_stage_matrix(validated=True):
-    _register_smb3_env(stage.env_id, target=stage.target)
+    Args:
+        id (str, EnvSpec): the environment ID or spec passed to gymnasium.make
+        kwargs (dict): keyword arguments passed to gymnasium.make
 
+    Returns (gymnasium.Env):
+        the environment created by gymnasium.make
 
-# create an alias to gymnasium.make for ease of access
-make = gym.make
+    """
+    if isinstance(id, str):
+        register_env(id)
+    return gym.make(id, **kwargs)
+
+
+# the environment variable that selects the registration mode at import
+_REGISTRATION_MODE_VARIABLE = 'GYM_SUPER_MARIO_BROS_REGISTRATION'
+# the valid values of the registration mode environment variable
+_REGISTRATION_MODES = ('eager', 'lazy')
+_REGISTRATION_MODE = os.environ.get(_REGISTRATION_MODE_VARIABLE, 'eager')
+if _REGISTRATION_MODE not in _REGISTRATION_MODES:
+    raise ValueError('{} must be one of: {}'.format(
+        _REGISTRATION_MODE_VARIABLE,
+        ', '.join(_REGISTRATION_MODES),
+    ))
+
+
+if _REGISTRATION_MODE == 'lazy':
+    # stage IDs are registered by make, register_env, and register_envs
+    make = _make_lazily
+else:
+    register_envs()
+    # create an alias to gymnasium.make for ease of access
+    make = gym.make
 
 
 # define the outward facing API of this module (none, gymnasium provides the API)
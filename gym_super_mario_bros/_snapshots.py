@@ -0,0 +1,110 @@
+"""A process-wide cache of post-intro emulator snapshots."""
+import hashlib
+from functools import lru_cache
+
+
+# post-intro snapshots keyed by (ROM hash, environment class, target)
+_START_SNAPSHOTS = {}
+
+
+@lru_cache(maxsize=None)
+def rom_hash(rom_path):
+    """
+    Return the SHA-1 digest of a ROM file.
+
+    Args:
+        rom_path (str): the path to the ROM file to hash
+
+    Returns (str):
+        the hexadecimal SHA-1 digest of the ROM contents
+
+    """
+    with open(rom_path, 'rb') as rom:
+        return hashlib.sha1(rom.read()).hexdigest()
+
+
+def start_snapshot_key(env):
+    """
+    Return the cache key for an environment's post-intro snapshot.
+
+    Args:
+        env (NESEnv): a Mario environment that defines ``_snapshot_target``
+
+    Returns (tuple):
+        the ROM hash, environment class name, and target of the environment
+
+    """
+    return rom_hash(env._rom_path), type(env).__name__, env._snapshot_target
+
+
+def capture_snapshot(env):
+    """
+    Return an emulator snapshot with the environment's Python-side state.
+
+    Args:
+        env (NESEnv): a Mario environment that defines ``_SNAPSHOT_ATTRIBUTES``
+
+    Returns (tuple):
+        the opaque native emulator snapshot and a dictionary of attributes
+
+    """
+    attributes = {name: getattr(env, name) for name in env._SNAPSHOT_ATTRIBUTES}
+    return env.dump_state(), attributes
+
+
+def restore_snapshot(env, snapshot):
+    """
+    Restore a snapshot created by ``capture_snapshot`` into an environment.
+
+    Args:
+        env (NESEnv): the environment to restore the snapshot into
+        snapshot (tuple): a snapshot returned by ``capture_snapshot``
+
+    Returns:
+        None
+
+    """
+    state, attributes = snapshot
+    env.load_state(state)
+    for name, value in attributes.items():
+        setattr(env, name, value)
+
+
+def skip_start_screen(env, use_cache):
+    """
+    Skip an environment's start screen, using the snapshot cache if enabled.
+
+    Args:
+        env (NESEnv): a freshly reset Mario environment
+        use_cache (bool): whether to read and write the snapshot cache
+
+    Returns:
+        None
+
+    """
+    if not use_cache:
+        env._skip_start_screen()
+        return
+    key = start_snapshot_key(env)
+    snapshot = _START_SNAPSHOTS.get(key)
+    if snapshot is None:
+        env._skip_start_screen()
+        _START_SNAPSHOTS[key] = capture_snapshot(env)
+    else:
+        restore_snapshot(env, snapshot)
+
+
+def clear_snapshot_cache():
+    """Remove every cached post-intro snapshot from the current process."""
+    _START_SNAPSHOTS.clear()
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    capture_snapshot.__name__,
+    clear_snapshot_cache.__name__,
+    restore_snapshot.__name__,
+    rom_hash.__name__,
+    skip_start_screen.__name__,
+    start_snapshot_key.__name__,
+]
@@ -0,0 +1,70 @@
+"""Pools of start states reached by varied no-op frames after the backup."""
+import numpy as np
+
+from ._fast_reset import capture_reset
+
+
+def validate_start_pool(start_pool, start_noops):
+    """
+    Raise an error if the start pool options are not valid.
+
+    Args:
+        start_pool (int): the number of start states to reset into
+        start_noops (int): the most no-op frames before a start state
+
+    Returns:
+        None
+
+    """
+    if not isinstance(start_pool, int) or isinstance(start_pool, bool):
+        raise TypeError('start_pool must be of type: int')
+    if start_pool < 1:
+        raise ValueError('start_pool must be positive')
+    if not isinstance(start_noops, int) or isinstance(start_noops, bool):
+        raise TypeError('start_noops must be of type: int')
+    if start_noops < 0:
+        raise ValueError('start_noops must be non-negative')
+    if start_pool > start_noops + 1:
+        raise ValueError('start_pool must be at most start_noops + 1')
+
+
+def noop_counts(size, max_noops, seed=0):
+    """
+    Return the distinct no-op frame counts of the start states of a pool.
+
+    Args:
+        size (int): the number of start states
+        max_noops (int): the most no-op frames before a start state
+        seed (int): the seed that draws the counts
+
+    Returns (list):
+        zero for the backup state followed by ``size - 1`` distinct counts
+        in ``[1, max_noops]`` in increasing order
+
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.choice(np.arange(1, max_noops + 1), size - 1, replace=False)
+    return [0] + sorted(int(count) for count in counts)
+
+
+def build_start_pool(env):
+    """
+    Return the reset templates of an environment's start pool.
+
+    Args:
+        env (NESEnv): a Mario environment with a backup state
+
+    Returns (tuple):
+        a reset template for every start state of the pool
+
+    """
+    counts = noop_counts(env._start_pool_size, env._start_noops)
+    return tuple(capture_reset(env, count) for count in counts)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    build_start_pool.__name__,
+    noop_counts.__name__,
+    validate_start_pool.__name__,
+]
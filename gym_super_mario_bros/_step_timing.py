@@ -0,0 +1,242 @@
+"""Opt-in per-phase nanosecond timings of environment steps."""
+from collections import Counter
+import time
+
+import numpy as np
+
+
+# the phases of every step: frames advanced for the action, the reward and
+# terminal hooks, the info build, the after-step RAM hacks (including their
+# hidden frames), the observation, and the whole step
+PHASES = ('emulation', 'reward', 'terminal', 'info', 'did_step', 'observation', 'step')
+
+
+# the skip loops of _did_step that are timed as phases of their own, for the
+# environments that define them
+SKIP_PHASES = ('_skip_end_of_world', '_skip_change_area', '_skip_occupied_states', '_kill_mario')
+
+
+# the number of power-of-two nanosecond buckets of each histogram
+HISTOGRAM_BUCKETS = 64
+
+
+def validate_step_timing(step_timing):
+    """
+    Raise an error if step_timing is not a valid option.
+
+    Args:
+        step_timing (bool): whether to time the phases of every step
+
+    Returns:
+        None
+
+    """
+    if not isinstance(step_timing, bool):
+        raise TypeError('step_timing must be of type: bool')
+
+
+def new_step_timer(env, step_timing):
+    """
+    Return the step timer of an environment, if enabled.
+
+    Args:
+        env (NESEnv): a constructed Mario environment
+        step_timing (bool): whether to time the phases of every step
+
+    Returns (StepTimer, None):
+        a timer with its hooks installed on env if enabled, otherwise None
+
+    """
+    if step_timing:
+        return StepTimer(env)
+    return None
+
+
+def _percentile(buckets, count, fraction):
+    """Return the upper bound of the bucket holding a percentile."""
+    if not count:
+        return 0
+    index = int(np.searchsorted(np.cumsum(buckets), fraction * count))
+    return (1 << index) - 1
+
+
+class _Emulator:
+    """A native emulator proxy with a replaced frame advance."""
+
+    def __init__(self, emulator, frame_advance):
+        """Wrap emulator, advancing frames with the given function."""
+        self._emulator = emulator
+        self.frame_advance = frame_advance
+
+    def __getattr__(self, name):
+        """Return the attribute of the native emulator."""
+        return getattr(self._emulator, name)
+
+
+class StepTimer:
+    """Per-phase nanosecond timings and hidden frame counts of steps."""
+
+    def __init__(self, env):
+        """
+        Install timing hooks on an environment instance.
+
+        The hooks shadow the environment's methods with instance attributes
+        and wrap its native emulator to time frame advances, so environments
+        without a timer run untouched.
+
+        Args:
+            env (NESEnv): a constructed Mario environment
+
+        Returns:
+            None
+
+        """
+        self.env = env
+        self.phases = PHASES + tuple(name for name in SKIP_PHASES if hasattr(env, name))
+        self._current = dict.fromkeys(self.phases, 0)
+        # the depth of nested _did_step calls, whose frames it times
+        self._depth = 0
+        self.clear()
+        self._install()
+
+    def clear(self):
+        """Discard every recorded step."""
+        self.steps = 0
+        self._totals = dict.fromkeys(self.phases, 0)
+        self._maxima = dict.fromkeys(self.phases, 0)
+        self._buckets = {phase: [0] * HISTOGRAM_BUCKETS for phase in self.phases}
+        self._hidden_frame_counts = Counter()
+
+    def _timed(self, phase, method):
+        """Return method wrapped to add its duration to a phase."""
+        clock = time.perf_counter_ns
+        current = self._current
+
+        def timed(*args):
+            start = clock()
+            try:
+                return method(*args)
+            finally:
+                current[phase] += clock() - start
+
+        return timed
+
+    def _install(self):
+        """Shadow the environment's step hooks with timed versions."""
+        env = self.env
+        clock = time.perf_counter_ns
+        current = self._current
+        frame_advance = env._env.frame_advance
+        did_step = env._did_step
+        step = env.step
+
+        def timed_frame_advance(action):
+            if self._depth:
+                return frame_advance(action)
+            start = clock()
+            try:
+                return frame_advance(action)
+            finally:
+                current['emulation'] += clock() - start
+
+        def timed_did_step(done):
+            self._depth += 1
+            start = clock()
+            try:
+                return did_step(done)
+            finally:
+                current['did_step'] += clock() - start
+                self._depth -= 1
+
+        def timed_step(action):
+            for phase in current:
+                current[phase] = 0
+            start = clock()
+            result = step(action)
+            current['step'] = clock() - start
+            self._record()
+            return result
+
+        terminated = self._timed('terminal', env._get_terminated)
+        truncated = self._timed('terminal', env._get_truncated)
+        env._env = _Emulator(env._env, timed_frame_advance)
+        env._did_step = timed_did_step
+        env.step = timed_step
+        env._get_reward = self._timed('reward', env._get_reward)
+        env._get_terminated = terminated
+        env._get_truncated = truncated
+        env._get_info = self._timed('info', env._get_info)
+        env._observer = self._timed('observation', env._observer)
+        for phase in self.phases[len(PHASES):]:
+            setattr(env, phase, self._timed(phase, getattr(env, phase)))
+
+    def _record(self):
+        """Add the timings of the step that just finished."""
+        self.steps += 1
+        for phase, nanoseconds in self._current.items():
+            self._totals[phase] += nanoseconds
+            if nanoseconds > self._maxima[phase]:
+                self._maxima[phase] = nanoseconds
+            self._buckets[phase][nanoseconds.bit_length()] += 1
+        self._hidden_frame_counts[self.env.hidden_frames.step] += 1
+
+    def histograms(self):
+        """
+        Return the histograms of the recorded steps.
+
+        Returns (dict):
+            for every phase, the int64 number of steps whose duration has
+            each bit length, i.e., bucket ``b`` counts durations in
+            ``[2 ** (b - 1), 2 ** b)`` nanoseconds; and for 'hidden_frames'
+            the number of steps with each ``hidden_frames.step`` count of
+            the environment
+
+        """
+        histograms = {
+            phase: np.array(buckets, dtype=np.int64)
+            for phase, buckets in self._buckets.items()
+        }
+        histograms['hidden_frames'] = dict(sorted(self._hidden_frame_counts.items()))
+        return histograms
+
+    def summary(self):
+        """
+        Return summary statistics of the recorded steps.
+
+        Returns (dict):
+            the number of steps; for every phase the total, mean, and
+            maximum nanoseconds per step and the upper bounds of the 50th,
+            90th, and 99th percentile buckets; and the total, mean, and
+            maximum hidden frames per step
+
+        """
+        steps = self.steps
+        summary = dict(steps=steps)
+        for phase in self.phases:
+            buckets = self._buckets[phase]
+            summary[phase] = dict(
+                total_ns=self._totals[phase],
+                mean_ns=self._totals[phase] / steps if steps else 0.0,
+                max_ns=self._maxima[phase],
+                p50_ns=_percentile(buckets, steps, 0.5),
+                p90_ns=_percentile(buckets, steps, 0.9),
+                p99_ns=_percentile(buckets, steps, 0.99),
+            )
+        hidden = sum(frames * count for frames, count in self._hidden_frame_counts.items())
+        summary['hidden_frames'] = dict(
+            total=hidden,
+            mean=hidden / steps if steps else 0.0,
+            max=max(self._hidden_frame_counts, default=0),
+        )
+        return summary
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    new_step_timer.__name__,
+    validate_step_timing.__name__,
+    StepTimer.__name__,
+    'HISTOGRAM_BUCKETS',
+    'PHASES',
+    'SKIP_PHASES',
+]
@@ -0,0 +1,51 @@
+"""Per-target banks of start snapshots for retargeting live environments."""
+from ._snapshots import capture_snapshot
+from ._snapshots import restore_snapshot
+from ._snapshots import skip_start_screen
+
+
+def retarget(env, target):
+    """
+    Switch an environment to a new target without reconstructing it.
+
+    The first switch to a target restores the power-on state captured at
+    construction and skips the start screen for it; a soft reset of the
+    emulator would keep the RAM that the Super Mario Bros. start screen
+    reads. Every switch keeps the post-intro snapshot and the reset
+    templates of the target it leaves in the environment's bank, so
+    switching back restores them instead of replaying the start screen.
+
+    Args:
+        env (NESEnv): a constructed Mario environment
+        target (None, tuple): the (world, stage) to play as a level, or None
+            for the full game
+
+    Returns:
+        None
+
+    """
+    previous = env._snapshot_target
+    previous_templates = env._reset_templates
+    # validate and decode the target before changing any state
+    env._set_target(target)
+    if env._snapshot_target == previous:
+        return
+    env._task = env._resolve_task()
+    bank = env._target_bank
+    if previous not in bank:
+        env._restore()
+        bank[previous] = [capture_snapshot(env), None]
+    bank[previous][1] = previous_templates
+    entry = bank.get(env._snapshot_target)
+    if entry is None:
+        env.load_state(env._power_on_state)
+        skip_start_screen(env, env._snapshot_cache)
+        entry = bank[env._snapshot_target] = [capture_snapshot(env), None]
+    else:
+        restore_snapshot(env, entry[0])
+    env._backup()
+    env._reset_templates = entry[1]
+
+
+# explicitly define the outward facing API of this module
+__all__ = [retarget.__name__]
@@ -0,0 +1,111 @@
+"""A semantic tile grid of the Super Mario Bros. screen decoded from RAM."""
+from gymnasium.spaces import Box
+import numpy as np
+
+
+# the (rows, columns) of 16x16 pixel metatiles below the status bar
+TILE_GRID_SHAPE = (13, 16)
+
+
+# the values of the cells of the tile grid
+TILE_EMPTY = 0
+TILE_SOLID = 1
+TILE_ENEMY = 2
+TILE_MARIO = 3
+
+
+# the start of the two 13x16 metatile pages of the current area
+_METATILE_BUFFER = 0x0500
+# the number of bytes of one metatile page
+_METATILE_PAGE = 0xd0
+# the pixel height of the status bar above the first row of metatiles
+_STATUS_BAR_HEIGHT = 32
+# the number of enemy slots in Super Mario Bros. RAM
+_ENEMY_SLOTS = 5
+
+
+# the row of every cell of the grid and the pixel offset of every column
+_ROWS = np.arange(TILE_GRID_SHAPE[0])[:, None]
+_COLUMN_PIXELS = 16 * np.arange(TILE_GRID_SHAPE[1])
+
+
+def tile_grid_space():
+    """
+    Return the observation space of the tile grid.
+
+    Returns (gymnasium.spaces.Box):
+        the uint8 space of 13x16 grids with cells from TILE_EMPTY to TILE_MARIO
+
+    """
+    return Box(low=0, high=TILE_MARIO, shape=TILE_GRID_SHAPE, dtype=np.uint8)
+
+
+def _cells(x, y, left):
+    """Return the (row, column) cells of sprites at level pixel positions."""
+    return (y + 8 - _STATUS_BAR_HEIGHT) // 16, (x - left + 8) // 16
+
+
+def decode_tile_grid(ram, output=None):
+    """
+    Decode the tile grid of one or more Super Mario Bros. RAM buffers.
+
+    Cells hold TILE_SOLID for non-empty metatiles of the area, TILE_ENEMY
+    for the cells of active enemies, and TILE_MARIO for Mario's cell, each
+    drawn over the previous; all other cells hold TILE_EMPTY.
+
+    Args:
+        ram (np.ndarray): a 2 KB RAM buffer, or a batch of them stacked
+            along the leading axes
+        output (np.ndarray): an optional C-contiguous uint8 array to write
+            into, with the leading axes of ram followed by TILE_GRID_SHAPE
+
+    Returns (np.ndarray):
+        the uint8 tile grid of each RAM buffer
+
+    """
+    ram = np.asarray(ram)
+    batch = ram.shape[:-1]
+    if output is None:
+        output = np.empty(batch + TILE_GRID_SHAPE, dtype=np.uint8)
+    ram = ram.reshape((-1, ram.shape[-1]))
+    grids = output.reshape((-1,) + TILE_GRID_SHAPE)
+    # the level pixel of the left edge of the screen
+    x_pos = ram[:, 0x006d].astype(np.int64) * 0x100 + ram[:, 0x0086]
+    left = x_pos - (ram[:, 0x0086].astype(np.int64) - ram[:, 0x071c]) % 256
+    # the metatile address of every cell, wrapping across the two pages
+    x = left[:, None] + _COLUMN_PIXELS
+    columns = _METATILE_BUFFER + (x // 256 % 2) * _METATILE_PAGE + x % 256 // 16
+    addresses = (columns[:, None, :] + 16 * _ROWS).reshape((len(ram), -1))
+    metatiles = np.take_along_axis(ram, addresses, axis=1)
+    np.not_equal(metatiles, 0, out=grids.reshape((len(ram), -1)), casting='unsafe')
+    # active enemies that are on the visible screen
+    enemy_x = ram[:, 0x006e:0x0073].astype(np.int64) * 0x100 + ram[:, 0x0087:0x008c]
+    rows, cols = _cells(enemy_x, ram[:, 0x00cf:0x00d4].astype(np.int64), left[:, None])
+    visible = (
+        (ram[:, 0x000f:0x0014] != 0) & (ram[:, 0x00b6:0x00bb] == 1) &
+        (rows >= 0) & (rows < TILE_GRID_SHAPE[0]) &
+        (cols >= 0) & (cols < TILE_GRID_SHAPE[1])
+    )
+    index, _ = np.nonzero(visible)
+    grids[index, rows[visible], cols[visible]] = TILE_ENEMY
+    # Mario, if he is on the visible screen
+    rows, cols = _cells(x_pos, ram[:, 0x03b8].astype(np.int64), left)
+    visible = (
+        (ram[:, 0x00b5] == 1) &
+        (rows >= 0) & (rows < TILE_GRID_SHAPE[0]) &
+        (cols >= 0) & (cols < TILE_GRID_SHAPE[1])
+    )
+    grids[visible, rows[visible], cols[visible]] = TILE_MARIO
+    return output
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    decode_tile_grid.__name__,
+    tile_grid_space.__name__,
+    'TILE_EMPTY',
+    'TILE_ENEMY',
+    'TILE_GRID_SHAPE',
+    'TILE_MARIO',
+    'TILE_SOLID',
+]
@@ -0,0 +1,49 @@
+"""Steps that re-simulate controller traces without the reward code."""
+import numpy as np
+
+from ._hidden_frames import write_hidden_frames
+
+
+def materialized(observation, info):
+    """Return copies of an observation and info that outlive the next step."""
+    if 'record' in info:
+        info = dict(record=info['record'].copy())
+    return np.array(observation), info
+
+
+def advance(env, action, materialize):
+    """
+    Advance an environment one step without computing rewards.
+
+    The frames run the same terminal checks and after-step RAM hacks as
+    ``step``, so the emulator follows the live trajectory exactly.
+
+    Args:
+        env (NESEnv): a reset Mario environment
+        action (int): the controller byte to hold for every frame
+        materialize (bool): whether to build the observation and info
+
+    Returns (tuple):
+        whether the episode ended, and the observation and info of the step
+        if materialized, otherwise None
+
+    """
+    env.hidden_frames.start_step()
+    last = env._frameskip - 1
+    for frame in range(env._frameskip):
+        env._frame_advance(action)
+        done = bool(env._get_terminated()) or bool(env._get_truncated())
+        if done or frame == last:
+            break
+        env._did_step(False)
+    env.done = done
+    info = env._get_info() if materialize else None
+    env._did_step(done)
+    if not materialize:
+        return done, None
+    write_hidden_frames(info, env.hidden_frames.step)
+    return done, materialized(env._observer(), info)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [advance.__name__, materialized.__name__]
@@ -0,0 +1,249 @@
+"""Go-Explore style archives of emulator states keyed by position cells."""
+from collections import OrderedDict
+
+import numpy as np
+
+from ._snapshots import capture_snapshot
+from ._snapshots import restore_snapshot
+from ._snapshots import start_snapshot_key
+
+
+# the policies that choose which cell a full archive evicts
+EVICTION_POLICIES = ('lru', 'score')
+
+
+def cell_of(env, x_bucket=16, y_bucket=16):
+    """
+    Return the cell of an environment's current state.
+
+    Args:
+        env (gym.Env): a Mario environment
+        x_bucket (int): the width in pixels of a cell
+        y_bucket (int): the height in pixels of a cell
+
+    Returns (tuple):
+        the world, stage, horizontal bucket, and vertical bucket decoded
+        from RAM
+
+    """
+    env = env.unwrapped
+    return (
+        int(env._world),
+        int(env._stage),
+        int(env._x_position) // x_bucket,
+        int(env._y_position) // y_bucket,
+    )
+
+
+class CellArchive:
+    """A fixed-capacity archive of the best emulator state of each cell."""
+
+    def __init__(self, capacity, policy='lru', x_bucket=16, y_bucket=16):
+        """
+        Initialize a new empty archive.
+
+        Native emulator snapshots of one ROM have a fixed size, so the
+        capacity bounds the memory of the archive; the cell keys and
+        statistics live in NumPy arrays allocated once for every slot.
+
+        Args:
+            capacity (int): the most states to keep
+            policy (str): 'lru' to evict the least recently inserted or
+                restored cell, or 'score' to evict the lowest scoring cell
+            x_bucket (int): the width in pixels of a cell
+            y_bucket (int): the height in pixels of a cell
+
+        Returns:
+            None
+
+        """
+        for name, value in (('capacity', capacity), ('x_bucket', x_bucket), ('y_bucket', y_bucket)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError('{} must be of type: int'.format(name))
+            if value < 1:
+                raise ValueError('{} must be positive'.format(name))
+        if policy not in EVICTION_POLICIES:
+            raise ValueError('policy must be one of: {}'.format(', '.join(EVICTION_POLICIES)))
+        self.capacity = capacity
+        self.policy = policy
+        self.x_bucket = x_bucket
+        self.y_bucket = y_bucket
+        # the slot of every cell, from least to most recently used
+        self._slots = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._states = [None] * capacity
+        # the snapshot key of the environments the states belong to
+        self._key = None
+        self.cells = np.zeros((capacity, 4), dtype=np.int64)
+        self.scores = np.full(capacity, -np.inf)
+        self.seen = np.zeros(capacity, dtype=np.int64)
+        self.visits = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        """Return the number of cells in the archive."""
+        return len(self._slots)
+
+    def __contains__(self, cell):
+        """Return True if the archive holds a state for a cell."""
+        return cell in self._slots
+
+    def _check_env(self, env):
+        """Raise an error if env does not play the archive's ROM and target."""
+        key = start_snapshot_key(env)
+        if self._key is None:
+            self._key = key
+        elif key != self._key:
+            raise ValueError('env does not match the ROM and target of the archive')
+
+    def _evict(self):
+        """Remove the cell chosen by the eviction policy and return its slot."""
+        if self.policy == 'lru':
+            _, slot = self._slots.popitem(last=False)
+        else:
+            slot = int(np.argmin(self.scores))
+            del self._slots[tuple(self.cells[slot].tolist())]
+        self._states[slot] = None
+        self.scores[slot] = -np.inf
+        return slot
+
+    def cell(self, env):
+        """
+        Return the cell of an environment's current state.
+
+        Args:
+            env (gym.Env): a Mario environment
+
+        Returns (tuple):
+            the world, stage, horizontal bucket, and vertical bucket
+
+        """
+        return cell_of(env, self.x_bucket, self.y_bucket)
+
+    def insert(self, env, score):
+        """
+        Keep an environment's state if it is the best state of its cell.
+
+        Args:
+            env (gym.Env): a Mario environment
+            score (float): the score of the state, e.g., the episode return
+                that reached it
+
+        Returns (bool):
+            whether the archive stored the state
+
+        """
+        env = env.unwrapped
+        self._check_env(env)
+        cell = self.cell(env)
+        slot = self._slots.get(cell)
+        if slot is not None:
+            self._slots.move_to_end(cell)
+            self.seen[slot] += 1
+            if score <= self.scores[slot]:
+                return False
+        else:
+            if not self._free and self.policy == 'score' and score <= self.scores.min():
+                return False
+            slot = self._free.pop() if self._free else self._evict()
+            self._slots[cell] = slot
+            self.cells[slot] = cell
+            self.seen[slot] = 1
+            self.visits[slot] = 0
+        self._states[slot] = capture_snapshot(env)
+        self.scores[slot] = score
+        return True
+
+    def score(self, cell):
+        """
+        Return the score of the state of a cell.
+
+        Args:
+            cell (tuple): a cell of the archive
+
+        Returns (float):
+            the score the state was inserted with
+
+        """
+        return float(self.scores[self._slots[cell]])
+
+    def select(self, size, rng=None):
+        """
+        Return cells drawn with weights that favor rarely restored cells.
+
+        Args:
+            size (int): the number of cells to draw
+            rng (np.random.Generator): the random number generator to use
+
+        Returns (list):
+            ``size`` cells drawn with replacement in proportion to one over
+            the square root of one plus their number of restores
+
+        """
+        if not self._slots:
+            raise ValueError('cannot select from an empty archive')
+        rng = np.random.default_rng() if rng is None else rng
+        slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+        weights = 1 / np.sqrt(self.visits[slots] + 1)
+        chosen = rng.choice(slots, size=size, p=weights / weights.sum())
+        return [tuple(self.cells[slot].tolist()) for slot in chosen]
+
+    def restore(self, env, cell):
+        """
+        Restore the state of a cell into an environment as a new episode.
+
+        Args:
+            env (gym.Env): a Mario environment of the archive's ROM and target
+            cell (tuple): a cell of the archive
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the observation of the restored state
+            - (dict) the info of the restored state
+
+        """
+        env = env.unwrapped
+        self._check_env(env)
+        slot = self._slots[cell]
+        self._slots.move_to_end(cell)
+        self.visits[slot] += 1
+        restore_snapshot(env, self._states[slot])
+        env._reset_reward_components()
+        env.hidden_frames.start_episode()
+        env._ram_snapshot = None
+        env.done = False
+        return env._observer(), env._get_info()
+
+    def restore_batch(self, envs, cells=None, rng=None):
+        """
+        Restore a cell into each of several environments.
+
+        Args:
+            envs (list): Mario environments of the archive's ROM and target,
+                e.g., the ``envs`` of a ``MarioVectorEnv``
+            cells (list): one cell per environment, or None to ``select``
+            rng (np.random.Generator): the random number generator to select
+                cells with
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the stacked observations of the restored states
+            - (list) the info of every restored state
+            - (list) the restored cells
+
+        """
+        if cells is None:
+            cells = self.select(len(envs), rng)
+        elif len(cells) != len(envs):
+            raise ValueError('cells must have one cell per env')
+        observations = []
+        infos = []
+        for env, cell in zip(envs, cells):
+            observation, info = self.restore(env, cell)
+            observations.append(observation.copy())
+            record = info.get('record')
+            infos.append(info if record is None else dict(record=record.copy()))
+        return np.stack(observations), infos, cells
+
+
+# explicitly define the outward facing API of this module
+__all__ = [CellArchive.__name__, cell_of.__name__, 'EVICTION_POLICIES']
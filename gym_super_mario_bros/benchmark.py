@@ -0,0 +1,745 @@
+"""Micro-benchmarks for the per-step hot paths of the Mario environments."""
+from importlib import metadata
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import gymnasium as gym
+import numpy as np
+from nes_py import NESEnv
+
+from ._observations import area_weights
+from ._ram import RamTable
+from ._ram import decode_digits
+from ._registration import _REGISTRATION_MODE_VARIABLE
+from ._registration import make
+from ._trace import advance
+from .codec import TraceCodec
+from .tasks import TASKS
+from .tasks import task_for_config
+from .shared_vector_env import MarioSharedMemoryVectorEnv
+from .vector_env import MarioVectorEnv
+
+
+try:  # the wrapper baseline uses OpenCV like common preprocessing wrappers
+    import cv2
+except ImportError:  # pragma: no cover
+    cv2 = None
+
+
+# the environments of the benchmark suite: the base ID of every registered
+# game family and representative single-stage IDs
+SUITE_ENV_IDS = (
+    'SuperMarioBros-v0',
+    'SuperMarioBros2-v0',
+    'SuperMarioBros2USA-v0',
+    'SuperMarioBros3-v0',
+    'SuperMarioBros-1-1-v0',
+    'SuperMarioBros-4-2-v0',
+    'SuperMarioBros2-1-1-v0',
+    'SuperMarioBros2USA-1-1-v0',
+    'SuperMarioBros3-1-1-v0',
+)
+
+
+# the suite metrics where a larger value is slower
+_SUITE_COST_METRICS = ('construction_ms', 'reset_us', 'step_us', 'get_info_us', 'get_reward_us')
+
+
+# the reset latency in microseconds that restoring the reset template must
+# stay below; find_regressions reports suite resets above it
+RESET_LATENCY_TARGET_US = 1000
+
+
+# the environments of the trace codec benchmark, one per game engine
+CODEC_ENV_IDS = (
+    'SuperMarioBros-1-1-v0',
+    'SuperMarioBros2USA-1-1-v0',
+    'SuperMarioBros3-1-1-v0',
+)
+
+
+# the (address, length) of the SMB1 score, time, and coin counters
+_SMB1_COUNTERS = ((0x07de, 6), (0x07f8, 3), (0x07ed, 2))
+
+
+def _nanoseconds_per_call(function, iterations):
+    """Return the mean wall-clock nanoseconds of calling function."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def _random_digit_ram(count, seed):
+    """Return ``count`` random RAM buffers holding decimal digit counters."""
+    random = np.random.RandomState(seed)
+    return random.randint(0, 10, size=(count, 0x800)).astype(np.uint8)
+
+
+def benchmark_digit_decoding(iterations=10000, batch_size=256, seed=0):
+    """
+    Compare string-join and arithmetic decoding of the SMB1 step counters.
+
+    Args:
+        iterations (int): the number of simulated steps to time
+        batch_size (int): the number of RAM buffers to decode per batch
+        seed (int): the seed for the random digit RAM contents
+
+    Returns (dict):
+        nanoseconds per step spent decoding score, time, and coins with the
+        legacy string join, the arithmetic decoder, the per-step RAM table
+        gather that decodes every counter at once, and the batched decoder
+
+    """
+    rams = _random_digit_ram(batch_size, seed)
+    ram = rams[0]
+    table = RamTable(**{
+        'counter_{}'.format(index): (address, length, 'digits')
+        for index, (address, length) in enumerate(_SMB1_COUNTERS)
+    })
+
+    def string_join():
+        for address, length in _SMB1_COUNTERS:
+            int(''.join(map(str, map(int, ram[address:address + length]))))
+
+    def arithmetic():
+        for address, length in _SMB1_COUNTERS:
+            int(decode_digits(ram[address:address + length]))
+
+    def gathered():
+        table.gather(ram)
+
+    def batched():
+        for address, length in _SMB1_COUNTERS:
+            decode_digits(rams[:, address:address + length])
+
+    string_join_ns = _nanoseconds_per_call(string_join, iterations)
+    arithmetic_ns = _nanoseconds_per_call(arithmetic, iterations)
+    table_ns = _nanoseconds_per_call(gathered, iterations)
+    batch_iterations = max(1, iterations // batch_size)
+    batched_ns = _nanoseconds_per_call(batched, batch_iterations) / batch_size
+    return dict(
+        iterations=iterations,
+        batch_size=batch_size,
+        string_join_ns_per_step=string_join_ns,
+        arithmetic_ns_per_step=arithmetic_ns,
+        table_ns_per_step=table_ns,
+        batched_ns_per_step=batched_ns,
+        arithmetic_saving_ns_per_step=string_join_ns - arithmetic_ns,
+        table_saving_ns_per_step=string_join_ns - table_ns,
+        batched_saving_ns_per_step=string_join_ns - batched_ns,
+    )
+
+
+def _scan_task_config(game, version, world, stage):
+    """Return the task for a configuration with the legacy linear scan."""
+    for task in TASKS:
+        if task.alias_of is not None:
+            continue
+        if task.game != game:
+            continue
+        if task.version != version:
+            continue
+        if task.world != world or task.stage != stage:
+            continue
+        return task
+    raise KeyError('no Mario task matches the requested configuration')
+
+
+def benchmark_task_lookup(iterations=10000):
+    """
+    Compare the per-step cost of resolving task metadata for info.
+
+    The lookups resolve the last non-alias task in ``TASKS``, the worst case
+    for a linear scan.
+
+    Args:
+        iterations (int): the number of simulated steps to time
+
+    Returns (dict):
+        nanoseconds per step spent on the legacy linear scan, the indexed
+        ``task_for_config``, and reading the task cached by environments
+
+    """
+    task = [task for task in TASKS if task.alias_of is None][-1]
+    config = (task.game, task.version, task.world, task.stage)
+
+    class _Env:
+        _task = task
+
+    env = _Env()
+    scan_ns = _nanoseconds_per_call(lambda: _scan_task_config(*config), iterations)
+    index_ns = _nanoseconds_per_call(lambda: task_for_config(*config), iterations)
+    cached_ns = _nanoseconds_per_call(lambda: env._task, iterations)
+    return dict(
+        iterations=iterations,
+        task_id=task.task_id,
+        scan_ns_per_step=scan_ns,
+        index_ns_per_step=index_ns,
+        cached_ns_per_step=cached_ns,
+        cached_saving_ns_per_step=scan_ns - cached_ns,
+    )
+
+
+def _frames_per_second(env, actions):
+    """Return the frames per second of stepping a vector env with actions."""
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    elapsed = time.perf_counter() - start
+    return actions.size / elapsed
+
+
+def benchmark_vector_throughput(
+    env_id='SuperMarioBros-1-1-v0',
+    num_envs=4,
+    steps=500,
+    seed=0,
+):
+    """
+    Compare the stepping throughput of the vector environments.
+
+    Construction time is excluded; every environment steps through the same
+    random controller bytes.
+
+    Args:
+        env_id (str): the registered ID of every sub-environment
+        num_envs (int): the number of sub-environments
+        steps (int): the number of batched steps to time
+        seed (int): the seed for the random actions
+
+    Returns (dict):
+        frames per second of Gymnasium's AsyncVectorEnv, the shared memory
+        process pool, and the in-process vector environment
+
+    """
+    actions = np.random.RandomState(seed).randint(0, 256, size=(steps, num_envs))
+    results = dict(env_id=env_id, num_envs=num_envs, steps=steps)
+    constructors = dict(
+        async_fps=lambda: gym.vector.AsyncVectorEnv(
+            [lambda: make(env_id)] * num_envs
+        ),
+        shared_memory_fps=lambda: MarioSharedMemoryVectorEnv(env_id, num_envs),
+        in_process_fps=lambda: MarioVectorEnv(env_id, num_envs),
+    )
+    for name, constructor in constructors.items():
+        env = constructor()
+        try:
+            results[name] = _frames_per_second(env, actions)
+        finally:
+            env.close()
+    results['shared_memory_speedup'] = results['shared_memory_fps'] / results['async_fps']
+    return results
+
+
+def _wrapper_step(env, action, frameskip):
+    """Step like a Python frame-skip wrapper with a max-pool of two screens."""
+    total = 0.0
+    previous = None
+    for frame in range(frameskip):
+        if frame == frameskip - 1:
+            previous = env.screen.copy()
+        screen, reward, terminated, truncated, info = env.step(action)
+        total += reward
+        if terminated or truncated:
+            break
+    if previous is None:
+        return screen, total, terminated, truncated, info
+    return np.maximum(previous, screen), total, terminated, truncated, info
+
+
+def benchmark_frameskip(env_id='SuperMarioBros-1-1-v0', frameskip=4, steps=200, seed=0):
+    """
+    Compare a Python frame-skip wrapper with the native frameskip option.
+
+    Both variants max-pool the last two screens of every step and replay the
+    same random controller bytes, resetting when an episode ends.
+
+    Args:
+        env_id (str): the registered ID of the environment
+        frameskip (int): the number of frames per agent step
+        steps (int): the number of agent steps to time
+        seed (int): the seed for the random actions
+
+    Returns (dict):
+        microseconds per agent step of the wrapper and the native option
+
+    """
+    actions = np.random.RandomState(seed).randint(0, 256, size=steps).tolist()
+    results = dict(env_id=env_id, frameskip=frameskip, steps=steps)
+    variants = dict(
+        wrapper_us_per_step=(
+            dict(),
+            lambda env, action: _wrapper_step(env, action, frameskip),
+        ),
+        native_us_per_step=(
+            dict(frameskip=frameskip, max_pool=True),
+            lambda env, action: env.step(action),
+        ),
+    )
+    for name, (kwargs, step) in variants.items():
+        env = make(env_id, **kwargs).unwrapped
+        try:
+            env.reset(seed=seed)
+            start = time.perf_counter()
+            for action in actions:
+                _, _, terminated, truncated, _ = step(env, action)
+                if terminated or truncated:
+                    env.reset()
+            results[name] = (time.perf_counter() - start) * 1e6 / steps
+        finally:
+            env.close()
+    results['native_speedup'] = results['wrapper_us_per_step'] / results['native_us_per_step']
+    return results
+
+
+def _wrapper_gray84(screen, rows, columns):
+    """Convert an RGB screen to 84x84 grayscale like a wrapper would."""
+    if cv2 is not None:
+        gray = cv2.cvtColor(screen, cv2.COLOR_RGB2GRAY)
+        return cv2.resize(gray, (84, 84), interpolation=cv2.INTER_AREA)
+    gray = screen.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return np.rint(rows @ gray @ columns).astype(np.uint8)
+
+
+def benchmark_observation(env_id='SuperMarioBros-1-1-v0', iterations=1000, seed=0):
+    """
+    Compare the 'gray84' observation type with a grayscale resize wrapper.
+
+    The wrapper converts the RGB screen with OpenCV when it is installed and
+    with NumPy otherwise; both variants observe the same emulator frame.
+
+    Args:
+        env_id (str): the registered ID of the environment
+        iterations (int): the number of observations to time
+        seed (int): the seed for the random actions that set up the frame
+
+    Returns (dict):
+        nanoseconds per observation of the wrapper and the native buffer
+
+    """
+    env = make(env_id, obs_type='gray84').unwrapped
+    try:
+        env.reset(seed=seed)
+        for action in np.random.RandomState(seed).randint(0, 256, size=60).tolist():
+            _, _, terminated, truncated, _ = env.step(action)
+            if terminated or truncated:
+                env.reset()
+        rows = area_weights(240, 84)
+        columns = area_weights(256, 84).T
+        wrapper_ns = _nanoseconds_per_call(
+            lambda: _wrapper_gray84(env.screen, rows, columns),
+            iterations,
+        )
+        native_ns = _nanoseconds_per_call(env._observer, iterations)
+    finally:
+        env.close()
+    return dict(
+        env_id=env_id,
+        iterations=iterations,
+        wrapper_backend='opencv' if cv2 is not None else 'numpy',
+        wrapper_ns_per_observation=wrapper_ns,
+        native_ns_per_observation=native_ns,
+        native_speedup=wrapper_ns / native_ns,
+    )
+
+
+def benchmark_replay(env_id='SuperMarioBros-1-1-v0', steps=1000, seed=0):
+    """
+    Compare the steps per second of the ``step`` loop and trace replay.
+
+    Both variants run the same random controller bytes, resetting when an
+    episode ends; replay skips the reward, info, and observation code.
+
+    Args:
+        env_id (str): the registered ID of the environment
+        steps (int): the number of steps to time
+        seed (int): the seed for the random actions
+
+    Returns (dict):
+        steps per second of the step loop and of replay
+
+    """
+    actions = np.random.RandomState(seed).randint(0, 256, size=steps).tolist()
+    results = dict(env_id=env_id, steps=steps)
+    variants = dict(
+        step_steps_per_second=lambda env, action: any(env.step(action)[2:4]),
+        replay_steps_per_second=lambda env, action: advance(env, action, False)[0],
+    )
+    for name, step in variants.items():
+        env = make(env_id).unwrapped
+        try:
+            env.reset(seed=seed)
+            start = time.perf_counter()
+            for action in actions:
+                if step(env, action):
+                    env.reset()
+            results[name] = steps / (time.perf_counter() - start)
+        finally:
+            env.close()
+    results['replay_speedup'] = results['replay_steps_per_second'] / results['step_steps_per_second']
+    return results
+
+
+def benchmark_reset(env_id='SuperMarioBros-1-1-v0', iterations=1000, seed=0):
+    """
+    Compare the latency of full resets and resets from the reset template.
+
+    The full path runs the nes-py reset hooks and builds the info from RAM;
+    the fast path is the environment's ``reset``, which restores the
+    template captured by its first reset. Both include the observation.
+
+    Args:
+        env_id (str): the registered ID of the environment
+        iterations (int): the number of resets to time per path
+        seed (int): the seed passed to every reset
+
+    Returns (dict):
+        microseconds per reset of both paths, the speedup, and whether the
+        fast path is within ``RESET_LATENCY_TARGET_US``
+
+    """
+    env = make(env_id).unwrapped
+    try:
+        env.reset(seed=seed)
+
+        def full_reset():
+            NESEnv.reset(env, seed=seed)
+            env._observer()
+
+        full_us = _nanoseconds_per_call(full_reset, iterations) / 1e3
+        fast_us = _nanoseconds_per_call(lambda: env.reset(seed=seed), iterations) / 1e3
+    finally:
+        env.close()
+    return dict(
+        env_id=env_id,
+        iterations=iterations,
+        full_reset_us=full_us,
+        fast_reset_us=fast_us,
+        reset_speedup=full_us / fast_us,
+        target_us=RESET_LATENCY_TARGET_US,
+        within_target=fast_us < RESET_LATENCY_TARGET_US,
+    )
+
+
+def benchmark_trace_codec(env_ids=CODEC_ENV_IDS, steps=(0, 50, 200), repeats=20, seed=0):
+    """
+    Measure the size and speed of encoded states after random steps.
+
+    A codec decodes the states it has seen from its snapshot cache without
+    emulating a frame; a codec without a cache re-simulates every step since
+    the reset, so its decode time grows linearly with the step count and
+    ``replay_decode_us_per_step`` reports the slope.
+
+    Args:
+        env_ids (iterable): the registered IDs of the environments
+        steps (iterable): the numbers of random steps after a reset to encode
+            a state at
+        repeats (int): the number of encodes and decodes to time per state
+        seed (int): the seed for the random actions
+
+    Returns (dict):
+        for each environment and step count, the bytes per encoded state,
+        the microseconds to encode it, to decode it from the cache, and to
+        decode it by replay, and the replay microseconds per encoded step
+
+    """
+    rng = np.random.RandomState(seed)
+    results = dict(repeats=repeats, environments={})
+    for env_id in env_ids:
+        env = make(env_id).unwrapped
+        try:
+            codec = TraceCodec(env)
+            replay = TraceCodec(env, cache_size=0)
+            states = []
+            for count in steps:
+                env.reset(seed=seed)
+                actions = []
+                for action in rng.randint(0, 256, size=count).tolist():
+                    actions.append(action)
+                    if env.step(action)[2]:
+                        break
+                data = codec.encode(env, actions)
+                replay_decode_us = _nanoseconds_per_call(lambda: replay.decode(data, env), repeats) / 1e3
+                states.append(dict(
+                    steps=len(actions),
+                    bytes=len(data),
+                    encode_us=_nanoseconds_per_call(lambda: codec.encode(env, actions), repeats) / 1e3,
+                    cached_decode_us=_nanoseconds_per_call(lambda: codec.decode(data, env), repeats) / 1e3,
+                    replay_decode_us=replay_decode_us,
+                    replay_decode_us_per_step=replay_decode_us / len(actions) if actions else 0.0,
+                ))
+            results['environments'][env_id] = states
+        finally:
+            env.close()
+    return results
+
+
+def benchmark_clone_state(env_ids=CODEC_ENV_IDS, iterations=1000, steps=50, seed=0):
+    """
+    Measure clone and restore round trips of ``clone_state`` handles.
+
+    Each environment takes random steps from a reset to reach a state in
+    play, then times ``clone_state``, ``restore_state``, and both together,
+    the cost a tree search pays to expand one node.
+
+    Args:
+        env_ids (iterable): the registered IDs of the environments
+        iterations (int): the number of calls to time per operation
+        steps (int): the most random steps to take before cloning
+        seed (int): the seed for the reset and the random actions
+
+    Returns (dict):
+        for each environment, the microseconds per clone, restore, and
+        round trip, and the round trips per second
+
+    """
+    rng = np.random.RandomState(seed)
+    results = dict(iterations=iterations, environments={})
+    for env_id in env_ids:
+        env = make(env_id).unwrapped
+        try:
+            env.reset(seed=seed)
+            for action in rng.randint(0, 256, size=steps).tolist():
+                if env.step(action)[2]:
+                    break
+            handle = env.clone_state()
+            round_trip_us = _nanoseconds_per_call(lambda: env.restore_state(env.clone_state()), iterations) / 1e3
+            results['environments'][env_id] = dict(
+                clone_us=_nanoseconds_per_call(env.clone_state, iterations) / 1e3,
+                restore_us=_nanoseconds_per_call(lambda: env.restore_state(handle), iterations) / 1e3,
+                round_trip_us=round_trip_us,
+                round_trips_per_second=1e6 / round_trip_us,
+            )
+        finally:
+            env.close()
+    return results
+
+
+# a script that times importing the package after Gymnasium in a fresh process
+_IMPORT_SCRIPT = """
+import json, sys, time
+import gymnasium
+start = time.perf_counter()
+import gym_super_mario_bros
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(
+    import_ms=elapsed * 1e3,
+    registered=sum(env_id.startswith('SuperMarioBros') for env_id in gymnasium.registry),
+    modules=sorted(name for name in sys.modules if name.startswith(('gym_super_mario_bros', 'nes_py'))),
+)))
+"""
+
+
+def _import_package(mode):
+    """Return the import measurement of a fresh process in a registration mode."""
+    env = dict(os.environ, **{_REGISTRATION_MODE_VARIABLE: mode})
+    output = subprocess.run(
+        [sys.executable, '-c', _IMPORT_SCRIPT],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(output)
+
+
+def benchmark_import_time(repeats=5):
+    """
+    Compare the cost of importing the package with eager and lazy registration.
+
+    Every import runs in a fresh interpreter that has already imported
+    Gymnasium, so the times only cover this package.
+
+    Args:
+        repeats (int): the number of fresh imports per mode; the fastest
+            import of each mode is reported
+
+    Returns (dict):
+        milliseconds to import the package in each registration mode, the
+        number of Mario IDs registered at import, and the package and
+        nes_py modules loaded by a lazy import
+
+    """
+    results = dict(repeats=repeats)
+    for mode in ('eager', 'lazy'):
+        imports = [_import_package(mode) for _ in range(repeats)]
+        results[mode + '_import_ms'] = min(result['import_ms'] for result in imports)
+        results[mode + '_registered_ids'] = imports[0]['registered']
+        results[mode + '_modules'] = imports[0]['modules']
+    results['lazy_saving_ms'] = results['eager_import_ms'] - results['lazy_import_ms']
+    return results
+
+
+def _version(distribution):
+    """Return the installed version of a distribution, or None."""
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def benchmark_env(env_id, steps=500, repeats=3, seed=0):
+    """
+    Measure the construction, reset, step, info, and reward costs of an env.
+
+    Construction is timed with the snapshot cache disabled so that every
+    repeat plays the start screen. The step loop resets when an episode
+    ends but only times the steps. The info and reward hooks are timed on
+    the state the step loop ends in.
+
+    Args:
+        env_id (str): the registered ID of the environment
+        steps (int): the number of steps to time
+        repeats (int): the number of constructions to time, and the number
+            of resets per step
+        seed (int): the seed for the random actions
+
+    Returns (dict):
+        the fastest construction in milliseconds, mean microseconds per
+        reset, step, info, and reward call, and steps per second
+
+    """
+    actions = np.random.RandomState(seed).randint(0, 256, size=steps).tolist()
+    construction = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        env = make(env_id).unwrapped
+        construction.append(time.perf_counter() - start)
+        env.close()
+    env = make(env_id).unwrapped
+    try:
+        env.reset(seed=seed)
+        iterations = repeats * 10
+        start = time.perf_counter()
+        for _ in range(iterations):
+            env.reset()
+        reset = (time.perf_counter() - start) / iterations
+        elapsed = 0.0
+        for action in actions:
+            start = time.perf_counter()
+            _, _, terminated, truncated, _ = env.step(action)
+            elapsed += time.perf_counter() - start
+            if terminated or truncated:
+                env.reset()
+        get_info = _nanoseconds_per_call(env._get_info, steps)
+        get_reward = _nanoseconds_per_call(env._get_reward, steps)
+        # the reward hook leaves the RAM snapshot of the last call behind
+        env._ram_snapshot = None
+    finally:
+        env.close()
+    return dict(
+        construction_ms=min(construction) * 1e3,
+        reset_us=reset * 1e6,
+        step_us=elapsed * 1e6 / steps,
+        steps_per_second=steps / elapsed,
+        get_info_us=get_info / 1e3,
+        get_reward_us=get_reward / 1e3,
+    )
+
+
+def benchmark_suite(env_ids=SUITE_ENV_IDS, steps=500, repeats=3, seed=0):
+    """
+    Run ``benchmark_env`` on several environments.
+
+    Args:
+        env_ids (iterable): the registered IDs of the environments
+        steps (int): the number of steps to time per environment
+        repeats (int): the number of constructions to time per environment
+        seed (int): the seed for the random actions
+
+    Returns (dict):
+        the versions and platform the suite ran on, its settings, and the
+        results of each environment keyed by ID, ready to dump as JSON
+
+    """
+    return dict(
+        versions=dict(
+            gym_super_mario_bros=_version('gym_super_mario_bros'),
+            nes_py=_version('nes-py'),
+            gymnasium=gym.__version__,
+            numpy=np.__version__,
+            python=platform.python_version(),
+        ),
+        platform=platform.platform(),
+        settings=dict(steps=steps, repeats=repeats, seed=seed),
+        results={
+            env_id: benchmark_env(env_id, steps=steps, repeats=repeats, seed=seed)
+            for env_id in env_ids
+        },
+    )
+
+
+def find_regressions(baseline, current, tolerance=0.2, reset_budget_us=RESET_LATENCY_TARGET_US):
+    """
+    Return the suite costs that grew by more than a tolerance or a budget.
+
+    Args:
+        baseline (dict): a result of ``benchmark_suite`` to compare against,
+            or None to only check the reset budget
+        current (dict): a result of ``benchmark_suite`` to check
+        tolerance (float): the allowed relative growth of each cost
+        reset_budget_us (float): the most microseconds a reset may take, or
+            None to not check resets against a budget
+
+    Returns (list):
+        a dictionary with the environment ID, metric, both values, and their
+        ratio for every cost of a shared environment above the tolerance,
+        and with the environment ID, 'reset_us', the budget, the reset
+        time, and their ratio for every reset above the budget
+
+    """
+    regressions = []
+    for env_id, results in current['results'].items():
+        reset_us = results.get('reset_us')
+        if reset_budget_us is not None and reset_us is not None and reset_us > reset_budget_us:
+            regressions.append(dict(
+                env_id=env_id,
+                metric='reset_us',
+                budget=reset_budget_us,
+                current=reset_us,
+                ratio=reset_us / reset_budget_us,
+            ))
+        if baseline is None:
+            continue
+        expected = baseline['results'].get(env_id)
+        if expected is None:
+            continue
+        for metric in _SUITE_COST_METRICS:
+            if metric not in results or not expected.get(metric):
+                continue
+            ratio = results[metric] / expected[metric]
+            if ratio > 1 + tolerance:
+                regressions.append(dict(
+                    env_id=env_id,
+                    metric=metric,
+                    baseline=expected[metric],
+                    current=results[metric],
+                    ratio=ratio,
+                ))
+    return regressions
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    benchmark_clone_state.__name__,
+    benchmark_digit_decoding.__name__,
+    benchmark_env.__name__,
+    benchmark_frameskip.__name__,
+    benchmark_import_time.__name__,
+    benchmark_observation.__name__,
+    benchmark_replay.__name__,
+    benchmark_reset.__name__,
+    benchmark_trace_codec.__name__,
+    benchmark_suite.__name__,
+    benchmark_task_lookup.__name__,
+    benchmark_vector_throughput.__name__,
+    find_regressions.__name__,
+    'CODEC_ENV_IDS',
+    'RESET_LATENCY_TARGET_US',
+    'SUITE_ENV_IDS',
+]
@@ -0,0 +1,174 @@
+"""A compact byte encoding of emulator states as controller traces."""
+from collections import OrderedDict
+import hashlib
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from ._fast_reset import restore_reset
+from ._snapshots import capture_snapshot
+from ._snapshots import restore_snapshot
+from ._snapshots import start_snapshot_key
+from ._trace import advance
+
+
+# the header of an encoded state: the version, start state, and step count
+_HEADER = struct.Struct('<BHI')
+# the version of the encoded state format
+_FORMAT_VERSION = 1
+# the length of the SHA-1 digest of the RAM of an encoded state
+_DIGEST_SIZE = 20
+
+
+def _ram_digest(env):
+    """Return the SHA-1 digest of an environment's RAM."""
+    return hashlib.sha1(env.ram.tobytes()).digest()
+
+
+def _codec_key(env):
+    """Return the configuration that decoding an environment's states needs."""
+    return start_snapshot_key(env), env._frameskip, env._start_pool_size, env._start_noops
+
+
+class TraceCodec:
+    """Encode states as compressed controller traces from a start state."""
+
+    def __init__(self, env, level=1, cache_size=1024):
+        """
+        Initialize a new codec for the states of an environment.
+
+        ``nes-py`` emulator snapshots are native objects without a byte
+        representation, so a state is encoded as the trace that reached it:
+        the start state, the controller bytes of every step since the reset,
+        and the Python-side reward baselines, compressed with zlib, with a
+        digest of the RAM that decoding checks. Only states reached by
+        stepping from a reset can be encoded; states restored with
+        ``restore_state`` or from a ``CellArchive`` have no trace.
+
+        Decoding keeps the emulator snapshot of every state it encodes or
+        decodes in memory, up to ``cache_size`` states, and restores those
+        without emulating a frame. Other states re-simulate their trace
+        without the reward, info, and observation code, which costs time
+        linear in the steps since the reset, so the codec is for storing
+        and sending states rather than for restoring them on every reset.
+
+        Args:
+            env (gym.Env): a Mario environment; states decode into
+                environments of the same ROM, target, frame skip, and start
+                pool
+            level (int): the zlib compression level from 0 to 9
+            cache_size (int): the most emulator snapshots to keep in memory
+
+        Returns:
+            None
+
+        """
+        for name, value in (('level', level), ('cache_size', cache_size)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError('{} must be of type: int'.format(name))
+        if not 0 <= level <= 9:
+            raise ValueError('level must be in [0, 9]')
+        if cache_size < 0:
+            raise ValueError('cache_size must be non-negative')
+        env = env.unwrapped
+        self.level = level
+        self.cache_size = cache_size
+        self._key = _codec_key(env)
+        # the snapshot of every cached state, from least to most recently used
+        self._snapshots = OrderedDict()
+
+    def _check_env(self, env):
+        """Raise an error if env does not match the codec's environment."""
+        if _codec_key(env) != self._key:
+            raise ValueError('env does not match the ROM, target, frameskip, and start pool of the codec')
+
+    def _cache(self, data, env):
+        """Keep the snapshot of an environment's state under its encoding."""
+        if not self.cache_size:
+            return
+        self._snapshots[data] = capture_snapshot(env), env.start_index, env.done
+        self._snapshots.move_to_end(data)
+        if len(self._snapshots) > self.cache_size:
+            self._snapshots.popitem(last=False)
+
+    def encode(self, env, actions):
+        """
+        Encode the current state of an environment.
+
+        Args:
+            env (gym.Env): a Mario environment of the codec
+            actions (iterable): the controller byte of every step since the
+                environment's last reset
+
+        Returns (bytes):
+            the compressed encoding of the state
+
+        """
+        env = env.unwrapped
+        self._check_env(env)
+        actions = np.asarray(actions)
+        if actions.ndim != 1 or not (actions.size == 0 or np.issubdtype(actions.dtype, np.integer)):
+            raise TypeError('actions must be a 1D sequence of integers')
+        if actions.size and not (0 <= actions.min() and actions.max() <= 255):
+            raise ValueError('actions must be controller bytes in [0, 255]')
+        attributes = {name: getattr(env, name) for name in env._SNAPSHOT_ATTRIBUTES}
+        payload = b''.join((
+            _HEADER.pack(_FORMAT_VERSION, env.start_index, actions.size),
+            actions.astype(np.uint8).tobytes(),
+            _ram_digest(env),
+            json.dumps(attributes, separators=(',', ':'), default=lambda value: value.item()).encode(),
+        ))
+        data = zlib.compress(payload, self.level)
+        self._cache(data, env)
+        return data
+
+    def decode(self, data, env):
+        """
+        Restore an encoded state into an environment.
+
+        Args:
+            data (bytes): a state returned by ``encode``
+            env (gym.Env): a Mario environment of the codec
+
+        Returns:
+            None
+
+        """
+        env = env.unwrapped
+        self._check_env(env)
+        cached = self._snapshots.get(data)
+        if cached is not None:
+            # restore the state with the bookkeeping of restore_reset
+            self._snapshots.move_to_end(data)
+            snapshot, env.start_index, done = cached
+            restore_snapshot(env, snapshot)
+            env._reset_reward_components()
+            env.hidden_frames.start_episode()
+            env._ram_snapshot = None
+            env.done = done
+            return
+        payload = zlib.decompress(data)
+        version, start_index, steps = _HEADER.unpack_from(payload)
+        if version != _FORMAT_VERSION:
+            raise ValueError('unsupported encoded state version: {}'.format(version))
+        offset = _HEADER.size
+        actions = np.frombuffer(payload, dtype=np.uint8, count=steps, offset=offset)
+        offset += steps
+        digest = payload[offset:offset + _DIGEST_SIZE]
+        attributes = json.loads(payload[offset + _DIGEST_SIZE:])
+        if env._reset_templates is None:
+            env.reset()
+        restore_reset(env, env._reset_templates, index=start_index)
+        for action in actions.tolist():
+            advance(env, action, False)
+        if _ram_digest(env) != digest:
+            raise RuntimeError('decoded state differs from the encoded state')
+        for name, value in attributes.items():
+            setattr(env, name, tuple(value) if isinstance(value, list) else value)
+        self._cache(data, env)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [TraceCodec.__name__]
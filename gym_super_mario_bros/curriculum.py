@@ -0,0 +1,305 @@
+"""Curricula that reassign retargetable environments between tasks."""
+import gymnasium as gym
+import numpy as np
+
+from .tasks import MarioTask
+from .tasks import all_tasks
+from .tasks import task_for_env_id
+
+
+# the built-in task weightings of curriculum samplers
+WEIGHTINGS = ('uniform', 'failure', 'return')
+
+
+class CurriculumSampler:
+    """Per-task success and return statistics and weighted task sampling."""
+
+    def __init__(
+        self,
+        tasks=None,
+        weighting='failure',
+        temperature=1.0,
+        exploration=0.1,
+        decay=0.9,
+        seed=None,
+    ):
+        """
+        Initialize a new curriculum sampler with no recorded episodes.
+
+        Args:
+            tasks (iterable): the single-stage tasks or environment IDs to
+                sample, by default every single-stage task of the train split
+            weighting (str, callable): 'uniform' to weight every task the
+                same, 'failure' to weight tasks by one minus their moving
+                average success rate, 'return' to weight tasks by how far
+                their moving average return is below the best task's, or a
+                function of the sampler that returns one non-negative weight
+                per task
+            temperature (float): the positive temperature that the weights
+                are raised to the inverse of; lower values focus on the
+                heaviest tasks
+            exploration (float): the fraction of probability in [0, 1]
+                spread uniformly over the tasks
+            decay (float): the weight in [0, 1) of the previous moving
+                averages when an episode of a task is recorded
+            seed (int): the seed of the sampler's random number generator
+
+        Returns:
+            None
+
+        """
+        if tasks is None:
+            tasks = all_tasks(split='train', single_stage=True)
+        tasks = tuple(task if isinstance(task, MarioTask) else task_for_env_id(task) for task in tasks)
+        if not tasks:
+            raise ValueError('tasks must not be empty')
+        if not all(task.single_stage for task in tasks):
+            raise ValueError('tasks must be single-stage tasks')
+        if not (callable(weighting) or weighting in WEIGHTINGS):
+            raise ValueError('weighting must be callable or one of: {}'.format(', '.join(WEIGHTINGS)))
+        if not isinstance(temperature, (int, float)) or temperature <= 0:
+            raise ValueError('temperature must be a positive number')
+        if not isinstance(exploration, (int, float)) or not 0 <= exploration <= 1:
+            raise ValueError('exploration must be in [0, 1]')
+        if not isinstance(decay, (int, float)) or not 0 <= decay < 1:
+            raise ValueError('decay must be in [0, 1)')
+        self.tasks = tasks
+        self.weighting = weighting
+        self.temperature = float(temperature)
+        self.exploration = float(exploration)
+        self.decay = float(decay)
+        self.rng = np.random.default_rng(seed)
+        self._indices = {task.env_id: index for index, task in enumerate(tasks)}
+        # the indices of the tasks that each (game, version) can switch to
+        groups = {}
+        for index, task in enumerate(tasks):
+            groups.setdefault((task.game, task.version), []).append(index)
+        self._groups = {key: np.array(indices) for key, indices in groups.items()}
+        # the per-task statistics of every recorded episode
+        count = len(tasks)
+        self.episodes = np.zeros(count, dtype=np.int64)
+        self.successes = np.zeros(count, dtype=np.int64)
+        self.return_sum = np.zeros(count, dtype=np.float64)
+        self.success_rate = np.zeros(count, dtype=np.float64)
+        self.mean_return = np.zeros(count, dtype=np.float64)
+
+    def __len__(self):
+        """Return the number of tasks of the sampler."""
+        return len(self.tasks)
+
+    def index(self, task):
+        """
+        Return the index of a task.
+
+        Args:
+            task (MarioTask, str): a task of the sampler or its environment ID
+
+        Returns (int):
+            the index of the task in ``tasks`` and the statistics arrays
+
+        """
+        if isinstance(task, MarioTask):
+            task = task.env_id
+        try:
+            return self._indices[task]
+        except KeyError:
+            raise KeyError('task is not part of the curriculum: {!r}'.format(task)) from None
+
+    def update(self, task, success, episode_return):
+        """
+        Record an episode of a task.
+
+        Args:
+            task (int, MarioTask, str): the index, task, or environment ID
+            success (bool): whether the episode cleared the stage
+            episode_return (float): the summed reward of the episode
+
+        Returns:
+            None
+
+        """
+        if not isinstance(task, (int, np.integer)):
+            task = self.index(task)
+        decay = self.decay
+        self.episodes[task] += 1
+        self.successes[task] += bool(success)
+        self.return_sum[task] += episode_return
+        self.success_rate[task] = decay * self.success_rate[task] + (1 - decay) * bool(success)
+        self.mean_return[task] = decay * self.mean_return[task] + (1 - decay) * episode_return
+
+    def weights(self):
+        """
+        Return the unnormalized weight of every task.
+
+        Returns (np.ndarray):
+            the float64 weights of the tasks before the temperature
+
+        """
+        if callable(self.weighting):
+            weights = np.asarray(self.weighting(self), dtype=np.float64)
+            if weights.shape != (len(self),) or (weights < 0).any():
+                raise ValueError('weighting must return one non-negative weight per task')
+            return weights
+        if self.weighting == 'uniform':
+            return np.ones(len(self))
+        if self.weighting == 'failure':
+            return 1 - self.success_rate
+        return self.mean_return.max() - self.mean_return
+
+    def probabilities(self, game=None, version=None):
+        """
+        Return the probability of sampling every task.
+
+        Args:
+            game (str): the game that the sampled task must belong to, if any
+            version (int): the ROM version of the game, required with game
+
+        Returns (np.ndarray):
+            the float64 probability of each task, zero for the tasks of
+            other games
+
+        """
+        if game is None:
+            indices = np.arange(len(self))
+        else:
+            indices = self._groups.get((game, version))
+            if indices is None:
+                raise ValueError('no task of the curriculum belongs to {} v{}'.format(game, version))
+        weights = self.weights()[indices] ** (1 / self.temperature)
+        total = weights.sum()
+        uniform = np.full(len(indices), 1 / len(indices))
+        if total > 0:
+            weights = (1 - self.exploration) * weights / total + self.exploration * uniform
+        else:
+            weights = uniform
+        probabilities = np.zeros(len(self))
+        probabilities[indices] = weights
+        return probabilities
+
+    def sample(self, env=None, size=None):
+        """
+        Return the indices of tasks drawn with the curriculum weighting.
+
+        Args:
+            env (gym.Env): a Mario environment that the tasks must be able to
+                switch to, if any
+            size (int): the number of tasks to draw, or None for one
+
+        Returns (int, np.ndarray):
+            a task index, or an array of ``size`` task indices
+
+        """
+        if env is None:
+            probabilities = self.probabilities()
+        else:
+            task = env.unwrapped._task
+            probabilities = self.probabilities(task.game, task.version)
+        indices = self.rng.choice(len(self), size=size, p=probabilities)
+        return int(indices) if size is None else indices
+
+    def reset_options(self, index):
+        """
+        Return the reset options that switch an environment to a task.
+
+        Args:
+            index (int): the index of the task
+
+        Returns (dict):
+            the options of a ``reset`` call that switches to the task
+
+        """
+        task = self.tasks[index]
+        return dict(target=(task.world, task.stage))
+
+    def summary(self):
+        """
+        Return the statistics of every task.
+
+        Returns (list):
+            for each task, its ID, episodes, successes, mean return, and
+            moving average success rate and return
+
+        """
+        return [
+            dict(
+                task_id=task.task_id,
+                episodes=int(self.episodes[index]),
+                successes=int(self.successes[index]),
+                mean_return=float(self.return_sum[index] / max(self.episodes[index], 1)),
+                success_rate=float(self.success_rate[index]),
+                moving_return=float(self.mean_return[index]),
+            )
+            for index, task in enumerate(self.tasks)
+        ]
+
+
+class Curriculum(gym.Wrapper):
+    """An environment that switches to a sampled task on every reset."""
+
+    def __init__(self, env, sampler):
+        """
+        Initialize a new curriculum wrapper.
+
+        Args:
+            env (gym.Env): a Mario environment of a game in the curriculum
+            sampler (CurriculumSampler): the sampler that picks each task and
+                records each finished episode
+
+        Returns:
+            None
+
+        """
+        if not isinstance(sampler, CurriculumSampler):
+            raise TypeError('sampler must be of type: CurriculumSampler')
+        super().__init__(env)
+        self.sampler = sampler
+        # check that the sampler has a task that this environment can play
+        task = env.unwrapped._task
+        sampler.probabilities(task.game, task.version)
+        self.task_index = None
+        self._return = 0.0
+
+    def reset(self, *, seed=None, options=None):
+        """
+        Switch the environment to a sampled task and reset it.
+
+        Args:
+            seed (int): an optional random number seed for the next episode
+            options (dict): options passed to the environment; the sampled
+                'target' replaces any given one
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the initial observation
+            - (dict) the info of the initial frame
+
+        """
+        self.task_index = self.sampler.sample(self.env)
+        options = dict(options or {}, **self.sampler.reset_options(self.task_index))
+        self._return = 0.0
+        return self.env.reset(seed=seed, options=options)
+
+    def step(self, action):
+        """
+        Step the environment and record the episode when it ends.
+
+        Args:
+            action (int): the action to take
+
+        Returns:
+            the step result of the environment
+
+        """
+        if self.task_index is None:
+            raise ValueError('cannot step a curriculum before calling `reset`')
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        self._return += reward
+        if terminated or truncated:
+            record = info.get('record')
+            clear = info['clear'] if record is None else record['clear']
+            self.sampler.update(self.task_index, bool(clear), self._return)
+        return observation, reward, terminated, truncated, info
+
+
+# explicitly define the outward facing API of this module
+__all__ = [Curriculum.__name__, CurriculumSampler.__name__, 'WEIGHTINGS']
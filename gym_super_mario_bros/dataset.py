@@ -0,0 +1,246 @@
+"""Offline transition datasets stored as memory-mapped columnar shards."""
+import json
+import os
+
+import numpy as np
+
+from ._registration import make
+
+
+# the version of the dataset format
+_FORMAT_VERSION = 1
+# the name of the JSON manifest inside a dataset directory
+_MANIFEST = 'manifest.json'
+# the name of a shard directory inside a dataset directory
+_SHARD = 'shard-{:05d}'
+
+
+def _info_columns(dtype, prefix='info'):
+    """
+    Return the flattened columns of a structured info record dtype.
+
+    Args:
+        dtype (np.dtype): the structured dtype of an environment's info
+        prefix (str): the column name prefix of the fields
+
+    Returns (list):
+        a (column name, field path, dtype, shape) tuple per leaf field
+
+    """
+    columns = []
+    for name in dtype.names:
+        field = dtype.fields[name][0]
+        column = '{}.{}'.format(prefix, name)
+        if field.names is not None:
+            children = _info_columns(field, column)
+            columns.extend((child, (name,) + path, base, shape) for child, path, base, shape in children)
+        elif field.subdtype is not None:
+            columns.append((column, (name,), field.subdtype[0], field.subdtype[1]))
+        else:
+            columns.append((column, (name,), field, ()))
+    return columns
+
+
+def _field(record, path):
+    """Return the field of a structured record at a path of names."""
+    for name in path:
+        record = record[name]
+    return record
+
+
+def export_dataset(env_id, path, steps, shard_size=10000, policy=None, seed=None, **kwargs):
+    """
+    Collect transitions from an environment into a dataset directory.
+
+    Each shard directory holds one ``.npy`` file per column: the
+    observation before the action, the action, the reward, the terminated
+    and truncated flags, and every field of the info record after the step
+    as ``info.<field>``. The environment resets when an episode ends, so
+    the rows of an episode are contiguous. ``manifest.json`` lists the
+    environment, the column dtypes and shapes, and the rows of each shard.
+
+    Args:
+        env_id (str): the ID of the environment to create with ``make``
+        path (str): the dataset directory to create
+        steps (int): the number of transitions to collect
+        shard_size (int): the maximum number of rows per shard
+        policy (callable): an optional function from an observation to a
+            controller byte, uniformly random bytes if None
+        seed (int): the seed of the environment and the random policy
+        kwargs (dict): JSON serializable keyword arguments for the
+            environment, e.g., obs_type or frameskip
+
+    Returns (str):
+        the path of the dataset directory
+
+    """
+    for name, value in (('steps', steps), ('shard_size', shard_size)):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError('{} must be of type: int'.format(name))
+        if value < 1:
+            raise ValueError('{} must be positive'.format(name))
+    if 'info_mode' in kwargs:
+        raise ValueError('datasets always use info_mode=\'array\'')
+    manifest = dict(
+        format_version=_FORMAT_VERSION,
+        env_id=env_id,
+        kwargs=json.loads(json.dumps(kwargs)),
+        seed=seed,
+        columns={},
+        shards=[],
+    )
+    os.makedirs(path)
+    env = make(env_id, info_mode='array', **kwargs).unwrapped
+    try:
+        env.action_space.seed(seed)
+        space = env.observation_space
+        columns = [
+            ('observation', None, space.dtype, space.shape),
+            ('action', None, np.dtype(np.uint8), ()),
+            ('reward', None, np.dtype(np.float32), ()),
+            ('terminated', None, np.dtype(np.bool_), ()),
+            ('truncated', None, np.dtype(np.bool_), ()),
+        ] + _info_columns(env.info_dtype)
+        for name, _, dtype, shape in columns:
+            manifest['columns'][name] = dict(dtype=np.dtype(dtype).str, shape=list(shape))
+        observation, _ = env.reset(seed=seed)
+        for start in range(0, steps, shard_size):
+            rows = min(shard_size, steps - start)
+            shard = _SHARD.format(len(manifest['shards']))
+            os.mkdir(os.path.join(path, shard))
+            arrays = [
+                np.lib.format.open_memmap(
+                    os.path.join(path, shard, name + '.npy'),
+                    mode='w+', dtype=dtype, shape=(rows,) + tuple(shape),
+                )
+                for name, _, dtype, shape in columns
+            ]
+            observations, actions, rewards, terminated, truncated = arrays[:5]
+            info = list(zip((column[1] for column in columns[5:]), arrays[5:]))
+            for row in range(rows):
+                observations[row] = observation
+                action = env.action_space.sample() if policy is None else policy(observation)
+                observation, reward, done, cut, step_info = env.step(action)
+                actions[row] = action
+                rewards[row] = reward
+                terminated[row] = done
+                truncated[row] = cut
+                record = step_info['record']
+                for field, array in info:
+                    array[row] = _field(record, field)
+                if done or cut:
+                    observation, _ = env.reset()
+            for array in arrays:
+                array.flush()
+            manifest['shards'].append(dict(path=shard, rows=rows))
+    finally:
+        env.close()
+    with open(os.path.join(path, _MANIFEST), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return path
+
+
+class MarioDataset:
+    """Random-access reads of a dataset written by ``export_dataset``."""
+
+    def __init__(self, path):
+        """
+        Open a dataset directory without loading its shards into memory.
+
+        Args:
+            path (str): the dataset directory
+
+        Returns:
+            None
+
+        """
+        with open(os.path.join(path, _MANIFEST)) as manifest_file:
+            self.manifest = json.load(manifest_file)
+        if self.manifest['format_version'] != _FORMAT_VERSION:
+            raise ValueError('unsupported dataset format version')
+        self.path = path
+        rows = [shard['rows'] for shard in self.manifest['shards']]
+        self._offsets = np.concatenate([[0], np.cumsum(rows)])
+        # memory-mapped columns of each shard, opened on first read
+        self._shards = [{} for _ in rows]
+
+    @property
+    def columns(self):
+        """Return the names of the columns."""
+        return tuple(self.manifest['columns'])
+
+    def __len__(self):
+        """Return the number of transitions."""
+        return int(self._offsets[-1])
+
+    def column(self, shard, name):
+        """
+        Return the read-only memory map of one column of a shard.
+
+        Args:
+            shard (int): the index of the shard
+            name (str): the name of the column
+
+        Returns (np.memmap):
+            the column's rows in the shard
+
+        """
+        arrays = self._shards[shard]
+        if name not in arrays:
+            if name not in self.manifest['columns']:
+                raise KeyError('unknown column: {!r}'.format(name))
+            directory = self.manifest['shards'][shard]['path']
+            filename = os.path.join(self.path, directory, name + '.npy')
+            arrays[name] = np.load(filename, mmap_mode='r')
+        return arrays[name]
+
+    def batch(self, indices, columns=None):
+        """
+        Gather the rows at global indices from every shard they fall in.
+
+        Args:
+            indices (array-like): the global row indices to read
+            columns (iterable): the names of the columns to read, all if None
+
+        Returns (dict):
+            an array with one entry per index for every column
+
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError('dataset index out of range')
+        shards = np.searchsorted(self._offsets, indices, side='right') - 1
+        rows = indices - self._offsets[shards]
+        batch = {}
+        for name in self.columns if columns is None else columns:
+            spec = self.manifest['columns'].get(name)
+            if spec is None:
+                raise KeyError('unknown column: {!r}'.format(name))
+            shape = indices.shape + tuple(spec['shape'])
+            batch[name] = output = np.empty(shape, dtype=np.dtype(spec['dtype']))
+            for shard in np.unique(shards).tolist():
+                mask = shards == shard
+                output[mask] = self.column(shard, name)[rows[mask]]
+        return batch
+
+    def sample(self, batch_size, columns=None, rng=None):
+        """
+        Return a batch of uniformly random transitions.
+
+        Args:
+            batch_size (int): the number of transitions to sample
+            columns (iterable): the names of the columns to read, all if None
+            rng (np.random.Generator): the random generator, a new unseeded
+                one if None
+
+        Returns (dict):
+            an array with one entry per sampled transition for every column
+
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        return self.batch(rng.integers(0, len(self), size=batch_size), columns)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [export_dataset.__name__, MarioDataset.__name__]
@@ -0,0 +1,344 @@
+"""Compact episode recordings that replay deterministically from actions."""
+import hashlib
+import json
+import zipfile
+
+import gymnasium as gym
+import numpy as np
+
+from ._registration import make
+from ._snapshots import capture_snapshot
+from ._snapshots import restore_snapshot
+from ._target_bank import retarget
+from ._trace import advance
+from ._trace import materialized
+
+
+# the version of the recording file format
+_FORMAT_VERSION = 1
+# the name of the JSON header inside a recording file
+_HEADER = 'recording.json'
+# the names of the chunk members inside a recording file
+_ACTIONS = 'episode-{:05d}/actions-{:06d}.bin'
+_CHECKPOINT = 'episode-{:05d}/ram-{:06d}.bin'
+
+
+def _state_hash(env):
+    """Return the SHA-1 digest of an environment's RAM."""
+    return hashlib.sha1(env.ram.tobytes()).hexdigest()
+
+
+def _target(env):
+    """Return the (world, stage) target of an environment, None for full games."""
+    if env._target_world is None:
+        return None
+    return [env._target_world, env._target_stage]
+
+
+def _recorded_kwargs(spec):
+    """Return the JSON-safe constructor kwargs of an environment spec."""
+    kwargs = {key: value for key, value in spec.kwargs.items() if key != 'render_mode'}
+    try:
+        json.dumps(kwargs)
+    except TypeError:
+        raise ValueError('env kwargs must be JSON serializable to record') from None
+    return kwargs
+
+
+def _decoded_kwargs(kwargs):
+    """Return recorded kwargs with JSON lists restored to tuples."""
+    return {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in kwargs.items()
+    }
+
+
+def replay(env_id, actions, materialize=(), **kwargs):
+    """
+    Re-simulate a trace of controller bytes as fast as the emulator runs.
+
+    Steps skip the reward and info code and only the steps listed in
+    ``materialize`` copy their observation and build their info, so the
+    emulator state matches a live ``step`` loop with the same actions. The
+    reward diagnostics of materialized infos are not tracked. Replay stops
+    when the episode ends.
+
+    Args:
+        env_id (str): the ID of the environment to create with ``make``
+        actions (iterable): the controller byte of every step
+        materialize (iterable): the step numbers to return, where step 0 is
+            the reset and step ``t`` follows the ``t``-th action
+        kwargs (dict): keyword arguments for the environment
+
+    Returns (dict):
+        a mapping of each reached materialized step to its observation and
+        info
+
+    """
+    actions = np.asarray(actions)
+    if actions.ndim != 1 or not (actions.size == 0 or np.issubdtype(actions.dtype, np.integer)):
+        raise TypeError('actions must be a 1D sequence of integers')
+    if actions.size and not (0 <= actions.min() and actions.max() <= 255):
+        raise ValueError('actions must be controller bytes in [0, 255]')
+    materialize = frozenset(materialize)
+    env = make(env_id, **kwargs).unwrapped
+    try:
+        observation, info = env.reset()
+        frames = {}
+        if 0 in materialize:
+            frames[0] = materialized(observation, info)
+        for step, action in enumerate(actions.tolist(), 1):
+            done, frame = advance(env, action, step in materialize)
+            if frame is not None:
+                frames[step] = frame
+            if done:
+                break
+        return frames
+    finally:
+        env.close()
+
+
+class EpisodeRecorder(gym.Wrapper):
+    """A wrapper that records the controller bytes of every episode to a file."""
+
+    def __init__(self, env, path, checkpoint_interval=256):
+        """
+        Initialize a new episode recorder.
+
+        The file is a compressed ZIP archive with a JSON header and, for each
+        episode, one member of action bytes and one RAM checkpoint per chunk
+        of ``checkpoint_interval`` steps. It is complete once the recorder is
+        closed.
+
+        Args:
+            env (gymnasium.Env): a Mario environment created with
+                gymnasium.make that steps with raw controller bytes, i.e.,
+                wrap it with JoypadSpace after the recorder
+            path (str): the path of the recording file to write
+            checkpoint_interval (int): the number of steps per chunk
+
+        Returns:
+            None
+
+        """
+        if not isinstance(checkpoint_interval, int) or isinstance(checkpoint_interval, bool):
+            raise TypeError('checkpoint_interval must be of type: int')
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be positive')
+        spec = env.unwrapped.spec
+        if spec is None:
+            raise ValueError('env must be created with gymnasium.make to record')
+        super().__init__(env)
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self._header = dict(
+            format_version=_FORMAT_VERSION,
+            env_id=spec.id,
+            kwargs=_recorded_kwargs(spec),
+            checkpoint_interval=checkpoint_interval,
+            episodes=[],
+        )
+        self._archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._actions = bytearray()
+        self._chunk = 0
+
+    def _flush(self):
+        """Write the pending actions of the current episode as a chunk."""
+        if not self._header['episodes']:
+            return
+        episode = len(self._header['episodes']) - 1
+        self._archive.writestr(_ACTIONS.format(episode, self._chunk), bytes(self._actions))
+        self._actions.clear()
+        self._chunk += 1
+
+    def _checkpoint(self):
+        """Write the RAM at the start of the current chunk."""
+        episode = len(self._header['episodes']) - 1
+        ram = self.env.unwrapped.ram.tobytes()
+        self._archive.writestr(_CHECKPOINT.format(episode, self._chunk), ram)
+
+    def reset(self, *, seed=None, options=None):
+        """
+        Reset the environment and start recording a new episode.
+
+        Args:
+            seed (int): an optional random number seed for the next episode
+            options (dict): options passed to the environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the initial observation
+            - (dict) the info of the initial frame
+
+        """
+        if self._actions:
+            self._flush()
+        observation, info = self.env.reset(seed=seed, options=options)
+        self._chunk = 0
+        self._header['episodes'].append(dict(
+            start_hash=_state_hash(self.env.unwrapped),
+            start_index=self.env.unwrapped.start_index,
+            target=_target(self.env.unwrapped),
+            steps=0,
+        ))
+        self._checkpoint()
+        return observation, info
+
+    def step(self, action):
+        """
+        Step the environment and record the controller byte of the action.
+
+        Args:
+            action (int): the controller byte to press
+
+        Returns:
+            the step result of the environment
+
+        """
+        if not self._header['episodes']:
+            raise ValueError('cannot record a step before calling `reset`')
+        byte = int(action)
+        if not 0 <= byte <= 255:
+            raise ValueError('action must be a controller byte in [0, 255]')
+        result = self.env.step(action)
+        self._actions.append(byte)
+        self._header['episodes'][-1]['steps'] += 1
+        if len(self._actions) == self.checkpoint_interval:
+            self._flush()
+            self._checkpoint()
+        return result
+
+    def close(self):
+        """Finish the recording file and close the environment."""
+        if self._archive is not None:
+            if self._actions:
+                self._flush()
+            self._archive.writestr(_HEADER, json.dumps(self._header))
+            self._archive.close()
+            self._archive = None
+        super().close()
+
+
+class EpisodeReplay:
+    """Seekable deterministic replay of a recording by re-simulation."""
+
+    def __init__(self, path, **kwargs):
+        """
+        Initialize a new replay of a recording file.
+
+        Args:
+            path (str): the path of a file written by EpisodeRecorder
+            kwargs (dict): extra keyword arguments for the replay
+                environment, e.g., render_mode
+
+        Returns:
+            None
+
+        """
+        self._archive = zipfile.ZipFile(path)
+        self.header = json.loads(self._archive.read(_HEADER))
+        if self.header['format_version'] != _FORMAT_VERSION:
+            raise ValueError('unsupported recording format version')
+        self.checkpoint_interval = self.header['checkpoint_interval']
+        kwargs = dict(_decoded_kwargs(self.header['kwargs']), **kwargs)
+        self.env = make(self.header['env_id'], **kwargs).unwrapped
+        # in-memory emulator snapshots keyed by (episode, chunk)
+        self._snapshots = {}
+
+    @property
+    def num_episodes(self):
+        """Return the number of recorded episodes."""
+        return len(self.header['episodes'])
+
+    def steps(self, episode):
+        """Return the number of recorded steps of an episode."""
+        return self.header['episodes'][episode]['steps']
+
+    def actions(self, episode):
+        """
+        Return the recorded controller bytes of an episode.
+
+        Args:
+            episode (int): the index of the episode
+
+        Returns (np.ndarray):
+            the uint8 controller byte of every step
+
+        """
+        chunks = -(-self.steps(episode) // self.checkpoint_interval)
+        return np.concatenate([self._chunk_actions(episode, chunk) for chunk in range(chunks)]
+                              + [np.zeros(0, dtype=np.uint8)])
+
+    def _chunk_actions(self, episode, chunk):
+        """Return the controller bytes of one chunk of an episode."""
+        data = self._archive.read(_ACTIONS.format(episode, chunk))
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def _verify(self, episode, chunk):
+        """Raise an error if the live RAM differs from a chunk's checkpoint."""
+        ram = self._archive.read(_CHECKPOINT.format(episode, chunk))
+        if ram != self.env.ram.tobytes():
+            step = chunk * self.checkpoint_interval
+            msg = 'replay diverged from the recording at step {} of episode {}'
+            raise RuntimeError(msg.format(step, episode))
+
+    def seek(self, episode, step):
+        """
+        Move the replay environment to a step of a recorded episode.
+
+        The emulator restarts from the latest in-memory checkpoint at or
+        before the step, creating checkpoints for the chunks it re-simulates
+        and checking them against the recorded RAM, so seeking again within
+        visited chunks costs at most ``checkpoint_interval`` steps.
+
+        Args:
+            episode (int): the index of the episode
+            step (int): the number of recorded steps to apply, from 0 to
+                the length of the episode
+
+        Returns (NESEnv):
+            the replay environment in the state after ``step`` steps
+
+        """
+        if not 0 <= episode < self.num_episodes:
+            raise IndexError('episode index out of range')
+        if not 0 <= step <= self.steps(episode):
+            raise IndexError('step index out of range')
+        target = step // self.checkpoint_interval
+        visited = [chunk for (index, chunk) in self._snapshots if index == episode and chunk <= target]
+        recorded = self.header['episodes'][episode]
+        # switch to the stage of the episode before restoring its checkpoints
+        if 'target' in recorded:
+            stage = recorded['target']
+            retarget(self.env, None if stage is None else tuple(stage))
+        if visited:
+            chunk = max(visited)
+            restore_snapshot(self.env, self._snapshots[episode, chunk])
+        else:
+            chunk = 0
+            self.env.reset(options=dict(start_index=recorded.get('start_index', 0)))
+            if _state_hash(self.env) != recorded['start_hash']:
+                raise RuntimeError('replay start state differs from the recording')
+        while True:
+            if (episode, chunk) not in self._snapshots:
+                self._verify(episode, chunk)
+                self._snapshots[episode, chunk] = capture_snapshot(self.env)
+            if chunk == target:
+                break
+            for action in self._chunk_actions(episode, chunk).tolist():
+                self.env.step(action)
+            chunk += 1
+        remaining = step - target * self.checkpoint_interval
+        if remaining:
+            for action in self._chunk_actions(episode, chunk)[:remaining].tolist():
+                self.env.step(action)
+        return self.env
+
+    def close(self):
+        """Close the recording file and the replay environment."""
+        self._archive.close()
+        self.env.close()
+
+
+# explicitly define the outward facing API of this module
+__all__ = [EpisodeRecorder.__name__, EpisodeReplay.__name__, replay.__name__]
@@ -0,0 +1,526 @@
+"""A process-pool vector environment that shares frames through shared memory."""
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import traceback
+
+import gymnasium as gym
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import batch_space
+import numpy as np
+
+from ._info_record import bind_info_record
+from ._registration import make
+from .vector_env import _AUTORESET_MODE
+from .vector_env import _action_map
+from .vector_env import _controller_bytes
+from .vector_env import _copy_buffers
+from .vector_env import _env_id_list
+from .vector_env import _info_dtype
+from .vector_env import _record_info
+from .vector_env import _seed_list
+from .vector_env import _store_info
+
+
+# the shared info block of each kind of numeric info value
+_INFO_BLOCKS = {np.bool_: 'info_bool', np.int64: 'info_int', np.float64: 'info_float'}
+
+
+def _flatten_info(info, prefix=()):
+    """Return (path, value) pairs for every leaf of a nested info dictionary."""
+    for key, value in info.items():
+        if isinstance(value, dict):
+            yield from _flatten_info(value, prefix + (key,))
+        else:
+            yield prefix + (key,), value
+
+
+def _info_kinds(infos):
+    """
+    Return the NumPy type of every info path reported by an environment.
+
+    Args:
+        infos (list): info dictionaries reported by one environment
+
+    Returns (dict):
+        a mapping of info paths to np.bool_, np.int64, np.float64, or object
+
+    """
+    kinds = {}
+    for info in infos:
+        for path, value in _flatten_info(info):
+            kinds[path] = _merge_kinds(kinds.get(path), _info_dtype(value))
+    return kinds
+
+
+def _merge_kinds(first, second):
+    """Return the NumPy type that holds values of both types."""
+    if first is None or first == second:
+        return second
+    if object in (first, second):
+        return object
+    return np.result_type(first, second).type
+
+
+def _create_array(shape, dtype):
+    """Return a new shared memory block and an array view of it."""
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape, dtype=np.int64)) * dtype.itemsize)
+    memory = SharedMemory(create=True, size=size)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _attach_array(name, shape, dtype):
+    """Return an existing shared memory block and an array view of it."""
+    # the parent owns and unlinks every block, so workers do not track them
+    memory = SharedMemory(name=name, track=False)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _describe_env(env):
+    """Return the spaces, metadata, and info types of a sub-environment."""
+    if env._info_record is not None:
+        info_dtype = env.info_dtype
+        info_kinds = {}
+    else:
+        _, reset_info = env.reset()
+        _, _, _, _, step_info = env.step(0)
+        _, backup_info = env.reset()
+        info_dtype = None
+        info_kinds = _info_kinds([reset_info, step_info, backup_info])
+    return dict(
+        action_space=env.action_space,
+        info_dtype=info_dtype,
+        info_kinds=info_kinds,
+        metadata=env.metadata,
+        observation_space=env.observation_space,
+        render_mode=env.render_mode,
+    )
+
+
+class _Worker:
+    """The state of one sub-environment inside its worker process."""
+
+    def __init__(self, env, index, layout):
+        """
+        Attach a sub-environment to the shared batch buffers.
+
+        Args:
+            env (NESEnv): the sub-environment owned by the worker
+            index (int): the index of the sub-environment in the batch
+            layout (dict): the shared memory names, shapes, and info columns
+
+        Returns:
+            None
+
+        """
+        self.env = env
+        self.index = index
+        self.memories = []
+        self.arrays = {}
+        for name, (memory_name, shape, dtype) in layout['arrays'].items():
+            memory, array = _attach_array(memory_name, shape, dtype)
+            self.memories.append(memory)
+            self.arrays[name] = array
+        # array mode environments write their info record in place
+        self.records = 'records' in self.arrays
+        if self.records:
+            row = self.arrays['records'][index:index + 1].reshape(())
+            bind_info_record(env, row)
+        # the row of the shared info block and column of each numeric path
+        self.columns = {
+            path: (self.arrays[block][index], column)
+            for path, (block, column) in layout['columns'].items()
+        }
+        self.objects = {}
+        self.needs_reset = False
+
+    def write(self, observation, reward, terminated, truncated, info):
+        """
+        Write one transition into the shared buffers.
+
+        Returns (dict):
+            the object and unexpected info values that changed since the last
+            write, keyed by info path, or None if there are none
+
+        """
+        index = self.index
+        np.copyto(self.arrays['observations'][index], observation)
+        self.arrays['rewards'][index] = reward
+        self.arrays['terminations'][index] = terminated
+        self.arrays['truncations'][index] = truncated
+        if self.records:
+            return None
+        changed = None
+        for path, value in _flatten_info(info):
+            column = self.columns.get(path)
+            if column is not None:
+                row, position = column
+                row[position] = value
+            elif path not in self.objects or self.objects[path] != value:
+                self.objects[path] = value
+                if changed is None:
+                    changed = {}
+                changed[path] = value
+        return changed
+
+    def reset(self, seed, options):
+        """Reset the sub-environment and write its initial observation."""
+        observation, info = self.env.reset(seed=seed, options=options)
+        self.needs_reset = False
+        return self.write(observation, 0.0, False, False, info)
+
+    def step(self):
+        """Step the sub-environment with its shared action, or reset it."""
+        if self.needs_reset:
+            return self.reset(None, None)
+        action = int(self.arrays['actions'][self.index])
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        self.needs_reset = terminated or truncated
+        return self.write(observation, reward, terminated, truncated, info)
+
+    def close(self):
+        """Close the sub-environment and detach from shared memory."""
+        self.env.close()
+        self.arrays.clear()
+        self.columns.clear()
+        for memory in self.memories:
+            memory.close()
+
+
+def _worker(index, env_id, kwargs, pipe, parent_pipe):
+    """
+    Run one sub-environment until the parent sends the close command.
+
+    Every reply is an ('ok', payload) or ('error', traceback) tuple.
+
+    Args:
+        index (int): the index of the sub-environment in the batch
+        env_id (str): the registered ID of the sub-environment
+        kwargs (dict): keyword arguments for the sub-environment
+        pipe (Connection): the worker end of the command pipe
+        parent_pipe (Connection): the parent end, closed in the worker
+
+    Returns:
+        None
+
+    """
+    parent_pipe.close()
+    worker = None
+    try:
+        env = make(env_id, **kwargs).unwrapped
+        pipe.send(('ok', _describe_env(env)))
+        worker = _Worker(env, index, pipe.recv())
+        pipe.send(('ok', None))
+        while True:
+            command, data = pipe.recv()
+            if command == 'step':
+                pipe.send(('ok', worker.step()))
+            elif command == 'reset':
+                pipe.send(('ok', worker.reset(*data)))
+            elif command == 'render':
+                pipe.send(('ok', env.render()))
+            elif command == 'close':
+                pipe.send(('ok', None))
+                break
+            else:
+                raise ValueError('unknown worker command {}'.format(command))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        pipe.send(('error', traceback.format_exc()))
+    finally:
+        if worker is not None:
+            worker.close()
+        pipe.close()
+
+
+class MarioSharedMemoryVectorEnv(VectorEnv):
+    """A batch of Mario environments stepped in parallel worker processes."""
+
+    def __init__(self,
+        env_ids,
+        num_envs=None,
+        actions=None,
+        copy=False,
+        context=None,
+        **kwargs
+    ):
+        """
+        Initialize a new shared memory Mario vector environment.
+
+        Workers write observations, rewards, flags, and numeric info values
+        straight into shared memory, so each step exchanges only a short
+        command and acknowledgement with every worker. Info values that are
+        not numbers travel with the acknowledgement when they change.
+
+        Args:
+            env_ids (str, list): a registered environment ID to repeat, or a
+                list with one environment ID per sub-environment
+            num_envs (int): the number of sub-environments when env_ids is a
+                single ID; must be None when env_ids is a list
+            actions (list): an optional list of button lists, as accepted by
+                nes_py.wrappers.JoypadSpace, mapping discrete actions to
+                controller bytes; None steps with raw controller bytes
+            copy (bool): whether to return copies of the batch buffers; by
+                default reset and step return views of the shared memory,
+                which the next call overwrites
+            context (str): the multiprocessing start method, or None for the
+                platform default
+            kwargs (dict): keyword arguments for every sub-environment; the
+                snapshot cache is enabled unless explicitly disabled. With
+                info_mode='array' every worker writes its info record into
+                one row of the shared ``info['record']`` array
+
+        Returns:
+            None
+
+        """
+        env_ids = _env_id_list(env_ids, num_envs)
+        if not isinstance(copy, bool):
+            raise TypeError('copy must be of type: bool')
+        kwargs.setdefault('snapshot_cache', True)
+        self.env_ids = env_ids
+        self.num_envs = len(env_ids)
+        self.copy = copy
+        self.closed = False
+        self._memories = []
+        self._pipes = []
+        self._processes = []
+        context = multiprocessing.get_context(context)
+        for index, env_id in enumerate(env_ids):
+            parent_pipe, child_pipe = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                name='MarioWorker-{}'.format(index),
+                args=(index, env_id, kwargs, child_pipe, parent_pipe),
+                daemon=True,
+            )
+            self._pipes.append(parent_pipe)
+            self._processes.append(process)
+            process.start()
+            child_pipe.close()
+        try:
+            descriptions = self._receive_all()
+            self._setup(descriptions, actions)
+            for pipe in self._pipes:
+                pipe.send(self._layout)
+            self._receive_all()
+        except BaseException:
+            self.close(terminate=True)
+            raise
+
+    def _setup(self, descriptions, actions):
+        """Allocate the shared buffers described by the workers."""
+        first = descriptions[0]
+        self.render_mode = first['render_mode']
+        self.metadata = dict(first['metadata'], autoreset_mode=_AUTORESET_MODE)
+        self.single_observation_space = first['observation_space']
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self._action_map = _action_map(actions)
+        if actions is None:
+            self.single_action_space = first['action_space']
+        else:
+            self.single_action_space = gym.spaces.Discrete(len(actions))
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+        # merge the info types of every worker into shared info columns
+        kinds = {}
+        for description in descriptions:
+            for path, kind in description['info_kinds'].items():
+                kinds[path] = _merge_kinds(kinds.get(path), kind)
+        columns = {}
+        widths = dict.fromkeys(_INFO_BLOCKS.values(), 0)
+        for path, kind in kinds.items():
+            block = _INFO_BLOCKS.get(kind)
+            if block is not None:
+                columns[path] = (block, widths[block])
+                widths[block] += 1
+        shapes = dict(
+            observations=(
+                (self.num_envs,) + self.single_observation_space.shape,
+                self.single_observation_space.dtype,
+            ),
+            actions=((self.num_envs,), np.int64),
+            rewards=((self.num_envs,), np.float64),
+            terminations=((self.num_envs,), np.bool_),
+            truncations=((self.num_envs,), np.bool_),
+        )
+        for kind, block in _INFO_BLOCKS.items():
+            shapes[block] = ((self.num_envs, widths[block]), kind)
+        info_dtypes = {description['info_dtype'] for description in descriptions}
+        if info_dtypes != {None}:
+            if len(info_dtypes) > 1:
+                raise ValueError('array info requires every env to share one info_dtype')
+            shapes['records'] = ((self.num_envs,), info_dtypes.pop())
+        arrays = {}
+        self._layout = dict(arrays={}, columns=columns)
+        for name, (shape, dtype) in shapes.items():
+            memory, arrays[name] = _create_array(shape, dtype)
+            self._memories.append(memory)
+            self._layout['arrays'][name] = (memory.name, shape, np.dtype(dtype))
+        self._observations = arrays['observations']
+        self._actions = arrays['actions']
+        self._rewards = arrays['rewards']
+        self._terminations = arrays['terminations']
+        self._truncations = arrays['truncations']
+        if 'records' in arrays:
+            self._infos = _record_info(arrays['records'])
+            return
+        # numeric info columns are views of the shared info blocks and the
+        # remaining columns are updated from worker acknowledgements
+        self._infos = {}
+        for path, kind in kinds.items():
+            infos = self._infos
+            for key in path[:-1]:
+                infos = infos.setdefault(key, {})
+            if path in columns:
+                block, column = columns[path]
+                infos[path[-1]] = arrays[block][:, column]
+            else:
+                infos[path[-1]] = np.full(self.num_envs, None, dtype=object)
+        for index, description in enumerate(descriptions):
+            for path in description['info_kinds']:
+                infos = self._infos
+                for key in path:
+                    mask = infos.setdefault('_' + key, np.zeros(self.num_envs, dtype=np.bool_))
+                    mask[index] = True
+                    infos = infos[key]
+
+    def _receive(self, pipe):
+        """Return the payload of a worker reply, raising worker errors."""
+        status, payload = pipe.recv()
+        if status == 'error':
+            raise RuntimeError('Mario worker failed:\n{}'.format(payload))
+        return payload
+
+    def _receive_all(self):
+        """Return the reply payload of every worker in order."""
+        return [self._receive(pipe) for pipe in self._pipes]
+
+    def _store_changes(self, changes):
+        """Write the changed object info values reported by each worker."""
+        for index, changed in enumerate(changes):
+            if changed is None:
+                continue
+            for path, value in changed.items():
+                info = value
+                for key in reversed(path):
+                    info = {key: info}
+                _store_info(self._infos, info, index, self.num_envs)
+
+    def _output(self, *buffers):
+        """Return the given batch buffers, copying them if enabled."""
+        if not self.copy:
+            return buffers
+        return _copy_buffers(buffers)
+
+    def reset(self, *, seed=None, options=None):
+        """
+        Reset every sub-environment to its post-intro backup state.
+
+        Args:
+            seed (int, list): a seed for the first sub-environment that is
+                incremented for each following one, or a list of seeds
+            options (dict): options passed to every sub-environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the batched initial observations
+            - (dict) the struct-of-arrays info of every sub-environment
+
+        """
+        seeds = _seed_list(seed, self.num_envs)
+        for pipe, env_seed in zip(self._pipes, seeds):
+            pipe.send(('reset', (env_seed, options)))
+        self._store_changes(self._receive_all())
+        return self._output(self._observations, self._infos)
+
+    def step(self, actions):
+        """
+        Step every sub-environment in parallel with one action each.
+
+        Sub-environments that finished on the previous step are reset from
+        their backup state instead of stepped, and report a zero reward.
+
+        Args:
+            actions (np.ndarray): one action per sub-environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the batched observations
+            - (np.ndarray) the float64 reward of each sub-environment
+            - (np.ndarray) the bool termination flag of each sub-environment
+            - (np.ndarray) the bool truncation flag of each sub-environment
+            - (dict) the struct-of-arrays info of every sub-environment
+
+        """
+        self._actions[:] = _controller_bytes(actions, self._action_map, self.num_envs)
+        for pipe in self._pipes:
+            pipe.send(('step', None))
+        self._store_changes(self._receive_all())
+        return self._output(
+            self._observations,
+            self._rewards,
+            self._terminations,
+            self._truncations,
+            self._infos,
+        )
+
+    def render(self):
+        """Return the rendered frame of every sub-environment."""
+        for pipe in self._pipes:
+            pipe.send(('render', None))
+        return tuple(self._receive_all())
+
+    def close_extras(self, timeout=None, terminate=False, **kwargs):
+        """
+        Stop the worker processes and release the shared memory.
+
+        Args:
+            timeout (float): seconds to wait for each worker to exit
+            terminate (bool): whether to kill workers instead of asking them
+                to close their environments
+
+        Returns:
+            None
+
+        """
+        if terminate:
+            # workers may be blocked waiting for a command that never comes
+            for process in self._processes:
+                process.terminate()
+        else:
+            for pipe in self._pipes:
+                try:
+                    pipe.send(('close', None))
+                    self._receive(pipe)
+                except (BrokenPipeError, EOFError, RuntimeError):
+                    pass
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for pipe in self._pipes:
+            pipe.close()
+        # drop the views before closing the blocks they point into
+        self._infos = {}
+        self._observations = self._actions = self._rewards = None
+        self._terminations = self._truncations = None
+        for memory in self._memories:
+            try:
+                memory.close()
+            except BufferError:  # pragma: no cover
+                # a caller still holds a view; unlinking below still frees
+                # the block once that view is released
+                pass
+            memory.unlink()
+        self._memories = []
+
+    def __del__(self):
+        """Release the worker processes and shared memory on collection."""
+        if not getattr(self, 'closed', True) and hasattr(self, '_memories'):
+            self.close(terminate=True)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [MarioSharedMemoryVectorEnv.__name__]
@@ -1,6 +1,28 @@
 """A Gymnasium environment for Super Mario Bros. 2 (USA)."""
+from operator import itemgetter
+import numpy as np
 from nes_py import NESEnv
+from ._clone_state import clone_state
+from ._clone_state import restore_state
+from ._fast_reset import restore_reset
+from ._frameskip import new_max_pool_screen
+from ._frameskip import step_frames
+from ._frameskip import validate_frameskip
+from ._hidden_frames import HiddenFrameCounter
+from ._info_record import new_info_record
+from ._info_record import record_dtype
+from ._info_record import validate_info_mode
+from ._observations import Observer
+from ._observations import observation_space
+from ._observations import validate_obs_type
+from ._ram import RamTable
 from ._roms import smb2_rom_path
+from ._snapshots import skip_start_screen
+from ._start_pool import build_start_pool
+from ._start_pool import validate_start_pool
+from ._step_timing import new_step_timer
+from ._step_timing import validate_step_timing
+from ._target_bank import retarget
 from .tasks import task_for_config
 
 
@@ -21,6 +43,72 @@ _LEVEL_TRANSITION_COMPLETE = 0x03
 _LEVEL_TRANSITION_WARP = 0x04
 
 
+# RAM fields decoded once per step for the reward and info functions
+_RAM_FIELDS = RamTable(
+    level=0x0531,
+    lives=0x04ed,
+    coins=0x062b,
+    cherries=0x062a,
+    character=0x008f,
+    health=0x04c2,
+    health_meter=0x04c3,
+    character_status=0x00c7,
+    invulnerability_timer=0x0085,
+    enemy_defeat_count=0x04ad,
+    item_in_hand_height=0x00ae,
+    subspace_visits=0x0621,
+    x_page=0x0014,
+    x_screen=0x0028,
+    y_page=0x001e,
+    y_screen=0x0032,
+    level_transition=0x04ec,
+)
+
+
+# the per-step info fields written to the record in info_mode='array'
+_INFO_FIELDS = [
+    ('character_id', np.int64),
+    ('character_status', np.int64),
+    ('cherries', np.int64),
+    ('coins', np.int64),
+    ('enemy_defeat_count', np.int64),
+    ('health_meter', np.int64),
+    ('health', np.int64),
+    ('invulnerability_timer', np.int64),
+    ('is_dead', np.bool_),
+    ('is_dying', np.bool_),
+    ('is_game_over', np.bool_),
+    ('item_in_hand_height', np.int64),
+    ('level', np.int64),
+    ('level_complete', np.bool_),
+    ('level_transition', np.int64),
+    ('life', np.int64),
+    ('lives', np.int64),
+    ('position_progress', np.int64),
+    ('position_progress_max', np.int64),
+    ('stage', np.int64),
+    ('subspace_visits', np.int64),
+    ('world', np.int64),
+    ('x_page', np.int64),
+    ('x_pos', np.int64),
+    ('x_screen', np.int64),
+    ('y_page', np.int64),
+    ('y_pos', np.int64),
+    ('y_screen', np.int64),
+    ('clear', np.bool_),
+    ('death', np.bool_),
+    ('progress', np.int64),
+    ('progress_max', np.int64),
+    ('timeout', np.bool_),
+    ('hidden_frames', np.int64),
+]
+
+
+# the reward components in the order of the info record
+_REWARD_COMPONENTS = ('progress', 'collectibles', 'health', 'completion', 'death')
+_reward_component_values = itemgetter(*_REWARD_COMPONENTS)
+
+
 def _signed_byte(value):
     """Return an unsigned byte interpreted as a signed offset."""
     value = int(value)
@@ -89,24 +177,85 @@ class SuperMarioBros2Env(NESEnv):
     # the legal range of rewards for each step
     reward_range = (-15, 15)
 
-    def __init__(self, target=None, render_mode=None):
+    # the structured dtype of the info record in info_mode='array'
+    info_dtype = record_dtype(_INFO_FIELDS, _REWARD_COMPONENTS)
+
+    # clone and restore handles of the emulator state and reward baselines
+    clone_state = clone_state
+    restore_state = restore_state
+
+    # Python-side state captured alongside emulator snapshots
+    _SNAPSHOT_ATTRIBUTES = (
+        '_position_origin',
+        '_position_progress_max',
+        '_lives_start',
+        '_coins_last',
+        '_cherries_last',
+        '_health_last',
+        '_completion_rewarded',
+    )
+
+    def __init__(
+        self,
+        target=None,
+        render_mode=None,
+        snapshot_cache=False,
+        info_mode='dict',
+        frameskip=1,
+        max_pool=False,
+        obs_type='rgb',
+        step_timing=False,
+        start_pool=1,
+        start_noops=30,
+    ):
         """
         Initialize a new Super Mario Bros. 2 (USA) environment.
 
         Args:
             target (tuple): a tuple of the (world, stage) to play as a level
             render_mode (str): the render mode to use, if any
+            snapshot_cache (bool): whether to share the post-intro emulator
+                state with other environments for the same ROM and target
+                in this process instead of replaying the start screen
+            info_mode (str): 'dict' to return a new info dictionary every
+                step, or 'array' to write the per-step fields into one
+                structured NumPy record of ``info_dtype`` that is reused
+                across steps and returned as ``info['record']``
+            frameskip (int): the number of frames to advance with the same
+                action per step; only the final frame builds the info
+            max_pool (bool): whether to return the element-wise maximum of
+                the last two screens of each step (requires frameskip >= 2)
+            obs_type (str): the observation to return, one of 'rgb' for the
+                240x256x3 screen, 'gray' for the 240x256 grayscale screen,
+                'gray84' for the grayscale screen area-averaged to 84x84,
+                or 'ram' for the 2 KB work RAM; observations other than
+                'rgb' are written into a buffer reused across steps
+            step_timing (bool): whether to record per-phase nanosecond
+                timings and hidden frame counts of every step in
+                ``step_timer`` (see ``StepTimer``); disabled environments
+                keep ``step_timer`` None and run no timing code
+            start_pool (int): the number of start states that resets
+                draw from with the reset seed: the backup state and
+                the states reached by distinct numbers of no-op frames
+                after it
+            start_noops (int): the most no-op frames before a start state
 
         Returns:
             None
 
         """
+        if not isinstance(snapshot_cache, bool):
+            raise TypeError('snapshot_cache must be of type: bool')
+        validate_info_mode(info_mode)
+        validate_frameskip(frameskip, max_pool)
+        validate_obs_type(obs_type, max_pool)
+        validate_step_timing(step_timing)
+        validate_start_pool(start_pool, start_noops)
         rom = smb2_rom_path()
         super(SuperMarioBros2Env, self).__init__(rom, render_mode=render_mode)
         self._rom_mode = 'vanilla'
         self._rom_version = 0
-        target = _decode_smb2_target(target)
-        self._target_world, self._target_stage, self._target_level = target
+        self._set_target(target)
         self._position_origin = (0, 0)
         self._position_progress_max = 0
         self._lives_start = 0
@@ -117,9 +266,32 @@ class SuperMarioBros2Env(NESEnv):
         self._last_reward_components = {}
         self._last_reward_unclipped = 0.0
         self._last_reward_clipped = 0.0
+        self._task = self._resolve_task()
+        self._ram_snapshot = None
+        self._info_record = new_info_record(info_mode, self.info_dtype)
+        # setup the observation type and its reusable buffers
+        self.observation_space = observation_space(obs_type)
+        self._observer = Observer(self, obs_type)
+        # setup native frame skipping and the reusable max-pooled screen
+        self._frameskip = frameskip
+        self._max_pool_screen = new_max_pool_screen(self, max_pool)
+        # setup the hidden frame counts; no skip loop advances frames
+        self.hidden_frames = HiddenFrameCounter(())
+        # setup the start pool built by the first reset after the backup
+        self._start_pool_size = start_pool
+        self._start_noops = start_noops
+        self._reset_templates = None
+        self.start_index = 0
+        # setup the post-intro snapshots of targets switched away from
+        self._snapshot_cache = snapshot_cache
+        self._target_bank = {}
         self.reset()
-        self._skip_start_screen()
+        # keep the power-on state to skip the start screen of new targets
+        self._power_on_state = self.dump_state()
+        skip_start_screen(self, snapshot_cache)
         self._backup()
+        # install the opt-in step timing hooks
+        self.step_timer = new_step_timer(self, step_timing)
 
     @property
     def is_single_stage_env(self):
@@ -127,8 +299,17 @@ class SuperMarioBros2Env(NESEnv):
         return self._target_level is not None
 
     @property
-    def _task(self):
-        """Return metadata for the current configured task."""
+    def _snapshot_target(self):
+        """Return the target that identifies this env's post-intro state."""
+        return self._target_world, self._target_stage
+
+    def _set_target(self, target):
+        """Validate a (world, stage) target and set the target variables."""
+        target = _decode_smb2_target(target)
+        self._target_world, self._target_stage, self._target_level = target
+
+    def _resolve_task(self):
+        """Return metadata for the configured task from the task index."""
         world = None
         stage = None
         if self.is_single_stage_env:
@@ -145,8 +326,16 @@ class SuperMarioBros2Env(NESEnv):
 
     def _read_mem(self, address):
         """Read one RAM byte as a Python integer."""
+        if self._ram_snapshot is not None:
+            value = self._ram_snapshot.get(address)
+            if value is not None:
+                return value
         return int(self.ram[address])
 
+    def _decode_ram(self):
+        """Gather the RAM fields for this frame into the snapshot."""
+        self._ram_snapshot = _RAM_FIELDS.gather(self.ram)
+
     @property
     def _level(self):
         """Return the current linear level index."""
@@ -456,6 +645,7 @@ class SuperMarioBros2Env(NESEnv):
             target_world=self._target_world,
             timeout=False,
             world_label=str(self._world),
+            hidden_frames=self.hidden_frames.step,
         )
 
     # MARK: nes-py API calls
@@ -473,6 +663,8 @@ class SuperMarioBros2Env(NESEnv):
 
     def _did_reset(self):
         """Handle any RAM hacking after a reset occurs."""
+        # decode RAM once for the reward baselines and the reset info
+        self._decode_ram()
         self._position_origin = (self._x_position, self._y_position)
         self._position_progress_max = 0
         self._lives_start = self._lives
@@ -481,6 +673,7 @@ class SuperMarioBros2Env(NESEnv):
         self._health_last = self._health
         self._completion_rewarded = False
         self._reset_reward_components()
+        self.hidden_frames.start_episode()
 
     def _did_step(self, done):
         """Reset full-game reward baselines after a non-terminal life loss."""
@@ -493,8 +686,64 @@ class SuperMarioBros2Env(NESEnv):
         self._cherries_last = self._cherries
         self._health_last = self._health
 
+    def reset(self, *, seed=None, options=None):
+        """
+        Reset the emulator to the backup state.
+
+        The first reset after the backup runs the full reset hooks for
+        every start state of the pool and captures their results, and
+        resets restore one of those captures instead of recomputing the
+        reward baselines and info from RAM.
+
+        Args:
+            seed (int): an optional random number seed for the next episode
+            options (dict): an optional 'start_index' of the start state
+                to restore instead of drawing one with the seed, and an
+                optional (world, stage) 'target' to switch to (None for
+                the full game) without reconstructing the environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the initial observation of the ``obs_type``
+            - (dict) the info of the initial frame
+
+        """
+        if options is not None and 'target' in options:
+            retarget(self, options['target'])
+        if self._reset_templates is None:
+            if not self._has_backup:
+                _, info = super(SuperMarioBros2Env, self).reset(seed=seed, options=options)
+                return self._observer(), info
+            self._reset_templates = build_start_pool(self)
+        index = None if options is None else options.get('start_index')
+        info = restore_reset(self, self._reset_templates, seed, index)
+        return self._observer(), info
+
+    def step(self, action):
+        """
+        Advance the emulator ``frameskip`` frames with one action.
+
+        Args:
+            action (int): the controller byte to hold for every frame
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the next observation, max-pooled if enabled
+            - (float) the summed reward of the frames
+            - (bool) whether the episode terminated
+            - (bool) whether the episode was truncated
+            - (dict) the info of the final frame
+
+        """
+        if self._frameskip == 1:
+            _, reward, terminated, truncated, info = super(SuperMarioBros2Env, self).step(action)
+            return self._observer(), reward, terminated, truncated, info
+        return step_frames(self, action)
+
     def _get_reward(self):
         """Return the reward after a step occurs."""
+        # decode RAM once for the reward, terminal, and info functions
+        self._decode_ram()
         self._store_reward_components(
             dict(
                 progress=self._progress_reward,
@@ -519,6 +768,19 @@ class SuperMarioBros2Env(NESEnv):
 
     def _get_info(self):
         """Return the info after a step occurs."""
+        if self._ram_snapshot is None:
+            self._decode_ram()
+        try:
+            if self._info_record is None:
+                return self._build_info()
+            self._info_record[()] = self._info_values()
+            return dict(record=self._info_record)
+        finally:
+            # RAM hacks after the step must read live RAM
+            self._ram_snapshot = None
+
+    def _build_info(self):
+        """Return the info dictionary from the decoded RAM snapshot."""
         info = dict(
             character=self._character,
             character_id=self._read_mem(0x008f),
@@ -554,6 +816,49 @@ class SuperMarioBros2Env(NESEnv):
         info.update(self._reward_info())
         return info
 
+    def _info_values(self):
+        """Return the per-step info fields in the order of the info record."""
+        death = self._is_dying or self._is_dead
+        return (
+            self._read_mem(0x008f),
+            self._character_status,
+            self._cherries,
+            self._coins,
+            self._enemy_defeat_count,
+            self._health_meter,
+            self._health,
+            self._invulnerability_timer,
+            self._is_dead,
+            self._is_dying,
+            self._is_game_over,
+            self._item_in_hand_height,
+            self._level,
+            self._is_level_complete,
+            self._level_transition,
+            self._life,
+            self._lives,
+            self._position_progress,
+            self._position_progress_max,
+            self._stage,
+            self._subspace_visits,
+            self._world,
+            self._x_page,
+            self._x_position,
+            self._x_screen,
+            self._y_page,
+            self._y_position,
+            self._y_screen,
+            self._is_level_complete,
+            death,
+            self._position_progress,
+            self._position_progress_max,
+            False,
+            self.hidden_frames.step,
+            _reward_component_values(self._last_reward_components),
+            self._last_reward_unclipped,
+            self._last_reward_clipped,
+        )
+
 
 # explicitly define the outward facing API of this module
 __all__ = [
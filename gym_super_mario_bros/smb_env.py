@@ -1,9 +1,35 @@
 """A Gymnasium environment for Super Mario Bros. and Lost Levels."""
 from collections import defaultdict
+from operator import itemgetter
+import numpy as np
 from nes_py import NESEnv
+from ._clone_state import clone_state
+from ._clone_state import restore_state
+from ._features import FEATURE_NAMES
+from ._fast_reset import restore_reset
+from ._frameskip import new_max_pool_screen
+from ._frameskip import step_frames
+from ._frameskip import validate_frameskip
+from ._hidden_frames import HiddenFrameCounter
+from ._hidden_frames import write_hidden_frames
+from ._info_record import new_info_record
+from ._info_record import record_dtype
+from ._info_record import validate_info_mode
+from ._observations import Observer
+from ._observations import SMB1_OBS_TYPES
+from ._observations import observation_space
+from ._observations import validate_obs_type
+from ._ram import RamTable
+from ._ram import decode_digits
 from ._roms import decode_target
 from ._roms import smb1_rom_path
 from ._roms import smb2jp_rom_path
+from ._snapshots import skip_start_screen
+from ._start_pool import build_start_pool
+from ._start_pool import validate_start_pool
+from ._step_timing import new_step_timer
+from ._step_timing import validate_step_timing
+from ._target_bank import retarget
 from .tasks import task_for_config
 
 
@@ -26,17 +52,112 @@ _ENEMY_TYPE_ADDRESSES = [0x0016, 0x0017, 0x0018, 0x0019, 0x001A]
 _STAGE_OVER_ENEMIES = (0x2D, 0x31)
 
 
+# RAM fields decoded once per step for the reward and info functions
+_RAM_FIELDS = RamTable(
+    world=0x075f,
+    stage=0x075c,
+    area=0x0760,
+    score=(0x07de, 6, 'digits'),
+    time=(0x07f8, 3, 'digits'),
+    coins=(0x07ed, 2, 'digits'),
+    life=0x075a,
+    x_page=0x006d,
+    x_pixel=0x0086,
+    screen_left_x=0x071c,
+    y_pixel=0x03b8,
+    y_viewport=0x00b5,
+    status=0x0756,
+    player_state=0x000e,
+    game_mode=0x0770,
+    enemy_types=(0x0016, 5),
+    float_state=0x001d,
+)
+
+
+# the per-step info fields written to the record in info_mode='array'
+_INFO_FIELDS = [
+    ('area', np.int64),
+    ('coins', np.int64),
+    ('enemy_types', np.uint8, (5,)),
+    ('flag_get', np.bool_),
+    ('is_dead', np.bool_),
+    ('is_dying', np.bool_),
+    ('is_game_over', np.bool_),
+    ('is_stage_over', np.bool_),
+    ('is_world_over', np.bool_),
+    ('left_x_pos', np.int64),
+    ('level', np.int64),
+    ('life', np.int64),
+    ('player_state', np.int64),
+    ('powerup_level', np.int64),
+    ('score', np.int64),
+    ('stage', np.int64),
+    ('status_value', np.int64),
+    ('time', np.int64),
+    ('world', np.int64),
+    ('x_pos', np.int64),
+    ('x_pos_max', np.int64),
+    ('y_pixel', np.int64),
+    ('y_pos', np.int64),
+    ('y_viewport', np.int64),
+    ('clear', np.bool_),
+    ('death', np.bool_),
+    ('lives', np.int64),
+    ('progress', np.int64),
+    ('progress_max', np.int64),
+    ('timeout', np.bool_),
+    ('hidden_frames', np.int64),
+]
+
+
+# the skip loops of _did_step that advance hidden frames
+_HIDDEN_FRAME_PHASES = ('_kill_mario', '_skip_end_of_world', '_skip_occupied_states')
+
+
+# the reward components in the order of the info record
+_REWARD_COMPONENTS = ('progress', 'time', 'score', 'coins', 'powerup', 'completion', 'death')
+_reward_component_values = itemgetter(*_REWARD_COMPONENTS)
+
+
 class SuperMarioBrosEnv(NESEnv):
     """An environment for playing Super Mario Bros with Gymnasium."""
 
     # the legal range of rewards for each step
     reward_range = (-15, 15)
 
+    # the structured dtype of the info record in info_mode='array'
+    info_dtype = record_dtype(_INFO_FIELDS, _REWARD_COMPONENTS)
+
+    # the names of the entries of the obs_type='features' vector
+    feature_names = FEATURE_NAMES
+
+    # clone and restore handles of the emulator state and reward baselines
+    clone_state = clone_state
+    restore_state = restore_state
+
+    # Python-side state captured alongside emulator snapshots
+    _SNAPSHOT_ATTRIBUTES = (
+        '_time_last',
+        '_x_position_max',
+        '_score_last',
+        '_coins_last',
+        '_status_last',
+        '_completion_rewarded',
+    )
+
     def __init__(
         self,
         lost_levels=False,
         target=None,
         render_mode=None,
+        snapshot_cache=False,
+        info_mode='dict',
+        frameskip=1,
+        max_pool=False,
+        obs_type='rgb',
+        step_timing=False,
+        start_pool=1,
+        start_noops=30,
     ):
         """
         Initialize a new Super Mario Bros environment.
@@ -47,6 +168,35 @@ class SuperMarioBrosEnv(NESEnv):
                 - True: load Super Mario Bros. Lost Levels
             target (tuple): a tuple of the (world, stage) to play as a level
             render_mode (str): the render mode to use, if any
+            snapshot_cache (bool): whether to share the post-intro emulator
+                state with other environments for the same ROM and target
+                in this process instead of replaying the start screen
+            info_mode (str): 'dict' to return a new info dictionary every
+                step, or 'array' to write the per-step fields into one
+                structured NumPy record of ``info_dtype`` that is reused
+                across steps and returned as ``info['record']``
+            frameskip (int): the number of frames to advance with the same
+                action per step; only the final frame builds the info
+            max_pool (bool): whether to return the element-wise maximum of
+                the last two screens of each step (requires frameskip >= 2)
+            obs_type (str): the observation to return, one of 'rgb' for the
+                240x256x3 screen, 'gray' for the 240x256 grayscale screen,
+                'gray84' for the grayscale screen area-averaged to 84x84,
+                'ram' for the 2 KB work RAM, 'features' for a float32
+                vector decoded from RAM (see ``feature_names``), or 'tiles'
+                for a 13x16 uint8 grid of solid tiles, enemies, and Mario
+                decoded from the RAM metatile buffer; 'features' and 'tiles'
+                never read the screen, and observations other than 'rgb'
+                are written into a buffer reused across steps
+            step_timing (bool): whether to record per-phase nanosecond
+                timings and hidden frame counts of every step in
+                ``step_timer`` (see ``StepTimer``); disabled environments
+                keep ``step_timer`` None and run no timing code
+            start_pool (int): the number of start states that resets
+                draw from with the reset seed: the backup state and
+                the states reached by distinct numbers of no-op frames
+                after it
+            start_noops (int): the most no-op frames before a start state
 
         Returns:
             None
@@ -54,6 +204,13 @@ class SuperMarioBrosEnv(NESEnv):
         """
         if not isinstance(lost_levels, bool):
             raise TypeError('lost_levels must be of type: bool')
+        if not isinstance(snapshot_cache, bool):
+            raise TypeError('snapshot_cache must be of type: bool')
+        validate_info_mode(info_mode)
+        validate_frameskip(frameskip, max_pool)
+        validate_obs_type(obs_type, max_pool, SMB1_OBS_TYPES)
+        validate_step_timing(step_timing)
+        validate_start_pool(start_pool, start_noops)
         rom = smb2jp_rom_path() if lost_levels else smb1_rom_path()
         # initialize the super object with the ROM path
         super(SuperMarioBrosEnv, self).__init__(rom, render_mode=render_mode)
@@ -61,8 +218,7 @@ class SuperMarioBrosEnv(NESEnv):
         self._rom_version = 0
         self._lost_levels = lost_levels
         # set the target world, stage, and area variables
-        target = decode_target(target, lost_levels)
-        self._target_world, self._target_stage, self._target_area = target
+        self._set_target(target)
         # setup a variable to keep track of the last frames time
         self._time_last = 0
         # setup variables to keep track of reward shaping state
@@ -74,18 +230,55 @@ class SuperMarioBrosEnv(NESEnv):
         self._last_reward_components = {}
         self._last_reward_unclipped = 0.0
         self._last_reward_clipped = 0.0
+        # resolve the task metadata once instead of on every info call
+        self._task = self._resolve_task()
+        # setup the per-step snapshot of decoded RAM fields
+        self._ram_snapshot = None
+        # setup the reusable info record (None for dictionary info)
+        self._info_record = new_info_record(info_mode, self.info_dtype)
+        # setup the observation type and its reusable buffers
+        self.observation_space = observation_space(obs_type)
+        self._observer = Observer(self, obs_type)
+        # setup native frame skipping and the reusable max-pooled screen
+        self._frameskip = frameskip
+        self._max_pool_screen = new_max_pool_screen(self, max_pool)
+        # setup the counts of frames advanced and of hidden frames
+        self._frame_count = 0
+        self.hidden_frames = HiddenFrameCounter(_HIDDEN_FRAME_PHASES)
+        # setup the start pool built by the first reset after the backup
+        self._start_pool_size = start_pool
+        self._start_noops = start_noops
+        self._reset_templates = None
+        self.start_index = 0
+        # setup the post-intro snapshots of targets switched away from
+        self._snapshot_cache = snapshot_cache
+        self._target_bank = {}
         # reset the emulator
         self.reset()
-        # skip the start screen
-        self._skip_start_screen()
+        # keep the power-on state to skip the start screen of new targets
+        self._power_on_state = self.dump_state()
+        # skip the start screen (or restore it from the snapshot cache)
+        skip_start_screen(self, snapshot_cache)
         # create a backup state to restore from on subsequent calls to reset
         self._backup()
+        # install the opt-in step timing hooks
+        self.step_timer = new_step_timer(self, step_timing)
 
     @property
     def is_single_stage_env(self):
         """Return True if this environment is a stage environment."""
         return self._target_world is not None and self._target_area is not None
 
+    @property
+    def _snapshot_target(self):
+        """Return the target that identifies this env's post-intro state."""
+        return self._target_world, self._target_stage, self._target_area
+
+    def _set_target(self, target):
+        """Validate a (world, stage) target and set the target variables."""
+        target = decode_target(target, self._lost_levels)
+        self._target_world, self._target_stage, self._target_area = target
+
     @property
     def _game(self):
         """Return the normalized game identifier."""
@@ -100,9 +293,8 @@ class SuperMarioBrosEnv(NESEnv):
             return chr(ord('A') + self._world - 10)
         return str(self._world)
 
-    @property
-    def _task(self):
-        """Return metadata for the current configured task."""
+    def _resolve_task(self):
+        """Return metadata for the configured task from the task index."""
         world = None
         stage = None
         if self.is_single_stage_env:
@@ -119,6 +311,10 @@ class SuperMarioBrosEnv(NESEnv):
 
     def _read_mem(self, address):
         """Read one RAM byte as a Python integer."""
+        if self._ram_snapshot is not None:
+            value = self._ram_snapshot.get(address)
+            if value is not None:
+                return value
         return int(self.ram[address])
 
     def _read_mem_range(self, address, length):
@@ -140,7 +336,15 @@ class SuperMarioBrosEnv(NESEnv):
             the integer value of this 10's place representation
 
         """
-        return int(''.join(map(str, map(int, self.ram[address:address + length]))))
+        if self._ram_snapshot is not None:
+            value = self._ram_snapshot.get((address, length))
+            if value is not None:
+                return value
+        return int(decode_digits(self.ram[address:address + length]))
+
+    def _decode_ram(self):
+        """Gather the RAM fields for this frame into the snapshot."""
+        self._ram_snapshot = _RAM_FIELDS.gather(self.ram)
 
     @property
     def _level(self):
@@ -326,6 +530,17 @@ class SuperMarioBrosEnv(NESEnv):
         self.ram[0x075c] = self._target_stage - 1
         self.ram[0x0760] = self._target_area - 1
 
+    def _frame_advance(self, action):
+        """Advance a frame in the emulator with an action and count it."""
+        self._frame_count += 1
+        self._env.frame_advance(action)
+
+    def _run_skip(self, phase, skip):
+        """Run a skip loop and count the hidden frames it advances."""
+        frames = self._frame_count
+        skip()
+        self.hidden_frames.add(phase, self._frame_count - frames)
+
     def _runout_prelevel_timer(self):
         """Force the pre-level timer to 0 to skip frames during a death."""
         self.ram[0x07A0] = 0
@@ -511,6 +726,7 @@ class SuperMarioBrosEnv(NESEnv):
             target_world=self._target_world,
             timeout=False,
             world_label=self._world_label,
+            hidden_frames=self.hidden_frames.step,
         )
 
     # MARK: nes-py API calls
@@ -527,6 +743,8 @@ class SuperMarioBrosEnv(NESEnv):
 
     def _did_reset(self):
         """Handle any RAM hacking after a reset occurs."""
+        # decode RAM once for the reward baselines and the reset info
+        self._decode_ram()
         self._time_last = self._time
         self._x_position_max = self._x_position
         self._score_last = self._score
@@ -534,6 +752,7 @@ class SuperMarioBrosEnv(NESEnv):
         self._status_last = self._powerup_level
         self._completion_rewarded = False
         self._reset_reward_components()
+        self.hidden_frames.start_episode()
 
     def _did_step(self, done):
         """
@@ -551,18 +770,79 @@ class SuperMarioBrosEnv(NESEnv):
             return
         # if mario is dying, then cut to the chase and kill hi,
         if self._is_dying:
-            self._kill_mario()
+            self._run_skip('_kill_mario', self._kill_mario)
         # skip world change scenes (must call before other skip methods)
         if not self.is_single_stage_env:
-            self._skip_end_of_world()
+            self._run_skip('_skip_end_of_world', self._skip_end_of_world)
         # skip area change (i.e. enter pipe, flag get, etc.)
         self._skip_change_area()
         # skip occupied states like the black screen between lives that shows
         # how many lives the player has left
-        self._skip_occupied_states()
+        self._run_skip('_skip_occupied_states', self._skip_occupied_states)
+
+    def reset(self, *, seed=None, options=None):
+        """
+        Reset the emulator to the backup state.
+
+        The first reset after the backup runs the full reset hooks for
+        every start state of the pool and captures their results, and
+        resets restore one of those captures instead of recomputing the
+        reward baselines and info from RAM.
+
+        Args:
+            seed (int): an optional random number seed for the next episode
+            options (dict): an optional 'start_index' of the start state
+                to restore instead of drawing one with the seed, and an
+                optional (world, stage) 'target' to switch to (None for
+                the full game) without reconstructing the environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the initial observation of the ``obs_type``
+            - (dict) the info of the initial frame
+
+        """
+        if options is not None and 'target' in options:
+            retarget(self, options['target'])
+        if self._reset_templates is None:
+            if not self._has_backup:
+                _, info = super(SuperMarioBrosEnv, self).reset(seed=seed, options=options)
+                return self._observer(), info
+            self._reset_templates = build_start_pool(self)
+        index = None if options is None else options.get('start_index')
+        info = restore_reset(self, self._reset_templates, seed, index)
+        return self._observer(), info
+
+    def step(self, action):
+        """
+        Advance the emulator ``frameskip`` frames with one action.
+
+        Args:
+            action (int): the controller byte to hold for every frame
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the next observation, max-pooled if enabled
+            - (float) the summed reward of the frames
+            - (bool) whether the episode terminated
+            - (bool) whether the episode was truncated
+            - (dict) the info of the final frame
+
+        """
+        self.hidden_frames.start_step()
+        if self._frameskip == 1:
+            _, reward, terminated, truncated, info = super(SuperMarioBrosEnv, self).step(action)
+            observation = self._observer()
+        else:
+            observation, reward, terminated, truncated, info = step_frames(self, action)
+        # the skip loops of _did_step run after the info is built
+        write_hidden_frames(info, self.hidden_frames.step)
+        return observation, reward, terminated, truncated, info
 
     def _get_reward(self):
         """Return the reward after a step occurs."""
+        # decode RAM once for the reward, terminal, and info functions
+        self._decode_ram()
         self._store_reward_components(
             dict(
                 progress=self._progress_reward,
@@ -584,6 +864,19 @@ class SuperMarioBrosEnv(NESEnv):
 
     def _get_info(self):
         """Return the info after a step occurs"""
+        if self._ram_snapshot is None:
+            self._decode_ram()
+        try:
+            if self._info_record is None:
+                return self._build_info()
+            self._info_record[()] = self._info_values()
+            return dict(record=self._info_record)
+        finally:
+            # skip and RAM hacks after the step must read live RAM
+            self._ram_snapshot = None
+
+    def _build_info(self):
+        """Return the info dictionary from the decoded RAM snapshot."""
         info = dict(
             area=self._area,
             coins=self._coins,
@@ -615,6 +908,46 @@ class SuperMarioBrosEnv(NESEnv):
         info.update(self._reward_info())
         return info
 
+    def _info_values(self):
+        """Return the per-step info fields in the order of the info record."""
+        death = self._is_dying or self._is_dead
+        return (
+            self._area,
+            self._coins,
+            self._enemy_types,
+            self._flag_get,
+            self._is_dead,
+            self._is_dying,
+            self._is_game_over,
+            self._is_stage_over,
+            self._is_world_over,
+            self._left_x_position,
+            self._level,
+            self._life,
+            self._player_state,
+            self._powerup_level,
+            self._score,
+            self._stage,
+            self._status_value,
+            self._time,
+            self._world,
+            self._x_position,
+            self._x_position_max,
+            self._y_pixel,
+            self._y_position,
+            self._y_viewport,
+            self._flag_get,
+            death,
+            self._life,
+            self._x_position,
+            self._x_position_max,
+            False,
+            self.hidden_frames.step,
+            _reward_component_values(self._last_reward_components),
+            self._last_reward_unclipped,
+            self._last_reward_clipped,
+        )
+
 
 # explicitly define the outward facing API of this module
 __all__ = [SuperMarioBrosEnv.__name__]
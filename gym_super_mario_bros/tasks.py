@@ -179,8 +179,19 @@ def _build_tasks():
     return tuple(tasks)
 
 
+def _index_tasks_by_config(tasks):
+    """Return the first non-alias task for each (game, version, world, stage)."""
+    index = {}
+    for task in tasks:
+        if task.alias_of is None:
+            key = (task.game, task.version, task.world, task.stage)
+            index.setdefault(key, task)
+    return index
+
+
 TASKS = _build_tasks()
 _TASKS_BY_ENV_ID = {task.env_id: task for task in TASKS}
+_TASKS_BY_CONFIG = _index_tasks_by_config(TASKS)
 
 
 def all_tasks(
@@ -242,17 +253,10 @@ def task_for_env_id(env_id):
 
 def task_for_config(game, version, world=None, stage=None):
     """Return task metadata for a game/version/target tuple."""
-    for task in TASKS:
-        if task.alias_of is not None:
-            continue
-        if task.game != game:
-            continue
-        if task.version != version:
-            continue
-        if task.world != world or task.stage != stage:
-            continue
-        return task
-    raise KeyError('no Mario task matches the requested configuration')
+    try:
+        return _TASKS_BY_CONFIG[game, version, world, stage]
+    except KeyError as exc:
+        raise KeyError('no Mario task matches the requested configuration') from exc
 
 
 __all__ = [
@@ -0,0 +1,95 @@
+"""Test cases for the cell archive of emulator states."""
+from unittest import TestCase
+
+import numpy as np
+
+from ..archive import CellArchive
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldRejectInvalidArchiveArguments(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, CellArchive, 1.0)
+        self.assertRaises(ValueError, CellArchive, 0)
+        self.assertRaises(ValueError, CellArchive, 8, policy='random')
+        self.assertRaises(TypeError, CellArchive, 8, x_bucket=None)
+        self.assertRaises(ValueError, CellArchive, 8, y_bucket=0)
+        self.assertRaises(ValueError, CellArchive(8).select, 1)
+
+
+class ShouldArchiveCells:
+    """Test that archived cells restore the states they were inserted from."""
+
+    # the class of the environment to explore
+    env_class = None
+
+    def _explore(self, env, archive, steps=120):
+        """Run right, inserting every state, and return the RAM of each cell."""
+        env.reset()
+        rams = {}
+        for step in range(steps):
+            env.step(0b10000000)
+            if archive.insert(env, float(step)):
+                rams[archive.cell(env)] = env.ram.copy()
+        return rams
+
+    def test(self):
+        env = self.env_class()
+        other = self.env_class()
+        try:
+            archive = CellArchive(64, x_bucket=8)
+            rams = self._explore(env, archive)
+            self.assertGreater(len(archive), 1)
+            self.assertEqual(set(rams), set(archive._slots))
+            for cell, ram in rams.items():
+                observation, info = archive.restore(other, cell)
+                self.assertTrue((ram == other.ram).all())
+                self.assertEqual(cell, archive.cell(other))
+                self.assertEqual(info['x_pos'], other._x_position)
+                self.assertFalse(other.done)
+            observations, infos, cells = archive.restore_batch([env, other], rng=np.random.default_rng(0))
+            self.assertEqual(2, len(observations))
+            self.assertEqual([cell[2] for cell in cells], [info['x_pos'] // 8 for info in infos])
+        finally:
+            env.close()
+            other.close()
+
+    def test_eviction(self):
+        env = self.env_class()
+        try:
+            lru = CellArchive(2, x_bucket=8)
+            score = CellArchive(2, policy='score', x_bucket=8)
+            self._explore(env, lru)
+            self._explore(env, score)
+            self.assertEqual(2, len(lru))
+            self.assertEqual(2, len(score))
+            # both keep the last two cells, which have the highest scores
+            self.assertEqual(list(lru._slots), sorted(lru._slots, key=lru.score))
+            self.assertEqual(set(lru._slots), set(score._slots))
+        finally:
+            env.close()
+
+    def test_mismatched_env(self):
+        env = self.env_class()
+        try:
+            archive = CellArchive(4)
+            env.reset()
+            archive.insert(env, 0.0)
+            archive._key = ('other',)
+            self.assertRaises(ValueError, archive.insert, env, 1.0)
+        finally:
+            env.close()
+
+
+class ShouldArchiveCellsSMB1(ShouldArchiveCells, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldArchiveCellsSMB2(ShouldArchiveCells, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldArchiveCellsSMB3(ShouldArchiveCells, TestCase):
+    env_class = SuperMarioBros3Env
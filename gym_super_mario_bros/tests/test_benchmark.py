@@ -0,0 +1,224 @@
+"""Test cases for the environment micro-benchmarks."""
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from .._app import benchmark as benchmark_cli
+from ..benchmark import benchmark_clone_state
+from ..benchmark import benchmark_digit_decoding
+from ..benchmark import benchmark_env
+from ..benchmark import benchmark_frameskip
+from ..benchmark import benchmark_import_time
+from ..benchmark import benchmark_observation
+from ..benchmark import benchmark_replay
+from ..benchmark import benchmark_reset
+from ..benchmark import benchmark_trace_codec
+from ..benchmark import benchmark_suite
+from ..benchmark import benchmark_task_lookup
+from ..benchmark import benchmark_vector_throughput
+from ..benchmark import find_regressions
+from ..benchmark import RESET_LATENCY_TARGET_US
+
+
+class ShouldBenchmarkDigitDecoding(TestCase):
+    """Test that the digit decoding benchmark reports every decoder."""
+
+    def test(self):
+        result = benchmark_digit_decoding(iterations=2000, batch_size=64)
+
+        self.assertEqual(2000, result['iterations'])
+        for key in ('string_join_ns_per_step', 'arithmetic_ns_per_step', 'batched_ns_per_step'):
+            self.assertIsInstance(result[key], float)
+            self.assertGreater(result[key], 0)
+
+
+class ShouldBenchmarkTaskLookup(TestCase):
+    """Test that the task lookup benchmark reports every lookup."""
+
+    def test(self):
+        result = benchmark_task_lookup(iterations=2000)
+
+        self.assertEqual(2000, result['iterations'])
+        for key in ('scan_ns_per_step', 'index_ns_per_step', 'cached_ns_per_step'):
+            self.assertIsInstance(result[key], float)
+            self.assertGreater(result[key], 0)
+        self.assertIsInstance(result['cached_saving_ns_per_step'], float)
+
+
+class ShouldBenchmarkVectorThroughput(TestCase):
+    """Test that the vector throughput benchmark reports every backend."""
+
+    def test(self):
+        result = benchmark_vector_throughput(num_envs=2, steps=20)
+
+        self.assertEqual(2, result['num_envs'])
+        self.assertGreater(result['async_fps'], 0)
+        self.assertGreater(result['shared_memory_fps'], 0)
+        self.assertGreater(result['in_process_fps'], 0)
+        self.assertGreater(result['shared_memory_speedup'], 0)
+
+
+class ShouldBenchmarkImportTime(TestCase):
+    """Test that lazy registration keeps the package import cheap."""
+
+    def test(self):
+        result = benchmark_import_time(repeats=3)
+
+        self.assertEqual(3, result['repeats'])
+        self.assertEqual(4, result['lazy_registered_ids'])
+        self.assertGreater(result['eager_registered_ids'], 100)
+        self.assertIsInstance(result['lazy_import_ms'], float)
+        self.assertIsInstance(result['eager_import_ms'], float)
+        # importing the package must not load the emulator or task tables
+        for module in result['eager_modules'] + result['lazy_modules']:
+            self.assertFalse(module.startswith('nes_py'), module)
+            self.assertNotIn(module, (
+                'gym_super_mario_bros.smb_env',
+                'gym_super_mario_bros.tasks',
+            ))
+
+
+class ShouldBenchmarkFrameskip(TestCase):
+    """Test that the frame skip benchmark reports both variants."""
+
+    def test(self):
+        result = benchmark_frameskip(steps=50)
+
+        self.assertEqual(4, result['frameskip'])
+        self.assertGreater(result['wrapper_us_per_step'], 0)
+        self.assertGreater(result['native_us_per_step'], 0)
+
+
+class ShouldBenchmarkReplay(TestCase):
+    """Test that the replay benchmark reports both variants."""
+
+    def test(self):
+        result = benchmark_replay(steps=200)
+
+        self.assertEqual(200, result['steps'])
+        for key in ('step_steps_per_second', 'replay_steps_per_second', 'replay_speedup'):
+            self.assertIsInstance(result[key], float)
+            self.assertGreater(result[key], 0)
+
+
+class ShouldBenchmarkReset(TestCase):
+    """Test that the reset benchmark reports both paths and the target."""
+
+    def test(self):
+        result = benchmark_reset(iterations=200)
+
+        self.assertEqual(200, result['iterations'])
+        for key in ('full_reset_us', 'fast_reset_us', 'reset_speedup'):
+            self.assertIsInstance(result[key], float)
+            self.assertGreater(result[key], 0)
+        self.assertEqual(RESET_LATENCY_TARGET_US, result['target_us'])
+        self.assertIsInstance(result['within_target'], bool)
+
+
+class ShouldBenchmarkTraceCodec(TestCase):
+    """Test that the codec benchmark reports every game and state."""
+
+    def test(self):
+        result = benchmark_trace_codec(steps=(0, 20), repeats=2)
+
+        self.assertEqual(3, len(result['environments']))
+        for states in result['environments'].values():
+            self.assertEqual(2, len(states))
+            self.assertLess(states[0]['bytes'], states[1]['bytes'])
+            self.assertGreater(states[1]['replay_decode_us'], 0)
+            self.assertIsInstance(states[1]['replay_decode_us_per_step'], float)
+            # the cache restores a long trace faster than replaying it
+            self.assertLess(states[1]['cached_decode_us'], states[1]['replay_decode_us'])
+
+
+class ShouldBenchmarkCloneState(TestCase):
+    """Test that the clone benchmark reports round trips for every game."""
+
+    def test(self):
+        result = benchmark_clone_state(iterations=50, steps=10)
+
+        self.assertEqual(3, len(result['environments']))
+        for timing in result['environments'].values():
+            self.assertGreater(timing['clone_us'], 0)
+            self.assertGreater(timing['restore_us'], 0)
+            self.assertGreater(timing['round_trips_per_second'], 0)
+
+
+class ShouldBenchmarkObservation(TestCase):
+    """Test that the observation benchmark reports both variants."""
+
+    def test(self):
+        result = benchmark_observation(iterations=200)
+
+        self.assertEqual(200, result['iterations'])
+        self.assertIn(result['wrapper_backend'], ('opencv', 'numpy'))
+        self.assertGreater(result['wrapper_ns_per_observation'], 0)
+        self.assertGreater(result['native_ns_per_observation'], 0)
+
+
+class ShouldBenchmarkEnv(TestCase):
+    """Test that the per-environment benchmark reports every cost."""
+
+    def test(self):
+        result = benchmark_env('SuperMarioBros-1-1-v0', steps=20, repeats=1)
+
+        for metric in ('construction_ms', 'reset_us', 'step_us', 'get_info_us', 'get_reward_us'):
+            self.assertGreater(result[metric], 0)
+        self.assertAlmostEqual(1e6, result['step_us'] * result['steps_per_second'])
+
+
+class ShouldBenchmarkSuite(TestCase):
+    """Test that the suite results serialize to JSON by environment."""
+
+    def test(self):
+        result = benchmark_suite(env_ids=['SuperMarioBros3-v0'], steps=10, repeats=1)
+
+        self.assertEqual(['SuperMarioBros3-v0'], list(result['results']))
+        self.assertEqual(dict(steps=10, repeats=1, seed=0), result['settings'])
+        self.assertEqual(result, json.loads(json.dumps(result)))
+
+
+class ShouldFindRegressions(TestCase):
+    """Test that regressions compare costs of shared environments."""
+
+    def test(self):
+        baseline = dict(results={
+            'a': dict(step_us=10.0, reset_us=100.0, steps_per_second=1e5),
+            'b': dict(step_us=10.0),
+        })
+        current = dict(results={
+            'a': dict(step_us=13.0, reset_us=110.0, steps_per_second=1.0),
+            'c': dict(step_us=99.0),
+        })
+        regressions = find_regressions(baseline, current, tolerance=0.2)
+
+        self.assertEqual(1, len(regressions))
+        self.assertEqual('a', regressions[0]['env_id'])
+        self.assertEqual('step_us', regressions[0]['metric'])
+        self.assertAlmostEqual(1.3, regressions[0]['ratio'])
+        self.assertEqual([], find_regressions(baseline, current, tolerance=0.5))
+        # resets above the budget regress with or without a baseline
+        over = find_regressions(None, current, reset_budget_us=105.0)
+        self.assertEqual(1, len(over))
+        self.assertEqual('reset_us', over[0]['metric'])
+        self.assertEqual(105.0, over[0]['budget'])
+        self.assertEqual([], find_regressions(None, current, reset_budget_us=None))
+
+
+class ShouldRunBenchmarkCommand(TestCase):
+    """Test that the benchmark command writes JSON and flags regressions."""
+
+    def test(self):
+        directory = tempfile.mkdtemp()
+        output = os.path.join(directory, 'results.json')
+        argv = ['--env', 'SuperMarioBros-1-1-v0', '--steps', '10', '--repeats', '1', '--output', output]
+        # a generous reset budget keeps the exit status independent of load
+        self.assertEqual(0, benchmark_cli.main(argv + ['--reset-budget-us', '1e9']))
+        with open(output) as results:
+            self.assertIn('SuperMarioBros-1-1-v0', json.load(results)['results'])
+        baseline = os.path.join(directory, 'baseline.json')
+        with open(baseline, 'w') as results:
+            json.dump(dict(results={'SuperMarioBros-1-1-v0': dict(step_us=1e-9)}), results)
+        self.assertEqual(1, benchmark_cli.main(argv + ['--reset-budget-us', '1e9', '--baseline', baseline]))
+        self.assertEqual(1, benchmark_cli.main(argv + ['--reset-budget-us', '1e-9']))
@@ -0,0 +1,79 @@
+"""Test cases for cloning and restoring environment states."""
+from unittest import TestCase
+
+import numpy as np
+
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldCloneAndRestoreStates:
+    """Test that restored handles continue like the states they clone."""
+
+    # the class of the environment to clone
+    env_class = None
+
+    def _attributes(self, env):
+        """Return the snapshot attributes of an environment."""
+        return {name: getattr(env, name) for name in env._SNAPSHOT_ATTRIBUTES}
+
+    def test(self):
+        env = self.env_class()
+        try:
+            env.reset()
+            for action in np.random.RandomState(0).randint(0, 256, size=50).tolist():
+                if env.step(action)[2]:
+                    break
+            handle = env.clone_state()
+            ram = env.ram.copy()
+            attributes = self._attributes(env)
+            expected = env.step(0b10000001)[1:4]
+            # a handle restores any number of times, as tree search needs
+            for _ in range(2):
+                for _ in range(20):
+                    env.step(0b10000010)
+                env.restore_state(handle)
+                self.assertTrue((ram == env.ram).all())
+                self.assertEqual(attributes, self._attributes(env))
+                self.assertEqual(expected, env.step(0b10000001)[1:4])
+        finally:
+            env.close()
+
+    def test_other_env(self):
+        env = self.env_class()
+        other = self.env_class()
+        try:
+            env.reset()
+            for _ in range(30):
+                env.step(0b10000000)
+            other.reset()
+            other.restore_state(env.clone_state())
+            self.assertTrue((env.ram == other.ram).all())
+            self.assertEqual(env.step(0)[1:4], other.step(0)[1:4])
+        finally:
+            env.close()
+            other.close()
+
+    def test_mismatched_target(self):
+        env = self.env_class()
+        other = self.env_class(target=(1, 2))
+        try:
+            env.reset()
+            other.reset()
+            self.assertRaises(ValueError, other.restore_state, env.clone_state())
+        finally:
+            env.close()
+            other.close()
+
+
+class ShouldCloneAndRestoreStatesSMB1(ShouldCloneAndRestoreStates, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldCloneAndRestoreStatesSMB2(ShouldCloneAndRestoreStates, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldCloneAndRestoreStatesSMB3(ShouldCloneAndRestoreStates, TestCase):
+    env_class = SuperMarioBros3Env
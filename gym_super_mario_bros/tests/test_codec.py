@@ -0,0 +1,109 @@
+"""Test cases for the trace codec."""
+from unittest import TestCase
+
+import numpy as np
+
+from ..codec import TraceCodec
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldRoundTripEncodedStates:
+    """Test that decoded states continue like the states they encode."""
+
+    # the class of the environment to encode
+    env_class = None
+
+    def test(self):
+        env = self.env_class()
+        other = self.env_class()
+        try:
+            self.assertRaises(TypeError, TraceCodec, env, level=1.0)
+            self.assertRaises(ValueError, TraceCodec, env, level=10)
+            self.assertRaises(ValueError, TraceCodec, env, cache_size=-1)
+            codec = TraceCodec(env)
+            env.reset()
+            actions = []
+            for action in np.random.RandomState(0).randint(0, 256, size=100).tolist():
+                actions.append(action)
+                if env.step(action)[2]:
+                    break
+            data = codec.encode(env, actions)
+            self.assertLess(len(data), 512)
+            TraceCodec(env, cache_size=0).decode(data, other)
+            self.assertTrue((env.ram == other.ram).all())
+            for name in env._SNAPSHOT_ATTRIBUTES:
+                self.assertEqual(getattr(env, name), getattr(other, name))
+            self.assertEqual(env.step(0b10000001)[1:4], other.step(0b10000001)[1:4])
+            # a wrong trace no longer reaches the encoded RAM
+            wrong = codec.encode(env, actions[:-1])
+            self.assertRaises(RuntimeError, codec.decode, wrong, other)
+            self.assertRaises(ValueError, codec.encode, env, [256])
+            self.assertRaises(TypeError, codec.encode, env, [0.5])
+        finally:
+            env.close()
+            other.close()
+
+    def _count_frames(self, env):
+        """Count the frames an environment emulates from now on."""
+        frames = []
+        frame_advance = env._frame_advance
+
+        def counted(action):
+            frames.append(action)
+            frame_advance(action)
+
+        env._frame_advance = counted
+        return frames
+
+    def test_decode_cost(self):
+        env = self.env_class()
+        other = self.env_class()
+        try:
+            codec = TraceCodec(env)
+            env.reset()
+            other.reset()
+            actions = [0b10000000] * 40
+            live = self._count_frames(env)
+            for action in actions:
+                env.step(action)
+            data = codec.encode(env, actions)
+            frames = self._count_frames(other)
+            # a codec without the snapshot emulates no more than the episode
+            TraceCodec(env, cache_size=0).decode(data, other)
+            self.assertLessEqual(len(frames), len(live))
+            for _ in range(20):
+                other.step(0b10000010)
+            del frames[:]
+            # the codec that encoded the state restores it without emulating
+            codec.decode(data, other)
+            self.assertEqual([], frames)
+            self.assertTrue((env.ram == other.ram).all())
+            self.assertEqual(env.step(0b10000001)[1:4], other.step(0b10000001)[1:4])
+        finally:
+            env.close()
+            other.close()
+
+    def test_mismatched_env(self):
+        env = self.env_class()
+        other = self.env_class(frameskip=2)
+        try:
+            codec = TraceCodec(env)
+            env.reset()
+            self.assertRaises(ValueError, codec.decode, codec.encode(env, []), other)
+        finally:
+            env.close()
+            other.close()
+
+
+class ShouldRoundTripEncodedStatesSMB1(ShouldRoundTripEncodedStates, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldRoundTripEncodedStatesSMB2(ShouldRoundTripEncodedStates, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldRoundTripEncodedStatesSMB3(ShouldRoundTripEncodedStates, TestCase):
+    env_class = SuperMarioBros3Env
@@ -0,0 +1,92 @@
+"""Test cases for the curriculum sampler and wrapper."""
+from unittest import TestCase
+
+import numpy as np
+
+from .._registration import make
+from ..curriculum import Curriculum
+from ..curriculum import CurriculumSampler
+from ..tasks import all_tasks
+
+
+class ShouldRejectInvalidSamplerArguments(TestCase):
+    def test(self):
+        self.assertRaises(ValueError, CurriculumSampler, tasks=[])
+        self.assertRaises(ValueError, CurriculumSampler, tasks=['SuperMarioBros-v0'])
+        self.assertRaises(ValueError, CurriculumSampler, weighting='hard')
+        self.assertRaises(ValueError, CurriculumSampler, temperature=0)
+        self.assertRaises(ValueError, CurriculumSampler, exploration=1.5)
+        self.assertRaises(ValueError, CurriculumSampler, decay=1)
+
+
+class ShouldDefaultToTrainStages(TestCase):
+    def test(self):
+        sampler = CurriculumSampler()
+        self.assertEqual(all_tasks(split='train', single_stage=True), sampler.tasks)
+        self.assertEqual((len(sampler),), sampler.episodes.shape)
+        self.assertAlmostEqual(1.0, sampler.probabilities().sum())
+
+
+class ShouldRecordEpisodeStatistics(TestCase):
+    def test(self):
+        sampler = CurriculumSampler(tasks=['SuperMarioBros-1-1-v0', 'SuperMarioBros-4-2-v0'], decay=0.5)
+        sampler.update('SuperMarioBros-1-1-v0', True, 100.0)
+        sampler.update(0, False, 50.0)
+        sampler.update(sampler.tasks[1], False, 10.0)
+        self.assertEqual([2, 1], sampler.episodes.tolist())
+        self.assertEqual([1, 0], sampler.successes.tolist())
+        self.assertEqual([150.0, 10.0], sampler.return_sum.tolist())
+        self.assertEqual([0.25, 0.0], sampler.success_rate.tolist())
+        self.assertEqual([50.0, 5.0], sampler.mean_return.tolist())
+        summary = sampler.summary()
+        self.assertEqual('SuperMarioBros-1-1-v0', summary[0]['task_id'])
+        self.assertEqual(75.0, summary[0]['mean_return'])
+        self.assertRaises(KeyError, sampler.update, 'SuperMarioBros-8-4-v0', True, 0.0)
+
+
+class ShouldWeightTasks(TestCase):
+    def test(self):
+        tasks = ['SuperMarioBros-1-1-v0', 'SuperMarioBros-1-2-v0', 'SuperMarioBros3-1-1-v0']
+        sampler = CurriculumSampler(tasks=tasks, exploration=0.0, decay=0.0, seed=0)
+        sampler.update(0, True, 0.0)
+        # failure weighting never samples the solved task
+        self.assertEqual([0.0, 0.5, 0.5], sampler.probabilities().tolist())
+        self.assertEqual([0.0, 1.0, 0.0], sampler.probabilities('smb1', 0).tolist())
+        self.assertEqual([0.0, 0.0, 1.0], sampler.probabilities('smb3', 0).tolist())
+        self.assertRaises(ValueError, sampler.probabilities, 'smb2_usa', 0)
+        samples = sampler.sample(size=100)
+        self.assertNotIn(0, samples.tolist())
+        self.assertIsInstance(sampler.sample(), int)
+        # exploration keeps every task reachable
+        sampler.exploration = 0.3
+        self.assertTrue(np.allclose([0.1, 0.45, 0.45], sampler.probabilities()))
+        sampler.weighting = lambda sampler: np.array([1.0, 0.0, 3.0])
+        sampler.exploration = 0.0
+        self.assertEqual([0.25, 0.0, 0.75], sampler.probabilities().tolist())
+        sampler.weighting = lambda sampler: np.ones(2)
+        self.assertRaises(ValueError, sampler.probabilities)
+        self.assertEqual(dict(target=(1, 2)), sampler.reset_options(1))
+
+
+class ShouldSwitchTasksOnReset(TestCase):
+    def test(self):
+        tasks = ['SuperMarioBros-1-1-v0', 'SuperMarioBros-4-2-v0', 'SuperMarioBros3-1-1-v0']
+        sampler = CurriculumSampler(tasks=tasks, seed=0)
+        env = Curriculum(make('SuperMarioBros-1-1-v0', max_episode_steps=20), sampler)
+        try:
+            self.assertRaises(ValueError, env.step, 0)
+            seen = set()
+            for _ in range(6):
+                _, info = env.reset()
+                self.assertIn(env.task_index, (0, 1))
+                self.assertEqual(tasks[env.task_index], info['task_id'])
+                seen.add(env.task_index)
+                done = False
+                while not done:
+                    _, _, terminated, truncated, _ = env.step(0)
+                    done = terminated or truncated
+            self.assertEqual({0, 1}, seen)
+            self.assertEqual(6, sampler.episodes.sum())
+            self.assertEqual(0, sampler.episodes[2])
+        finally:
+            env.close()
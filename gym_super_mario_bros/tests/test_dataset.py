@@ -0,0 +1,62 @@
+"""Test cases for the memory-mapped transition datasets."""
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from ..dataset import MarioDataset
+from ..dataset import export_dataset
+
+
+class ShouldRejectInvalidExportArguments(TestCase):
+    def test(self):
+        path = os.path.join(tempfile.mkdtemp(), 'dataset')
+        self.assertRaises(TypeError, export_dataset, 'SuperMarioBros-1-1-v0', path, 1.5)
+        self.assertRaises(ValueError, export_dataset, 'SuperMarioBros-1-1-v0', path, 0)
+        self.assertRaises(ValueError, export_dataset, 'SuperMarioBros-1-1-v0', path, 10, shard_size=0)
+        self.assertRaises(ValueError, export_dataset, 'SuperMarioBros-1-1-v0', path, 10, info_mode='dict')
+        self.assertFalse(os.path.exists(path))
+
+
+class ShouldExportAndSampleTransitions:
+    """Test that exported transitions read back from memory-mapped shards."""
+
+    # the ID of the environment to collect from
+    env_id = None
+
+    def test(self):
+        path = os.path.join(tempfile.mkdtemp(), 'dataset')
+        export_dataset(self.env_id, path, 40, shard_size=16, seed=0, obs_type='gray84')
+        dataset = MarioDataset(path)
+        self.assertEqual(40, len(dataset))
+        self.assertEqual([16, 16, 8], [shard['rows'] for shard in dataset.manifest['shards']])
+        self.assertIn('info.reward_total_clipped', dataset.columns)
+        column = dataset.column(1, 'observation')
+        self.assertIsInstance(column, np.memmap)
+        self.assertEqual((16, 84, 84), column.shape)
+        batch = dataset.batch([3, 17, 39, 17], columns=['observation', 'reward'])
+        self.assertEqual({'observation', 'reward'}, set(batch))
+        self.assertTrue((batch['observation'][1] == column[1]).all())
+        self.assertTrue((batch['observation'][1] == batch['observation'][3]).all())
+        self.assertEqual(np.float32, batch['reward'].dtype)
+        # rewards match the info totals of the same step
+        everything = dataset.batch(np.arange(40))
+        self.assertTrue(np.allclose(everything['info.reward_total_clipped'], everything['reward']))
+        sample = dataset.sample(8, rng=np.random.default_rng(0))
+        self.assertEqual(set(dataset.columns), set(sample))
+        self.assertEqual((8, 84, 84), sample['observation'].shape)
+        self.assertRaises(IndexError, dataset.batch, [40])
+        self.assertRaises(KeyError, dataset.batch, [0], columns=['frames'])
+
+
+class ShouldExportAndSampleTransitionsSMB1(ShouldExportAndSampleTransitions, TestCase):
+    env_id = 'SuperMarioBros-1-1-v0'
+
+
+class ShouldExportAndSampleTransitionsSMB2(ShouldExportAndSampleTransitions, TestCase):
+    env_id = 'SuperMarioBros2USA-v0'
+
+
+class ShouldExportAndSampleTransitionsSMB3(ShouldExportAndSampleTransitions, TestCase):
+    env_id = 'SuperMarioBros3-v0'
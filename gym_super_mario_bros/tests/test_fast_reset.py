@@ -0,0 +1,69 @@
+"""Test cases for resets that restore the reset template."""
+from unittest import TestCase
+
+from nes_py import NESEnv
+
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldMatchFullReset:
+    """Test that template resets match the full nes-py reset."""
+
+    # the class of the environment to reset
+    env_class = None
+
+    def _assert_same_reset(self, info_mode):
+        env = self.env_class(info_mode=info_mode)
+        try:
+            self.assertIsNone(env._reset_templates)
+            env.reset()
+            self.assertIsNotNone(env._reset_templates)
+            for _ in range(30):
+                env.step(0b10000001)
+            _, expected = NESEnv.reset(env, seed=1)
+            expected_ram = env.ram.copy()
+            expected_attributes = {name: getattr(env, name) for name in env._SNAPSHOT_ATTRIBUTES}
+            if info_mode == 'array':
+                expected = expected['record'].copy()
+            for _ in range(30):
+                env.step(0b10000001)
+            observation, info = env.reset(seed=1)
+            if info_mode == 'array':
+                info = info['record']
+            self.assertEqual(expected, info)
+            self.assertTrue((expected_ram == env.ram).all())
+            self.assertTrue((observation == env.screen).all())
+            for name, value in expected_attributes.items():
+                self.assertEqual(value, getattr(env, name))
+            self.assertEqual(0.0, env._last_reward_unclipped)
+            self.assertFalse(env.done)
+            # the info of a template reset is not shared with later resets
+            if info_mode == 'dict':
+                info['reward_components']['progress'] = 1.0
+                self.assertEqual(0.0, env.reset()[1]['reward_components']['progress'])
+            # stepping after a template reset matches a full reset
+            expected_step = env.step(0b10000001)[1:4]
+            NESEnv.reset(env)
+            self.assertEqual(expected_step, env.step(0b10000001)[1:4])
+        finally:
+            env.close()
+
+    def test_dict(self):
+        self._assert_same_reset('dict')
+
+    def test_array(self):
+        self._assert_same_reset('array')
+
+
+class ShouldMatchFullResetSMB1(ShouldMatchFullReset, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldMatchFullResetSMB2(ShouldMatchFullReset, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldMatchFullResetSMB3(ShouldMatchFullReset, TestCase):
+    env_class = SuperMarioBros3Env
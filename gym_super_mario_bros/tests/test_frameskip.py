@@ -0,0 +1,89 @@
+"""Test cases for native frame skipping in the environments."""
+from collections import Counter
+from unittest import TestCase
+
+import numpy as np
+
+from .._frameskip import validate_frameskip
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldValidateFrameskip(TestCase):
+    def test(self):
+        validate_frameskip(1, False)
+        validate_frameskip(4, True)
+        self.assertRaises(TypeError, validate_frameskip, 4.0, False)
+        self.assertRaises(TypeError, validate_frameskip, True, False)
+        self.assertRaises(ValueError, validate_frameskip, 0, False)
+        self.assertRaises(TypeError, validate_frameskip, 4, 1)
+        self.assertRaises(ValueError, validate_frameskip, 1, True)
+        self.assertRaises(TypeError, SuperMarioBrosEnv, frameskip='4')
+        self.assertRaises(ValueError, SuperMarioBros2Env, frameskip=0)
+        self.assertRaises(ValueError, SuperMarioBros3Env, max_pool=True)
+
+
+class ShouldSkipFramesNatively:
+    """Test that native frame skipping matches repeated single steps."""
+
+    # the keyword arguments to create the environment with
+    kwargs = {}
+    # the info keys of the final frame that the skipped step must match
+    info_keys = ('x_pos', 'life', 'score')
+
+    def test(self):
+        single = self.env_class(**self.kwargs)
+        skipping = self.env_class(frameskip=4, max_pool=True, **self.kwargs)
+        try:
+            single.reset()
+            skipping.reset()
+            for action in [128, 129, 130, 0, 131]:
+                rewards = 0.0
+                for frame in range(4):
+                    if frame == 3:
+                        previous = single.screen.copy()
+                    screen, reward, terminated, truncated, info = single.step(action)
+                    rewards += reward
+                    self.assertFalse(terminated or truncated)
+                pooled, skip_reward, _, _, skip_info = skipping.step(action)
+                self.assertAlmostEqual(rewards, skip_reward)
+                self.assertAlmostEqual(skip_reward, skip_info['reward_total_clipped'])
+                for key in self.info_keys:
+                    self.assertEqual(info[key], skip_info[key], key)
+                self.assertTrue((np.maximum(previous, screen) == pooled).all())
+        finally:
+            single.close()
+            skipping.close()
+
+    def test_builds_info_once_per_step(self):
+        env = self.env_class(frameskip=4, **self.kwargs)
+        try:
+            env.reset()
+            calls = Counter()
+            for name in ('_get_reward', '_get_info', '_observer'):
+                method = getattr(env, name)
+                setattr(env, name, lambda *args, method=method, name=name: calls.update([name]) or method(*args))
+            for _ in range(5):
+                env.step(0b10000000)
+            # every frame keeps its reward, but only the step builds an info
+            # and an observation, where a wrapper builds one per frame
+            self.assertEqual(dict(_get_reward=20, _get_info=5, _observer=5), dict(calls))
+        finally:
+            env.close()
+
+
+class ShouldSkipFramesNativelySMB1(ShouldSkipFramesNatively, TestCase):
+    env_class = SuperMarioBrosEnv
+    kwargs = dict(target=(1, 1))
+
+
+class ShouldSkipFramesNativelySMB2(ShouldSkipFramesNatively, TestCase):
+    env_class = SuperMarioBros2Env
+    # SMB2 USA has no score counter
+    info_keys = ('x_pos', 'life', 'coins')
+
+
+class ShouldSkipFramesNativelySMB3(ShouldSkipFramesNatively, TestCase):
+    env_class = SuperMarioBros3Env
+    kwargs = dict(target=(1, 1))
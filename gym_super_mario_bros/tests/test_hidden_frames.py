@@ -0,0 +1,91 @@
+"""Test cases for the hidden frame counts of the skip loops."""
+from unittest import TestCase
+
+import numpy as np
+
+from .._hidden_frames import HiddenFrameCounter
+from .._hidden_frames import write_hidden_frames
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldCountHiddenFrames(TestCase):
+    def test(self):
+        counter = HiddenFrameCounter(('a', 'b'))
+        counter.add('a', 3)
+        counter.add('b', 2)
+        self.assertEqual(5, counter.step)
+        counter.start_step()
+        counter.add('a', 1)
+        self.assertEqual(dict(a=4, b=2), counter.summary()['episode'])
+        counter.start_episode()
+        summary = counter.summary()
+        self.assertEqual(0, summary['step'])
+        self.assertEqual(0, summary['episode_frames'])
+        self.assertEqual(dict(a=4, b=2), summary['total'])
+        self.assertEqual(6, summary['total_frames'])
+
+
+class ShouldWriteHiddenFrames(TestCase):
+    def test(self):
+        info = dict(hidden_frames=0)
+        write_hidden_frames(info, 7)
+        self.assertEqual(7, info['hidden_frames'])
+        record = np.zeros((), dtype=[('hidden_frames', np.int64)])
+        write_hidden_frames(dict(record=record), 9)
+        self.assertEqual(9, record['hidden_frames'])
+
+
+class ShouldReportSkipLoopFrames(TestCase):
+    def test(self):
+        for info_mode in ('dict', 'array'):
+            env = SuperMarioBrosEnv(info_mode=info_mode)
+            try:
+                _, info = env.reset()
+                steps = []
+                for _ in range(2000):
+                    _, _, terminated, _, info = env.step(0b10000000)
+                    if info_mode == 'array':
+                        info = info['record']
+                    steps.append(int(info['hidden_frames']))
+                    if terminated or int(info['life']) < 2:
+                        break
+                summary = env.hidden_frames.summary()
+                # losing a life runs the death and between-life skip loops
+                self.assertGreater(max(steps), 0)
+                self.assertEqual(sum(steps), summary['episode_frames'])
+                self.assertGreater(summary['episode']['_skip_occupied_states'], 0)
+                env.reset()
+                self.assertEqual(0, env.hidden_frames.summary()['episode_frames'])
+                self.assertEqual(sum(steps), env.hidden_frames.summary()['total_frames'])
+            finally:
+                env.close()
+
+
+class ShouldReportNoHiddenFrames:
+    """Test that environments without skip loops report no hidden frames."""
+
+    # the keyword arguments to create the environment with
+    kwargs = {}
+
+    def test(self):
+        env = self.env_class(**self.kwargs)
+        try:
+            self.assertEqual((), env.hidden_frames.phases)
+            _, info = env.reset()
+            self.assertEqual(0, info['hidden_frames'])
+            for _ in range(10):
+                _, _, _, _, info = env.step(0b10000000)
+                self.assertEqual(0, info['hidden_frames'])
+        finally:
+            env.close()
+
+
+class ShouldReportNoHiddenFramesSMB2(ShouldReportNoHiddenFrames, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldReportNoHiddenFramesSMB3(ShouldReportNoHiddenFrames, TestCase):
+    env_class = SuperMarioBros3Env
+    kwargs = dict(target=(1, 1))
@@ -0,0 +1,84 @@
+"""Test cases for the array info mode of the environments."""
+from unittest import TestCase
+
+import numpy as np
+
+from .._info_record import record_dtype
+from .._info_record import validate_info_mode
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldValidateInfoMode(TestCase):
+    def test(self):
+        validate_info_mode('dict')
+        validate_info_mode('array')
+        self.assertRaises(TypeError, validate_info_mode, None)
+        self.assertRaises(ValueError, validate_info_mode, 'list')
+        self.assertRaises(TypeError, SuperMarioBrosEnv, info_mode=1)
+        self.assertRaises(ValueError, SuperMarioBros2Env, info_mode='records')
+        self.assertRaises(ValueError, SuperMarioBros3Env, info_mode='')
+
+
+class ShouldBuildRecordDtype(TestCase):
+    def test(self):
+        dtype = record_dtype([('x_pos', np.int64), ('flags', np.uint8, (2,))], ('progress',))
+        self.assertEqual(
+            ('x_pos', 'flags', 'reward_components', 'reward_total_unclipped', 'reward_total_clipped'),
+            dtype.names,
+        )
+        self.assertEqual(('progress',), dtype['reward_components'].names)
+        self.assertEqual((2,), dtype['flags'].shape)
+
+
+class ShouldWriteArrayInfo:
+    """Test that array info records match the dictionary info."""
+
+    # the keyword arguments to create the environment with
+    kwargs = {}
+
+    def _assert_record_matches(self, record, info):
+        for name in record.dtype.names:
+            if name == 'reward_components':
+                for component in record.dtype[name].names:
+                    self.assertEqual(info[name][component], record[name][component])
+            elif name == 'enemy_types':
+                self.assertEqual(info[name], tuple(record[name].tolist()))
+            else:
+                self.assertEqual(info[name], record[name].item(), name)
+
+    def test(self):
+        dict_env = self.env_class(**self.kwargs)
+        array_env = self.env_class(info_mode='array', **self.kwargs)
+        try:
+            _, info = dict_env.reset()
+            _, array_info = array_env.reset()
+            record = array_info['record']
+            self.assertEqual((), record.shape)
+            self.assertEqual(self.env_class.info_dtype, record.dtype)
+            self._assert_record_matches(record, info)
+            for action in [128, 128, 129, 129, 130, 0, 131]:
+                _, reward, _, _, info = dict_env.step(action)
+                _, array_reward, _, _, array_info = array_env.step(action)
+                # the same record is written in place every step
+                self.assertIs(record, array_info['record'])
+                self.assertEqual(reward, array_reward)
+                self._assert_record_matches(record, info)
+        finally:
+            dict_env.close()
+            array_env.close()
+
+
+class ShouldWriteArrayInfoSMB1(ShouldWriteArrayInfo, TestCase):
+    env_class = SuperMarioBrosEnv
+    kwargs = dict(target=(1, 1))
+
+
+class ShouldWriteArrayInfoSMB2(ShouldWriteArrayInfo, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldWriteArrayInfoSMB3(ShouldWriteArrayInfo, TestCase):
+    env_class = SuperMarioBros3Env
+    kwargs = dict(target=(1, 1))
@@ -0,0 +1,181 @@
+"""Test cases for the observation types of the environments."""
+from unittest import TestCase
+
+import numpy as np
+
+from .._features import FEATURE_NAMES
+from .._features import decode_features
+from .._observations import area_weights
+from .._observations import observation_space
+from .._observations import validate_obs_type
+from .._tile_grid import TILE_ENEMY
+from .._tile_grid import TILE_GRID_SHAPE
+from .._tile_grid import TILE_MARIO
+from .._tile_grid import TILE_SOLID
+from .._tile_grid import decode_tile_grid
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+from ..vector_env import MarioVectorEnv
+
+
+class ShouldValidateObsType(TestCase):
+    def test(self):
+        validate_obs_type('gray84', True)
+        validate_obs_type('ram', False)
+        self.assertRaises(TypeError, validate_obs_type, None, False)
+        self.assertRaises(ValueError, validate_obs_type, 'grey', False)
+        self.assertRaises(ValueError, validate_obs_type, 'ram', True)
+        self.assertRaises(ValueError, SuperMarioBrosEnv, obs_type='rgb84')
+        self.assertRaises(ValueError, SuperMarioBros2Env, obs_type='ram', frameskip=2, max_pool=True)
+        self.assertRaises(TypeError, SuperMarioBros3Env, obs_type=84)
+
+
+class ShouldAreaAverage(TestCase):
+    def test(self):
+        weights = area_weights(240, 84)
+        self.assertEqual((84, 240), weights.shape)
+        self.assertEqual(np.float32, weights.dtype)
+        self.assertTrue(np.allclose(1, weights.sum(axis=1)))
+        # integer ratios average disjoint blocks
+        self.assertTrue(np.allclose(np.kron(np.eye(2), [0.5, 0.5]), area_weights(4, 2)))
+
+
+class ShouldDecodeFeatures(TestCase):
+    def test(self):
+        ram = np.zeros(0x800, dtype=np.uint8)
+        ram[[0x006d, 0x0086, 0x03b8, 0x00b5, 0x0057]] = [2, 16, 176, 1, 0xf0]
+        ram[0x07f8:0x07fb] = [3, 9, 8]
+        # an active Goomba in the second enemy slot
+        ram[[0x0010, 0x0017, 0x006f, 0x0088, 0x00d0]] = [1, 6, 2, 100, 160]
+        # an inactive enemy in the third slot
+        ram[[0x0018, 0x0070]] = [7, 3]
+        features = dict(zip(FEATURE_NAMES, decode_features(ram).tolist()))
+        self.assertEqual(528, features['x_pos'])
+        self.assertEqual(79, features['y_pos'])
+        self.assertEqual(-16, features['x_speed'])
+        self.assertEqual(398, features['time'])
+        self.assertEqual(1, features['enemy1_active'])
+        self.assertEqual(6, features['enemy1_type'])
+        self.assertEqual(84, features['enemy1_dx'])
+        self.assertEqual(-16, features['enemy1_dy'])
+        self.assertEqual(0, features['enemy2_type'])
+        self.assertEqual(0, features['enemy2_dx'])
+        batch = decode_features(np.stack([ram, ram]))
+        self.assertEqual((2, len(FEATURE_NAMES)), batch.shape)
+        self.assertEqual(np.float32, batch.dtype)
+        self.assertTrue((batch == decode_features(ram)).all())
+
+
+class ShouldReturnFeatureObservations(TestCase):
+    def test(self):
+        self.assertRaises(ValueError, SuperMarioBros2Env, obs_type='features')
+        self.assertRaises(ValueError, SuperMarioBrosEnv, obs_type='features', frameskip=2, max_pool=True)
+        env = SuperMarioBrosEnv(target=(1, 1), obs_type='features')
+        try:
+            self.assertEqual((len(env.feature_names),), env.observation_space.shape)
+            observation, _ = env.reset()
+            for action in [128, 129, 130, 0]:
+                observation, _, _, _, info = env.step(action)
+                self.assertIn(observation, env.observation_space)
+                features = dict(zip(env.feature_names, observation.tolist()))
+                self.assertEqual(info['x_pos'], features['x_pos'])
+                self.assertEqual(info['y_pos'], features['y_pos'])
+                self.assertEqual(info['time'], features['time'])
+                self.assertEqual(info['player_state'], features['player_state'])
+        finally:
+            env.close()
+
+
+class ShouldReturnObservationTypes:
+    """Test that every observation type matches its observation space."""
+
+    # the keyword arguments to create the environment with
+    kwargs = {}
+
+    def test(self):
+        for obs_type in ('rgb', 'gray', 'gray84', 'ram'):
+            env = self.env_class(obs_type=obs_type, **self.kwargs)
+            try:
+                self.assertEqual(observation_space(obs_type), env.observation_space)
+                observation, _ = env.reset()
+                self.assertIn(observation, env.observation_space)
+                for action in [128, 129, 130, 0]:
+                    observation, _, _, _, _ = env.step(action)
+                self.assertIn(observation, env.observation_space)
+                if obs_type == 'ram':
+                    self.assertTrue((env.ram == observation).all())
+                elif obs_type == 'gray84':
+                    gray = env.observation('grayscale').astype(np.float32)
+                    expected = area_weights(240, 84) @ gray @ area_weights(256, 84).T
+                    self.assertLessEqual(np.abs(expected - observation).max(), 1)
+            finally:
+                env.close()
+
+
+class ShouldReturnObservationTypesSMB1(ShouldReturnObservationTypes, TestCase):
+    env_class = SuperMarioBrosEnv
+    kwargs = dict(target=(1, 1))
+
+
+class ShouldReturnObservationTypesSMB2(ShouldReturnObservationTypes, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldReturnObservationTypesSMB3(ShouldReturnObservationTypes, TestCase):
+    env_class = SuperMarioBros3Env
+    kwargs = dict(target=(1, 1))
+
+
+class ShouldBatchDownsampledObservations(TestCase):
+    def test(self):
+        env = MarioVectorEnv('SuperMarioBros-1-1-v0', 2, obs_type='gray84', frameskip=4, max_pool=True)
+        try:
+            observations, _ = env.reset()
+            self.assertEqual((2, 84, 84), observations.shape)
+            observations, _, _, _, _ = env.step([0b10000000, 0])
+            self.assertEqual((2, 84, 84), observations.shape)
+        finally:
+            env.close()
+
+
+class ShouldDecodeTileGrid(TestCase):
+    def test(self):
+        ram = np.zeros(0x800, dtype=np.uint8)
+        # Mario at level x 300, 44 pixels from the left of the screen
+        ram[[0x006d, 0x0086, 0x071c, 0x03b8, 0x00b5]] = [1, 44, 0, 176, 1]
+        # ground along the bottom row of both metatile pages
+        ram[0x0500 + 12 * 16:0x0500 + 13 * 16] = 0x54
+        ram[0x05d0 + 12 * 16:0x05d0 + 13 * 16] = 0x54
+        # a block in the fourth column of the second page
+        ram[0x05d0 + 5 * 16 + 3] = 0xc0
+        # an active enemy at level x 356
+        ram[[0x000f, 0x006e, 0x0087, 0x00cf, 0x00b6]] = [1, 1, 100, 160, 1]
+        grid = decode_tile_grid(ram)
+        self.assertEqual(TILE_GRID_SHAPE, grid.shape)
+        self.assertEqual(np.uint8, grid.dtype)
+        self.assertTrue((grid[12] == TILE_SOLID).all())
+        self.assertEqual(TILE_SOLID, grid[5, 3])
+        self.assertEqual(TILE_ENEMY, grid[8, 6])
+        self.assertEqual(TILE_MARIO, grid[9, 3])
+        self.assertEqual(16 + 3, np.count_nonzero(grid))
+        batch = decode_tile_grid(np.stack([ram, np.zeros_like(ram)]))
+        self.assertEqual((2,) + TILE_GRID_SHAPE, batch.shape)
+        self.assertTrue((batch[0] == grid).all())
+        self.assertFalse(batch[1].any())
+
+
+class ShouldReturnTileGridObservations(TestCase):
+    def test(self):
+        self.assertRaises(ValueError, SuperMarioBros3Env, obs_type='tiles')
+        env = MarioVectorEnv('SuperMarioBros-1-1-v0', 2, obs_type='tiles')
+        try:
+            observations, _ = env.reset()
+            self.assertEqual((2,) + TILE_GRID_SHAPE, observations.shape)
+            for _ in range(4):
+                observations, _, _, _, _ = env.step([0b10000000, 0])
+            for index, sub_env in enumerate(env.envs):
+                self.assertTrue((decode_tile_grid(sub_env.ram) == observations[index]).all())
+                self.assertEqual(1, np.count_nonzero(observations[index] == TILE_MARIO))
+        finally:
+            env.close()
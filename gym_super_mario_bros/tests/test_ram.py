@@ -0,0 +1,117 @@
+"""Test cases for declarative RAM field tables."""
+from unittest import TestCase
+
+import numpy as np
+
+from .._ram import RamTable
+from .._ram import decode_digits
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldGatherRamFields(TestCase):
+    """Test address expansion and gathering for RAM field tables."""
+
+    def test_fields_expand_to_unique_addresses(self):
+        table = RamTable(world=0x075f, score=(0x07de, 3), alias=0x07df)
+
+        self.assertEqual(4, len(table))
+        self.assertEqual([0x075f, 0x07de, 0x07df, 0x07e0], table.addresses.tolist())
+        self.assertEqual(range(0x07de, 0x07e1), table.field_addresses('score'))
+        self.assertIn(0x07e0, table)
+        self.assertNotIn(0x07e1, table)
+
+    def test_gather_returns_python_integers(self):
+        ram = np.arange(0x800, dtype=np.uint16).astype(np.uint8)
+        table = RamTable(a=0x0010, b=(0x0100, 2))
+
+        snapshot = table.gather(ram)
+
+        self.assertEqual({0x0010: 0x10, 0x0100: 0x00, 0x0101: 0x01}, snapshot)
+        self.assertTrue(all(type(value) is int for value in snapshot.values()))
+
+    def test_rejects_empty_fields(self):
+        self.assertRaises(ValueError, RamTable, score=(0x07de, 0))
+
+
+class _RecordingRam(np.ndarray):
+    """A RAM view that records scalar reads."""
+
+    reads = None
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            _RecordingRam.reads.add(int(key))
+        return super().__getitem__(key)
+
+
+class ShouldDecodeStepRamOnce:
+    """Test that reward and info code only reads the decoded snapshot."""
+
+    def test(self):
+        env = self.env_class(render_mode='rgb_array')
+        try:
+            env.reset()
+            env.step(0)
+            ram = env.unwrapped.ram
+            env.unwrapped.ram = ram.view(_RecordingRam)
+            _RecordingRam.reads = set()
+            env.unwrapped._get_reward()
+            env.unwrapped._get_terminated()
+            info = env.unwrapped._get_info()
+            self.assertEqual(set(), _RecordingRam.reads)
+            self.assertIsNone(env.unwrapped._ram_snapshot)
+            # after the info is built the properties read live RAM again
+            env.unwrapped.ram = ram
+            self.assertEqual(info['x_pos'], env.unwrapped._x_position)
+        finally:
+            env.close()
+
+
+class ShouldDecodeSuperMarioBrosRamOnce(ShouldDecodeStepRamOnce, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldDecodeSuperMarioBros2UsaRamOnce(ShouldDecodeStepRamOnce, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldDecodeSuperMarioBros3RamOnce(ShouldDecodeStepRamOnce, TestCase):
+    env_class = SuperMarioBros3Env
+
+
+class ShouldDecodeDecimalDigits(TestCase):
+    """Test arithmetic decoding of one-digit-per-byte counters."""
+
+    def test_single_counter(self):
+        self.assertEqual(0, decode_digits(np.zeros(6, dtype=np.uint8)))
+        self.assertEqual(100, decode_digits(np.array([0, 0, 0, 1, 0, 0], dtype=np.uint8)))
+        self.assertEqual(999990, decode_digits([9, 9, 9, 9, 9, 0]))
+
+    def test_batch_of_counters(self):
+        digits = np.array([[4, 0, 0], [0, 0, 7], [1, 2, 3]], dtype=np.uint8)
+
+        self.assertEqual([400, 7, 123], decode_digits(digits).tolist())
+
+    def test_matches_string_join(self):
+        random = np.random.RandomState(0)
+        for length in range(1, 7):
+            for digits in random.randint(0, 10, size=(20, length)):
+                expected = int(''.join(map(str, digits)))
+                self.assertEqual(expected, decode_digits(digits))
+
+    def test_table_decodes_digit_fields(self):
+        ram = np.zeros(0x800, dtype=np.uint8)
+        ram[0x07de:0x07e4] = [0, 1, 2, 3, 4, 0]
+        ram[0x07f8:0x07fb] = [4, 0, 0]
+        table = RamTable(score=(0x07de, 6, 'digits'), time=(0x07f8, 3, 'digits'))
+
+        snapshot = table.gather(ram)
+
+        self.assertEqual(12340, snapshot[(0x07de, 6)])
+        self.assertEqual(400, snapshot[(0x07f8, 3)])
+        self.assertEqual(4, snapshot[0x07f8])
+
+    def test_rejects_unknown_encodings(self):
+        self.assertRaises(ValueError, RamTable, score=(0x07de, 6, 'bcd'))
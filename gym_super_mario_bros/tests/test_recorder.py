@@ -0,0 +1,106 @@
+"""Test cases for the episode recorder and seekable replay."""
+import os
+import tempfile
+from unittest import TestCase
+
+from nes_py.wrappers import JoypadSpace
+import numpy as np
+
+from .._registration import make
+from ..actions import SIMPLE_MOVEMENT
+from ..recorder import EpisodeRecorder
+from ..recorder import EpisodeReplay
+from ..recorder import replay
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldRejectInvalidRecorderArguments(TestCase):
+    def test(self):
+        path = os.path.join(tempfile.mkdtemp(), 'recording.zip')
+        env = SuperMarioBrosEnv()
+        try:
+            self.assertRaises(ValueError, EpisodeRecorder, env, path)
+        finally:
+            env.close()
+        recorder = EpisodeRecorder(make('SuperMarioBros-1-1-v0'), path)
+        try:
+            self.assertRaises(TypeError, EpisodeRecorder, recorder.env, path, checkpoint_interval=1.5)
+            self.assertRaises(ValueError, EpisodeRecorder, recorder.env, path, checkpoint_interval=0)
+            self.assertRaises(ValueError, recorder.step, 0)
+            recorder.reset()
+            self.assertRaises(ValueError, recorder.step, 256)
+        finally:
+            recorder.close()
+
+
+class ShouldRecordAndSeekEpisodes:
+    """Test that recordings replay to the recorded emulator states."""
+
+    # the ID of the environment to record
+    env_id = None
+
+    def test(self):
+        path = os.path.join(tempfile.mkdtemp(), 'recording.zip')
+        env = JoypadSpace(EpisodeRecorder(make(self.env_id), path, checkpoint_interval=16), SIMPLE_MOVEMENT)
+        states = {}
+        try:
+            for episode in range(2):
+                env.reset()
+                states[episode, 0] = env.unwrapped.ram.copy()
+                for step in range(1, 41):
+                    env.step((step + episode) % len(SIMPLE_MOVEMENT))
+                    states[episode, step] = env.unwrapped.ram.copy()
+        finally:
+            env.close()
+        # a recording stores bytes of actions instead of frames
+        self.assertLess(os.path.getsize(path), 64 * 1024)
+        replay = EpisodeReplay(path)
+        try:
+            self.assertEqual(2, replay.num_episodes)
+            self.assertEqual(40, replay.steps(1))
+            self.assertEqual(40, len(replay.actions(0)))
+            # seek forward, backward within a checkpointed chunk, and across episodes
+            for episode, step in [(0, 37), (0, 5), (0, 40), (1, 16), (1, 0), (0, 20)]:
+                ram = replay.seek(episode, step).ram
+                self.assertTrue((states[episode, step] == ram).all(), (episode, step))
+            self.assertRaises(IndexError, replay.seek, 2, 0)
+            self.assertRaises(IndexError, replay.seek, 0, 41)
+        finally:
+            replay.close()
+
+
+class ShouldRecordAndSeekEpisodesSMB1(ShouldRecordAndSeekEpisodes, TestCase):
+    env_id = 'SuperMarioBros-1-1-v0'
+
+
+class ShouldRecordAndSeekEpisodesSMB2(ShouldRecordAndSeekEpisodes, TestCase):
+    env_id = 'SuperMarioBros2USA-v0'
+
+
+class ShouldRecordAndSeekEpisodesSMB3(ShouldRecordAndSeekEpisodes, TestCase):
+    env_id = 'SuperMarioBros3-v0'
+
+
+class ShouldReplayTracesLikeLiveSteps(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, replay, 'SuperMarioBros-1-1-v0', [0.5])
+        self.assertRaises(ValueError, replay, 'SuperMarioBros-1-1-v0', [256])
+        actions = np.random.RandomState(0).choice([0, 1, 128, 129, 130, 131], size=300)
+        for kwargs in (dict(), dict(frameskip=4)):
+            env = make('SuperMarioBros-1-1-v0', **kwargs).unwrapped
+            try:
+                observation, info = env.reset()
+                live = {0: (observation.copy(), info)}
+                for step, action in enumerate(actions.tolist(), 1):
+                    observation, _, terminated, truncated, info = env.step(action)
+                    live[step] = (observation.copy(), info)
+                    if terminated or truncated:
+                        break
+            finally:
+                env.close()
+            frames = replay('SuperMarioBros-1-1-v0', actions, materialize=[0, 7, step, step + 1], **kwargs)
+            self.assertEqual({0, 7, step}, set(frames))
+            for index, (observation, info) in frames.items():
+                self.assertTrue((live[index][0] == observation).all())
+                self.assertEqual(live[index][1]['x_pos'], info['x_pos'])
+                self.assertEqual(live[index][1]['time'], info['time'])
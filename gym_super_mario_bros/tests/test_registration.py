@@ -6,6 +6,7 @@ import gym_super_mario_bros
 
 from .. import _registration
 from .._registration import make
+from .._registration import register_env
 from ..smb3_stages import SMB3_VALIDATED_STAGES
 
 
@@ -69,6 +70,22 @@ class ShouldExposePackageApi(TestCase):
                 'all_tasks',
                 'task_for_env_id',
                 'task_ids',
+                'clear_snapshot_cache',
+                'MarioVectorEnv',
+                'MarioSharedMemoryVectorEnv',
+                'register_env',
+                'register_envs',
+                'decode_features',
+                'decode_tile_grid',
+                'EpisodeRecorder',
+                'EpisodeReplay',
+                'replay',
+                'export_dataset',
+                'MarioDataset',
+                'CurriculumSampler',
+                'Curriculum',
+                'CellArchive',
+                'TraceCodec',
             ],
             gym_super_mario_bros.__all__,
         )
@@ -200,6 +217,27 @@ class ShouldRegisterExpectedGymnasiumEnvs(TestCase):
             self.assertNotIn(env_id, gym.envs.registration.registry)
 
 
+class ShouldResolveStageIdsOnDemand(TestCase):
+    """Test the on-demand registration used by lazy registration mode."""
+
+    def test_resolves_known_ids(self):
+        self.assertTrue(register_env('SuperMarioBros-4-2-v0'))
+        self.assertTrue(register_env('gym_super_mario_bros:SuperMarioBros3-1-4-v0'))
+        self.assertFalse(register_env('SuperMarioBros-9-1-v0'))
+        self.assertFalse(register_env('CartPole-v1'))
+        self.assertRaises(TypeError, register_env, None)
+
+    def test_registers_missing_ids(self):
+        env_id = 'SuperMarioBros2-A-1-v0'
+        spec = gym.envs.registration.registry.pop(env_id)
+        try:
+            self.assertTrue(register_env(env_id))
+            self.assertEqual(spec.kwargs, gym.spec(env_id).kwargs)
+            self.assertEqual(spec.entry_point, gym.spec(env_id).entry_point)
+        finally:
+            gym.envs.registration.registry[env_id] = spec
+
+
 class ShouldSmokeRepresentativeRegisteredEnvs(TestCase):
     """Test representative Gymnasium creation, reset, step, render, and close."""
 
@@ -0,0 +1,86 @@
+"""Test cases for the shared memory Mario vector environment."""
+from multiprocessing.shared_memory import SharedMemory
+import threading
+from unittest import TestCase
+
+import numpy as np
+
+from ..actions import RIGHT_ONLY
+from ..shared_vector_env import MarioSharedMemoryVectorEnv
+from ..shared_vector_env import _info_kinds
+from ..vector_env import MarioVectorEnv
+
+
+class ShouldRejectInvalidSharedVectorArguments(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, MarioSharedMemoryVectorEnv, 'SuperMarioBros-v0')
+        self.assertRaises(ValueError, MarioSharedMemoryVectorEnv, [])
+        self.assertRaises(
+            TypeError,
+            MarioSharedMemoryVectorEnv, 'SuperMarioBros-v0', 1, copy='yes',
+        )
+
+
+class ShouldClassifyInfoKinds(TestCase):
+    def test(self):
+        kinds = _info_kinds([
+            dict(x_pos=1, flag_get=False, game='smb1', reward_components={}),
+            dict(x_pos=2, flag_get=True, game='smb1', reward_components=dict(progress=1.0)),
+        ])
+        self.assertIs(np.int64, kinds[('x_pos',)])
+        self.assertIs(np.bool_, kinds[('flag_get',)])
+        self.assertIs(object, kinds[('game',)])
+        self.assertIs(np.float64, kinds[('reward_components', 'progress')])
+
+
+class ShouldMatchInProcessVectorEnv(TestCase):
+    def test(self):
+        env_ids = ['SuperMarioBros-1-1-v0', 'SuperMarioBros2USA-v0', 'SuperMarioBros3-v0']
+        shared = MarioSharedMemoryVectorEnv(env_ids, actions=RIGHT_ONLY)
+        local = MarioVectorEnv(env_ids, actions=RIGHT_ONLY)
+        try:
+            observations, infos = shared.reset(seed=0)
+            expected_observations, expected_infos = local.reset(seed=0)
+            self.assertEqual((3, 240, 256, 3), observations.shape)
+            self.assertTrue((expected_observations == observations).all())
+            self.assertEqual(expected_infos['x_pos'].tolist(), infos['x_pos'].tolist())
+            for action in [1, 1, 2, 4, 4, 3, 0]:
+                result = shared.step([action] * 3)
+                expected = local.step([action] * 3)
+                self.assertTrue((expected[0] == result[0]).all())
+                for actual, wanted in zip(result[1:4], expected[1:4]):
+                    self.assertEqual(wanted.tolist(), actual.tolist())
+                for key in ['x_pos', 'score', 'world', 'game', 'task_id']:
+                    self.assertEqual(expected[4][key].tolist(), result[4][key].tolist())
+        finally:
+            shared.close()
+            local.close()
+
+
+class ShouldReleaseSharedMemoryOnClose(TestCase):
+    def test(self):
+        env = MarioSharedMemoryVectorEnv('SuperMarioBros-1-1-v0', 2)
+        names = [memory.name for memory in env._memories]
+        env.reset()
+        env.close()
+        self.assertTrue(env.closed)
+        for name in names:
+            self.assertRaises(FileNotFoundError, SharedMemory, name=name)
+
+
+class ShouldRaiseWhenAWorkerFailsToStart(TestCase):
+    def test(self):
+        errors = []
+
+        def construct():
+            try:
+                MarioSharedMemoryVectorEnv(['SuperMarioBros-v0', 'SuperMarioBros-9-9-v0'])
+            except Exception as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=construct, daemon=True)
+        thread.start()
+        thread.join(60)
+        self.assertFalse(thread.is_alive(), 'constructor hung after a worker failed')
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], RuntimeError)
@@ -0,0 +1,97 @@
+"""Test cases for the post-intro snapshot cache."""
+from unittest import TestCase
+
+from .._roms import smb1_rom_path
+from .._roms import smb2jp_rom_path
+from .._snapshots import _START_SNAPSHOTS
+from .._snapshots import clear_snapshot_cache
+from .._snapshots import rom_hash
+from .._snapshots import start_snapshot_key
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldHashRomContents(TestCase):
+    """Test that ROM hashes identify the ROM file contents."""
+
+    def test(self):
+        self.assertEqual(40, len(rom_hash(smb1_rom_path())))
+        self.assertEqual(rom_hash(smb1_rom_path()), rom_hash(smb1_rom_path()))
+        self.assertNotEqual(rom_hash(smb1_rom_path()), rom_hash(smb2jp_rom_path()))
+
+
+class ShouldRejectInvalidSnapshotCacheArgument(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, SuperMarioBrosEnv, snapshot_cache='yes')
+        self.assertRaises(TypeError, SuperMarioBros2Env, snapshot_cache=1)
+        self.assertRaises(TypeError, SuperMarioBros3Env, snapshot_cache=None)
+
+
+class ShouldRestoreCachedStartScreen:
+    """Test that cached constructions match a full start-screen replay."""
+
+    # the keyword arguments to create the environment with
+    kwargs = {}
+
+    def _env(self, **kwargs):
+        return self.env_class(render_mode='rgb_array', **self.kwargs, **kwargs)
+
+    def _rollout(self, env):
+        """Return the reset info and the info after a few NOOP steps."""
+        _, reset_info = env.reset()
+        for _ in range(10):
+            _, reward, _, _, info = env.step(0)
+        return reset_info, info, reward
+
+    def test(self):
+        clear_snapshot_cache()
+        baseline = self._env()
+        cold = self._env(snapshot_cache=True)
+        warm = self._env(snapshot_cache=True)
+        try:
+            self.assertIn(start_snapshot_key(warm), _START_SNAPSHOTS)
+            self.assertEqual(1, len(_START_SNAPSHOTS))
+            expected = self._rollout(baseline)
+            self.assertEqual(expected, self._rollout(cold))
+            self.assertEqual(expected, self._rollout(warm))
+            self.assertTrue((baseline.screen == warm.screen).all())
+        finally:
+            baseline.close()
+            cold.close()
+            warm.close()
+            clear_snapshot_cache()
+
+
+class ShouldRestoreCachedSuperMarioBros(ShouldRestoreCachedStartScreen, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldRestoreCachedLostLevelsStage(ShouldRestoreCachedStartScreen, TestCase):
+    env_class = SuperMarioBrosEnv
+    kwargs = dict(lost_levels=True, target=(2, 3))
+
+
+class ShouldRestoreCachedSuperMarioBros2Usa(ShouldRestoreCachedStartScreen, TestCase):
+    env_class = SuperMarioBros2Env
+    kwargs = dict(target=(1, 2))
+
+
+class ShouldRestoreCachedSuperMarioBros3(ShouldRestoreCachedStartScreen, TestCase):
+    env_class = SuperMarioBros3Env
+    kwargs = dict(target=(1, 4))
+
+
+class ShouldKeySnapshotsByTarget(TestCase):
+    def test(self):
+        clear_snapshot_cache()
+        first = SuperMarioBrosEnv(target=(1, 1), snapshot_cache=True)
+        second = SuperMarioBrosEnv(target=(1, 2), snapshot_cache=True)
+        try:
+            self.assertNotEqual(start_snapshot_key(first), start_snapshot_key(second))
+            self.assertEqual(2, len(_START_SNAPSHOTS))
+            self.assertEqual(2, second.unwrapped._stage)
+        finally:
+            first.close()
+            second.close()
+            clear_snapshot_cache()
@@ -0,0 +1,78 @@
+"""Test cases for the pools of start states."""
+from unittest import TestCase
+
+from .._start_pool import noop_counts
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldRejectInvalidStartPoolArguments(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, SuperMarioBrosEnv, start_pool=2.0)
+        self.assertRaises(ValueError, SuperMarioBrosEnv, start_pool=0)
+        self.assertRaises(TypeError, SuperMarioBros2Env, start_noops=None)
+        self.assertRaises(ValueError, SuperMarioBros2Env, start_noops=-1)
+        self.assertRaises(ValueError, SuperMarioBros3Env, start_pool=5, start_noops=3)
+
+
+class ShouldDrawDistinctNoopCounts(TestCase):
+    def test(self):
+        counts = noop_counts(8, 30)
+        self.assertEqual(0, counts[0])
+        self.assertEqual(8, len(set(counts)))
+        self.assertEqual(sorted(counts), counts)
+        self.assertTrue(all(1 <= count <= 30 for count in counts[1:]))
+        self.assertEqual(counts, noop_counts(8, 30))
+        self.assertEqual([0, 1, 2, 3], noop_counts(4, 3))
+
+
+class ShouldResetIntoStartPool:
+    """Test that resets draw start states from the pool."""
+
+    # the class of the environment to reset
+    env_class = None
+
+    def test(self):
+        env = self.env_class(start_pool=4, start_noops=20)
+        try:
+            env.reset(seed=0)
+            self.assertEqual(4, len(env._reset_templates))
+            rams = []
+            for index in range(4):
+                env.reset(options=dict(start_index=index))
+                self.assertEqual(index, env.start_index)
+                rams.append(env.ram.tobytes())
+            self.assertEqual(4, len(set(rams)))
+            # the seed picks the start state
+            indices = []
+            for seed in range(16):
+                env.reset(seed=seed)
+                indices.append(env.start_index)
+                self.assertEqual(rams[env.start_index], env.ram.tobytes())
+                env.reset(seed=seed)
+                self.assertEqual(indices[-1], env.start_index)
+            self.assertGreater(len(set(indices)), 1)
+            self.assertRaises(ValueError, env.reset, options=dict(start_index=4))
+            self.assertRaises(TypeError, env.reset, options=dict(start_index='0'))
+            # the first start state is the backup state
+            first = self.env_class()
+            try:
+                first.reset()
+                self.assertEqual(rams[0], first.ram.tobytes())
+            finally:
+                first.close()
+        finally:
+            env.close()
+
+
+class ShouldResetIntoStartPoolSMB1(ShouldResetIntoStartPool, TestCase):
+    env_class = SuperMarioBrosEnv
+
+
+class ShouldResetIntoStartPoolSMB2(ShouldResetIntoStartPool, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldResetIntoStartPoolSMB3(ShouldResetIntoStartPool, TestCase):
+    env_class = SuperMarioBros3Env
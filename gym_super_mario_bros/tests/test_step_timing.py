@@ -0,0 +1,91 @@
+"""Test cases for the opt-in step timing hooks."""
+from unittest import TestCase
+
+from .._step_timing import HISTOGRAM_BUCKETS
+from .._step_timing import PHASES
+from .._step_timing import _percentile
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldValidateStepTiming(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, SuperMarioBrosEnv, step_timing=1)
+        self.assertRaises(TypeError, SuperMarioBros2Env, step_timing='yes')
+        self.assertRaises(TypeError, SuperMarioBros3Env, step_timing=None)
+
+
+class ShouldBoundPercentiles(TestCase):
+    def test(self):
+        buckets = [0] * HISTOGRAM_BUCKETS
+        buckets[3] = 9
+        buckets[10] = 1
+        self.assertEqual(7, _percentile(buckets, 10, 0.5))
+        self.assertEqual(7, _percentile(buckets, 10, 0.9))
+        self.assertEqual(1023, _percentile(buckets, 10, 0.99))
+        self.assertEqual(0, _percentile(buckets, 0, 0.5))
+
+
+class ShouldTimeStepPhases:
+    """Test that enabled timers record every step and phase."""
+
+    # the keyword arguments to create the environment with
+    kwargs = {}
+
+    def test(self):
+        disabled = self.env_class(**self.kwargs)
+        try:
+            self.assertIsNone(disabled.step_timer)
+            self.assertNotIn('step', vars(disabled))
+        finally:
+            disabled.close()
+        env = self.env_class(step_timing=True, **self.kwargs)
+        try:
+            env.reset()
+            hidden_frames = 0
+            for _ in range(30):
+                _, _, terminated, truncated, info = env.step(0b10000000)
+                hidden_frames += info['hidden_frames']
+                if terminated or truncated:
+                    env.reset()
+            summary = env.step_timer.summary()
+            self.assertEqual(30, summary['steps'])
+            self.assertEqual(hidden_frames, summary['hidden_frames']['total'])
+            self.assertEqual(PHASES, env.step_timer.phases[:len(PHASES)])
+            for phase in ('emulation', 'reward', 'terminal', 'info', 'did_step', 'observation'):
+                self.assertGreater(summary[phase]['total_ns'], 0, phase)
+                self.assertLessEqual(summary[phase]['total_ns'], summary['step']['total_ns'])
+            self.assertLessEqual(summary['step']['p50_ns'], summary['step']['p99_ns'])
+            histograms = env.step_timer.histograms()
+            self.assertEqual((HISTOGRAM_BUCKETS,), histograms['step'].shape)
+            self.assertEqual(30, histograms['step'].sum())
+            self.assertEqual(30, sum(histograms['hidden_frames'].values()))
+            env.step_timer.clear()
+            self.assertEqual(0, env.step_timer.summary()['steps'])
+        finally:
+            env.close()
+
+
+class ShouldTimeStepPhasesSMB1(ShouldTimeStepPhases, TestCase):
+    env_class = SuperMarioBrosEnv
+    kwargs = dict(target=(1, 1))
+
+    def test_skip_phases(self):
+        env = SuperMarioBrosEnv(step_timing=True, frameskip=4)
+        try:
+            self.assertIn('_skip_occupied_states', env.step_timer.phases)
+            env.reset()
+            env.step(0)
+            self.assertEqual(1, env.step_timer.summary()['steps'])
+        finally:
+            env.close()
+
+
+class ShouldTimeStepPhasesSMB2(ShouldTimeStepPhases, TestCase):
+    env_class = SuperMarioBros2Env
+
+
+class ShouldTimeStepPhasesSMB3(ShouldTimeStepPhases, TestCase):
+    env_class = SuperMarioBros3Env
+    kwargs = dict(target=(1, 1))
@@ -0,0 +1,61 @@
+"""Test cases for switching the target of a live environment."""
+from unittest import TestCase
+
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
+
+
+class ShouldSwitchTargetOnReset:
+    """Test that retargeted resets match freshly constructed environments."""
+
+    # the class of the environment to switch
+    env_class = None
+    # the targets to switch between
+    targets = ()
+
+    def _fresh_reset(self, target):
+        """Return the reset RAM and info of a new environment for a target."""
+        env = self.env_class(target=target)
+        try:
+            _, info = env.reset()
+            return env.ram.copy(), info
+        finally:
+            env.close()
+
+    def test(self):
+        first, second = self.targets
+        env = self.env_class(target=first)
+        try:
+            env.reset()
+            for target in (second, first, None, second):
+                _, info = env.reset(options=dict(target=target))
+                ram, expected = self._fresh_reset(target)
+                self.assertEqual(expected, info)
+                self.assertTrue((ram == env.ram).all())
+                self.assertEqual(target is not None, env.is_single_stage_env)
+                self.assertEqual(expected['task_id'], env._task.task_id)
+                for _ in range(20):
+                    env.step(0b10000001)
+            self.assertEqual(3, len(env._target_bank))
+            # invalid targets leave the environment untouched
+            task = env._task
+            self.assertRaises(TypeError, env.reset, options=dict(target=[1, 1]))
+            self.assertIs(task, env._task)
+        finally:
+            env.close()
+
+
+class ShouldSwitchTargetOnResetSMB1(ShouldSwitchTargetOnReset, TestCase):
+    env_class = SuperMarioBrosEnv
+    targets = ((1, 1), (4, 2))
+
+
+class ShouldSwitchTargetOnResetSMB2(ShouldSwitchTargetOnReset, TestCase):
+    env_class = SuperMarioBros2Env
+    targets = ((1, 1), (2, 1))
+
+
+class ShouldSwitchTargetOnResetSMB3(ShouldSwitchTargetOnReset, TestCase):
+    env_class = SuperMarioBros3Env
+    targets = ((1, 1), (1, 2))
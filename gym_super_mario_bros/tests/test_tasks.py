@@ -1,5 +1,6 @@
 """Tests for registered Mario task metadata."""
 from unittest import TestCase
+from unittest import mock
 
 from ..tasks import MarioTask
 from ..tasks import all_tasks
@@ -9,6 +10,9 @@ from ..smb3_stages import smb3_stage_matrix
 from ..tasks import task_for_config
 from ..tasks import task_for_env_id
 from ..tasks import task_ids
+from ..smb2_env import SuperMarioBros2Env
+from ..smb3_env import SuperMarioBros3Env
+from ..smb_env import SuperMarioBrosEnv
 
 
 class ShouldExposeRegisteredTaskMetadata(TestCase):
@@ -63,6 +67,19 @@ class ShouldExposeRegisteredTaskMetadata(TestCase):
             task_for_config('smb3', 0, world=1, stage=4).env_id,
         )
 
+    def test_config_index_matches_first_canonical_task(self):
+        for task in all_tasks():
+            config = (task.game, task.version, task.world, task.stage)
+            expected = next(
+                other for other in all_tasks()
+                if (other.game, other.version, other.world, other.stage) == config
+            )
+            self.assertIs(expected, task_for_config(*config))
+        with self.assertRaises(KeyError):
+            task_for_config('smb1', 0, world=9, stage=1)
+        with self.assertRaises(KeyError):
+            task_for_config('smb4', 0)
+
     def test_filters_are_available_for_eval_matrices(self):
         stage_tasks = all_tasks(single_stage=True)
         smb3_tasks = all_tasks(game_family='smb3')
@@ -98,3 +115,29 @@ class ShouldExposeSuperMarioBros3StageMatrix(TestCase):
         stages = smb3_stage_matrix(validated=True)
 
         self.assertEqual(SMB3_VALIDATED_STAGES, tuple(stage.target for stage in stages))
+
+
+class ShouldCacheTaskMetadataInEnvironments(TestCase):
+    """Test that environments resolve their task once at construction."""
+
+    def _assert_cached(self, module, env, task_id):
+        self.assertEqual(task_id, env._task.task_id)
+        lookup = mock.patch(module + '.task_for_config', side_effect=AssertionError)
+        with lookup:
+            _, info = env.reset()
+            self.assertEqual(task_id, info['task_id'])
+            _, _, _, _, info = env.step(0)
+            self.assertEqual(task_id, info['task_id'])
+
+    def test(self):
+        envs = [
+            ('gym_super_mario_bros.smb_env', SuperMarioBrosEnv(target=(4, 2)), 'SuperMarioBros-4-2-v0'),
+            ('gym_super_mario_bros.smb2_env', SuperMarioBros2Env(), 'SuperMarioBros2USA-v0'),
+            ('gym_super_mario_bros.smb3_env', SuperMarioBros3Env(target=(1, 4)), 'SuperMarioBros3-1-4-v0'),
+        ]
+        try:
+            for module, env, task_id in envs:
+                self._assert_cached(module, env, task_id)
+        finally:
+            for _, env, _ in envs:
+                env.close()
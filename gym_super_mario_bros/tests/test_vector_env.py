@@ -0,0 +1,145 @@
+"""Test cases for the in-process Mario vector environment."""
+from unittest import TestCase
+
+import numpy as np
+
+from ..actions import RIGHT_ONLY
+from ..smb_env import SuperMarioBrosEnv
+from ..vector_env import MarioVectorEnv
+from ..vector_env import _clear_info
+from ..vector_env import _store_info
+
+
+# the controller bytes of the RIGHT_ONLY actions
+RIGHT_ONLY_BYTES = [0b00000000, 0b10000000, 0b10000001, 0b10000010, 0b10000011]
+
+
+class ShouldRejectInvalidVectorArguments(TestCase):
+    def test(self):
+        self.assertRaises(TypeError, MarioVectorEnv, 'SuperMarioBros-v0')
+        self.assertRaises(ValueError, MarioVectorEnv, 'SuperMarioBros-v0', 0)
+        self.assertRaises(ValueError, MarioVectorEnv, ['SuperMarioBros-v0'], 1)
+        self.assertRaises(ValueError, MarioVectorEnv, [])
+        self.assertRaises(TypeError, MarioVectorEnv, 'SuperMarioBros-v0', 1, copy=1)
+
+
+class ShouldStoreStructOfArraysInfo(TestCase):
+    def test(self):
+        infos = {}
+        first = dict(
+            x_pos=40,
+            flag_get=False,
+            game='smb1',
+            reward_components=dict(progress=1.0),
+        )
+        _store_info(infos, first, 0, 2)
+        _store_info(infos, dict(x_pos=41.5, flag_get=True, game='smb2'), 1, 2)
+        self.assertEqual(np.float64, infos['x_pos'].dtype)
+        self.assertEqual([40.0, 41.5], infos['x_pos'].tolist())
+        self.assertEqual(np.bool_, infos['flag_get'].dtype)
+        self.assertEqual(['smb1', 'smb2'], infos['game'].tolist())
+        self.assertEqual([True, True], infos['_x_pos'].tolist())
+        self.assertEqual([True, False], infos['_reward_components'].tolist())
+        self.assertEqual([1.0, 0.0], infos['reward_components']['progress'].tolist())
+        # keys an environment stops reporting are masked out of the next batch
+        _clear_info(infos)
+        _store_info(infos, dict(x_pos=42), 0, 2)
+        self.assertEqual([True, False], infos['_x_pos'].tolist())
+        self.assertEqual([42.0, 0.0], infos['x_pos'].tolist())
+        self.assertEqual([False, False], infos['_game'].tolist())
+        self.assertEqual([None, None], infos['game'].tolist())
+        self.assertEqual([False, False], infos['_reward_components'].tolist())
+
+
+class ShouldBatchSubEnvironments(TestCase):
+    def test(self):
+        env = MarioVectorEnv('SuperMarioBros-1-1-v0', 2, render_mode='rgb_array')
+        try:
+            self.assertEqual((2, 240, 256, 3), env.observation_space.shape)
+            observations, infos = env.reset(seed=0)
+            self.assertEqual((2, 240, 256, 3), observations.shape)
+            self.assertEqual(np.uint8, observations.dtype)
+            self.assertEqual((2,), infos['x_pos'].shape)
+            self.assertTrue(infos['_x_pos'].all())
+            result = env.step(np.array([0b10000000, 0]))
+            self.assertEqual(5, len(result))
+            stepped, rewards, terminated, truncated, infos = result
+            # the observation buffer is shared across calls
+            self.assertIs(observations, stepped)
+            for index, sub_env in enumerate(env.envs):
+                self.assertTrue((stepped[index] == sub_env.screen).all())
+            self.assertEqual(np.float64, rewards.dtype)
+            self.assertEqual(np.bool_, terminated.dtype)
+            self.assertFalse(truncated.any())
+            self.assertEqual((2,), infos['reward_components']['progress'].shape)
+            self.assertEqual(2, len(env.render()))
+        finally:
+            env.close()
+
+
+class ShouldMatchSingleEnvironment(TestCase):
+    def test(self):
+        single = SuperMarioBrosEnv(render_mode='rgb_array')
+        env = MarioVectorEnv(['SuperMarioBros-v0'], actions=RIGHT_ONLY, copy=True)
+        try:
+            single.reset()
+            env.reset()
+            for action in [1, 1, 2, 2, 4, 4, 0, 3]:
+                _, reward, terminated, _, info = single.step(RIGHT_ONLY_BYTES[action])
+                _, rewards, terminations, _, infos = env.step([action])
+                self.assertEqual(reward, rewards[0])
+                self.assertEqual(terminated, terminations[0])
+                self.assertEqual(info['x_pos'], infos['x_pos'][0])
+                self.assertEqual(info['score'], infos['score'][0])
+        finally:
+            single.close()
+            env.close()
+
+
+class ShouldTruncateAtEpisodeStepLimit(TestCase):
+    def test(self):
+        env = MarioVectorEnv('SuperMarioBros-1-1-v0', 2, max_episode_steps=3)
+        try:
+            env.reset()
+            truncations = []
+            for _ in range(4):
+                _, _, _, truncated, _ = env.step([0b10000000, 0])
+                truncations.append(truncated.tolist())
+            self.assertEqual([[False] * 2, [False] * 2, [True] * 2, [False] * 2], truncations)
+        finally:
+            env.close()
+
+
+class ShouldAutoResetFromBackup(TestCase):
+    def test(self):
+        env = MarioVectorEnv('SuperMarioBros-1-1-v0', 2, copy=True)
+        try:
+            initial, initial_infos = env.reset()
+            for _ in range(30):
+                env.step([0b10000000, 0b10000000])
+            # mark the first sub-environment as finished on the last step
+            env._autoreset_envs[:] = [True, False]
+            observations, rewards, terminated, _, infos = env.step([0b10000000] * 2)
+            self.assertEqual(0.0, rewards[0])
+            self.assertFalse(terminated[0])
+            self.assertTrue((observations[0] == initial[0]).all())
+            self.assertEqual(initial_infos['x_pos'][0], infos['x_pos'][0])
+            self.assertGreater(infos['x_pos'][1], initial_infos['x_pos'][1])
+        finally:
+            env.close()
+
+
+class ShouldStackArrayInfoRecords(TestCase):
+    def test(self):
+        env = MarioVectorEnv('SuperMarioBros-1-1-v0', 2, info_mode='array')
+        try:
+            _, infos = env.reset()
+            records = infos['record']
+            self.assertEqual((2,), records.shape)
+            self.assertTrue(infos['_record'].all())
+            for sub_env in env.envs:
+                self.assertTrue(np.shares_memory(records, sub_env._info_record))
+            _, _, _, _, infos = env.step([0b10000000, 0])
+            self.assertIs(records, infos['record'])
+        finally:
+            env.close()
@@ -0,0 +1,360 @@
+"""An in-process vector environment that batches several Mario emulators."""
+import gymnasium as gym
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import batch_space
+from nes_py.wrappers import JoypadSpace
+import numpy as np
+
+from ._info_record import bind_info_record
+from ._registration import make
+
+
+try:  # gymnasium >= 1.1 names the autoreset behavior explicitly
+    from gymnasium.vector import AutoresetMode
+    _AUTORESET_MODE = AutoresetMode.NEXT_STEP
+except ImportError:  # pragma: no cover
+    _AUTORESET_MODE = 'NextStep'
+
+
+def _info_dtype(value):
+    """Return the NumPy type of an info column holding values like ``value``."""
+    if isinstance(value, (bool, np.bool_)):
+        return np.bool_
+    if isinstance(value, (int, np.integer)):
+        return np.int64
+    if isinstance(value, (float, np.floating)):
+        return np.float64
+    return object
+
+
+def _store_info(infos, info, index, num_envs):
+    """
+    Write one environment's info into reusable struct-of-arrays columns.
+
+    Every key gets a column with one entry per environment and a boolean
+    ``_key`` mask of the environments that report it, as in Gymnasium vector
+    environments. Nested dictionaries are stored as nested columns. Callers
+    clear the columns with ``_clear_info`` before each batch, so entries of
+    environments that stop reporting a key do not go stale.
+
+    Args:
+        infos (dict): the batched info columns to update in place
+        info (dict): the info dictionary of a single environment
+        index (int): the index of the environment in the batch
+        num_envs (int): the number of environments in the batch
+
+    Returns:
+        None
+
+    """
+    for key, value in info.items():
+        mask = infos.get('_' + key)
+        if mask is None:
+            mask = infos['_' + key] = np.zeros(num_envs, dtype=np.bool_)
+        mask[index] = True
+        if isinstance(value, dict):
+            _store_info(infos.setdefault(key, {}), value, index, num_envs)
+            continue
+        dtype = _info_dtype(value)
+        column = infos.get(key)
+        if column is None:
+            if dtype is object:
+                column = np.full(num_envs, None, dtype=object)
+            else:
+                column = np.zeros(num_envs, dtype=dtype)
+            infos[key] = column
+        elif column.dtype != dtype and column.dtype != object:
+            # promote the column when environments disagree on the type
+            if dtype is not object:
+                dtype = np.result_type(column.dtype, dtype)
+            column = infos[key] = column.astype(dtype)
+        column[index] = value
+
+
+def _env_id_list(env_ids, num_envs):
+    """
+    Return one environment ID per sub-environment of a vector environment.
+
+    Args:
+        env_ids (str, list): a registered environment ID to repeat, or a list
+            with one environment ID per sub-environment
+        num_envs (int): the number of sub-environments when env_ids is a
+            single ID; must be None when env_ids is a list
+
+    Returns (list):
+        the environment ID of each sub-environment
+
+    """
+    if isinstance(env_ids, str):
+        if not isinstance(num_envs, int) or isinstance(num_envs, bool):
+            raise TypeError('num_envs must be of type: int')
+        if num_envs < 1:
+            raise ValueError('num_envs must be positive')
+        return [env_ids] * num_envs
+    if num_envs is not None:
+        raise ValueError('num_envs must be None when env_ids is a list')
+    env_ids = list(env_ids)
+    if not env_ids:
+        raise ValueError('env_ids must contain at least one environment ID')
+    return env_ids
+
+
+def _action_map(actions):
+    """
+    Return the controller byte of each discrete action like JoypadSpace.
+
+    Args:
+        actions (list): a list of button lists, or None for raw bytes
+
+    Returns (list):
+        the controller byte of each action, or None for raw bytes
+
+    """
+    if actions is None:
+        return None
+    action_map = []
+    for buttons in actions:
+        byte_action = 0
+        for button in buttons:
+            byte_action |= JoypadSpace._button_map[button]
+        action_map.append(byte_action)
+    return action_map
+
+
+def _stack_info_records(envs):
+    """
+    Bind array mode sub-environments to rows of one stacked record array.
+
+    Args:
+        envs (list): the sub-environments of a vector environment
+
+    Returns (np.ndarray, None):
+        the stacked info records that the sub-environments write into, or
+        None if the sub-environments use dictionary info
+
+    """
+    array_mode = [env._info_record is not None for env in envs]
+    if not any(array_mode):
+        return None
+    if not all(array_mode) or len({env.info_dtype for env in envs}) > 1:
+        raise ValueError('array info requires every env to share one info_dtype')
+    records = np.zeros(len(envs), dtype=envs[0].info_dtype)
+    for index, env in enumerate(envs):
+        bind_info_record(env, records[index:index + 1].reshape(()))
+    return records
+
+
+def _record_info(records):
+    """Return the vector info that exposes stacked info records."""
+    return dict(record=records, _record=np.ones(len(records), dtype=np.bool_))
+
+
+def _controller_bytes(actions, action_map, num_envs):
+    """Return the controller byte of each sub-environment's action."""
+    actions = np.asarray(actions).tolist()
+    if len(actions) != num_envs:
+        raise ValueError('expected {} actions, got {}'.format(num_envs, len(actions)))
+    if action_map is None:
+        return actions
+    return [action_map[action] for action in actions]
+
+
+def _seed_list(seed, num_envs):
+    """Return the reset seed of each sub-environment."""
+    if seed is None:
+        return [None] * num_envs
+    if isinstance(seed, int):
+        return [seed + index for index in range(num_envs)]
+    if len(seed) != num_envs:
+        raise ValueError('expected {} seeds, got {}'.format(num_envs, len(seed)))
+    return list(seed)
+
+
+def _copy_buffers(buffers):
+    """Return deep copies of batch arrays and struct-of-arrays info."""
+    return tuple(
+        dict(zip(buffer.keys(), _copy_buffers(buffer.values())))
+        if isinstance(buffer, dict) else buffer.copy()
+        for buffer in buffers
+    )
+
+
+def _clear_info(infos):
+    """Reset every info column and ``_key`` mask before a new batch."""
+    for column in infos.values():
+        if isinstance(column, dict):
+            _clear_info(column)
+        else:
+            column.fill(None if column.dtype == object else 0)
+
+
+def _episode_step_limits(envs):
+    """Return the ``max_episode_steps`` of each registered environment."""
+    limits = [env.spec.max_episode_steps if env.spec is not None else None for env in envs]
+    maximum = np.iinfo(np.int64).max
+    return np.array([maximum if limit is None else limit for limit in limits], dtype=np.int64)
+
+
+class MarioVectorEnv(VectorEnv):
+    """A batch of Mario environments stepped in the calling process."""
+
+    def __init__(self, env_ids, num_envs=None, actions=None, copy=False, **kwargs):
+        """
+        Initialize a new in-process Mario vector environment.
+
+        Args:
+            env_ids (str, list): a registered environment ID to repeat, or a
+                list with one environment ID per sub-environment
+            num_envs (int): the number of sub-environments when env_ids is a
+                single ID; must be None when env_ids is a list
+            actions (list): an optional list of button lists, as accepted by
+                nes_py.wrappers.JoypadSpace, mapping discrete actions to
+                controller bytes; None steps with raw controller bytes
+            copy (bool): whether to return copies of the batch buffers; by
+                default reset and step return the same observation, reward,
+                flag, and info arrays, which the next call overwrites
+            kwargs (dict): keyword arguments for every sub-environment; the
+                snapshot cache is enabled unless explicitly disabled. With
+                info_mode='array' every sub-environment writes its info into
+                one row of the stacked ``info['record']`` array in place
+
+        Returns:
+            None
+
+        """
+        env_ids = _env_id_list(env_ids, num_envs)
+        if not isinstance(copy, bool):
+            raise TypeError('copy must be of type: bool')
+        kwargs.setdefault('snapshot_cache', True)
+        self.env_ids = env_ids
+        wrapped = [make(env_id, **kwargs) for env_id in env_ids]
+        # step the bare environments and apply the registered TimeLimit here
+        self.envs = [env.unwrapped for env in wrapped]
+        self._max_episode_steps = _episode_step_limits(wrapped)
+        self._elapsed_steps = np.zeros(len(wrapped), dtype=np.int64)
+        self.num_envs = len(self.envs)
+        self.copy = copy
+        self.render_mode = self.envs[0].render_mode
+        self.metadata = dict(self.envs[0].metadata, autoreset_mode=_AUTORESET_MODE)
+        self.single_observation_space = self.envs[0].observation_space
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self._action_map = _action_map(actions)
+        if actions is None:
+            self.single_action_space = self.envs[0].action_space
+        else:
+            self.single_action_space = gym.spaces.Discrete(len(actions))
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+        # buffers written in place by every reset and step
+        self._observations = np.zeros(
+            (self.num_envs,) + self.single_observation_space.shape,
+            dtype=self.single_observation_space.dtype,
+        )
+        self._rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self._terminations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._autoreset_envs = np.zeros(self.num_envs, dtype=np.bool_)
+        self._infos = {}
+        self._info_records = _stack_info_records(self.envs)
+        if self._info_records is not None:
+            self._infos = _record_info(self._info_records)
+
+    def _output(self, *buffers):
+        """Return the given batch buffers, copying them if enabled."""
+        if not self.copy:
+            return buffers
+        return _copy_buffers(buffers)
+
+    def reset(self, *, seed=None, options=None):
+        """
+        Reset every sub-environment to its post-intro backup state.
+
+        Args:
+            seed (int, list): a seed for the first sub-environment that is
+                incremented for each following one, or a list of seeds
+            options (dict): options passed to every sub-environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the batched initial observations
+            - (dict) the struct-of-arrays info of every sub-environment
+
+        """
+        seeds = _seed_list(seed, self.num_envs)
+        if self._info_records is None:
+            _clear_info(self._infos)
+        for index, (env, env_seed) in enumerate(zip(self.envs, seeds)):
+            observation, info = env.reset(seed=env_seed, options=options)
+            np.copyto(self._observations[index], observation)
+            if self._info_records is None:
+                _store_info(self._infos, info, index, self.num_envs)
+        self._autoreset_envs[:] = False
+        self._elapsed_steps[:] = 0
+        return self._output(self._observations, self._infos)
+
+    def step(self, actions):
+        """
+        Step every sub-environment with one action each.
+
+        Sub-environments that finished on the previous step are reset from
+        their backup state instead of stepped, and report a zero reward.
+        The sub-environments run without their Gymnasium wrappers, so the
+        vector environment truncates episodes at the registered
+        ``max_episode_steps`` itself.
+
+        Args:
+            actions (np.ndarray): one action per sub-environment
+
+        Returns:
+            a tuple of:
+            - (np.ndarray) the batched observations
+            - (np.ndarray) the float64 reward of each sub-environment
+            - (np.ndarray) the bool termination flag of each sub-environment
+            - (np.ndarray) the bool truncation flag of each sub-environment
+            - (dict) the struct-of-arrays info of every sub-environment
+
+        """
+        actions = _controller_bytes(actions, self._action_map, self.num_envs)
+        autoreset = self._autoreset_envs.tolist()
+        if self._info_records is None:
+            _clear_info(self._infos)
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            if autoreset[index]:
+                observation, info = env.reset()
+                reward, terminated, truncated = 0.0, False, False
+            else:
+                observation, reward, terminated, truncated, info = env.step(action)
+            np.copyto(self._observations[index], observation)
+            self._rewards[index] = reward
+            self._terminations[index] = terminated
+            self._truncations[index] = truncated
+            if self._info_records is None:
+                _store_info(self._infos, info, index, self.num_envs)
+        # count the steps of each episode and truncate at its limit
+        self._elapsed_steps += 1
+        self._elapsed_steps[self._autoreset_envs] = 0
+        np.logical_or(
+            self._truncations,
+            self._elapsed_steps >= self._max_episode_steps,
+            out=self._truncations,
+        )
+        np.logical_or(self._terminations, self._truncations, out=self._autoreset_envs)
+        return self._output(
+            self._observations,
+            self._rewards,
+            self._terminations,
+            self._truncations,
+            self._infos,
+        )
+
+    def render(self):
+        """Return the rendered frame of every sub-environment."""
+        return tuple(env.render() for env in self.envs)
+
+    def close_extras(self, **kwargs):
+        """Close every sub-environment."""
+        for env in self.envs:
+            env.close()
+
+
+# explicitly define the outward facing API of this module
+__all__ = [MarioVectorEnv.__name__]
@@ -24,6 +24,8 @@
 #     cli                 Run the package CLI; pass extra args after the command
 #     play                Alias for cli
 #     random              Run the package CLI in random mode
+#     benchmark           Run the benchmark suite; pass extra args after the command
+#     bench               Alias for benchmark
 #     *                   Execute the command directly from the project root
 #
 # Examples:
@@ -32,6 +34,7 @@
 #     ./main.sh deployment
 #     ./main.sh cli --env SuperMarioBros-v0 --actionspace simple
 #     ./main.sh random --env SuperMarioBros-v0 --steps 100
+#     ./main.sh benchmark --output benchmark.json
 #
 
 set -euo pipefail
@@ -191,6 +194,11 @@ case "${COMMAND}" in
   exit 0
   ;;
 
+"benchmark" | "bench")
+  "${PYTHON}" -m gym_super_mario_bros._app.benchmark "$@"
+  exit 0
+  ;;
+
 *)
   "${COMMAND}" "$@"
   exit 0